@@ -1,2 +1,6 @@
+from ._lazy import lazy_attributes
 
-__all__ = ['roman_numerals']
+__all__ = ['logging', 'numbers', 'profiling', 'progress_bars', 'strings']
+
+# Subpackages are imported on first use, e.g., koolkit.numbers
+__getattr__, __dir__ = lazy_attributes(__name__, {name: [] for name in __all__})
@@ -0,0 +1,37 @@
+import importlib
+import sys
+from collections.abc import Callable
+
+
+def lazy_attributes(package: str, exports: dict[str, list[str]]) -> tuple[Callable, Callable]:
+    """
+    Module-level __getattr__ and __dir__ (PEP 562) for a package whose submodules are only imported when
+    something from them is first used, so that importing the package itself is quick, e.g.,
+
+        __all__ = ['Histogram', 'timed']
+        __getattr__, __dir__ = lazy_attributes(__name__, {'histogram': ['Histogram'], 'timing': ['timed']})
+
+    The first access to a name imports its submodule and stores the name on the package, so later accesses are
+    plain attribute lookups. The submodules themselves can be accessed as attributes too.
+
+    Args:
+        package (str): The package's __name__.
+        exports (dict[str, list[str]]): Submodule name -> names it exports.
+    """
+    module_of = {name: submodule for submodule, names in exports.items() for name in names}
+
+    def __getattr__(name: str):
+        submodule = module_of.get(name)
+        if submodule is not None:
+            value = getattr(importlib.import_module(f'.{submodule}', package), name)
+        elif name in exports:
+            value = importlib.import_module(f'.{name}', package)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(module_of) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,373 @@
+import atexit
+import json
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, TextIO
+
+__all__ = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'DROP_OLDEST', 'DROP_NEWEST', 'LogWriter', 'Logger', 'get_logger']
+
+# Same values as the standard library's logging levels
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
+
+DROP_OLDEST = 'oldest'
+DROP_NEWEST = 'newest'
+
+_LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR', CRITICAL: 'CRITICAL'}
+_LEVELS = {name: level for level, name in _LEVEL_NAMES.items()}
+
+
+def _check_level(level: int | str) -> int:
+    if isinstance(level, str):
+        try:
+            return _LEVELS[level.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown log level: {level!r}. Expected one of {', '.join(_LEVELS)}") from None
+    return level
+
+
+def _format_record(record: tuple) -> str:
+    """
+    Format a queued record as a JSON line. Runs on the writer thread.
+    """
+    timestamp, level, name, msg, args, bound_fields, fields, exc_info = record
+    entry = {
+        'time': datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec='microseconds'),
+        'level': _LEVEL_NAMES.get(level, str(level)),
+        'logger': name,
+        'message': msg % args if args else msg,
+    }
+    for key, value in bound_fields.items():
+        entry.setdefault(key, value)
+    for key, value in fields.items():
+        entry.setdefault(key, value)
+    if exc_info is not None:
+        entry.setdefault('exception', ''.join(traceback.format_exception(*exc_info)))
+    return json.dumps(entry, default=str, ensure_ascii=False) + '\n'
+
+
+class LogWriter:
+    """
+    Writes log records as JSON lines from a background thread, so logging never blocks the calling thread on I/O.
+
+    Records are appended to an in-memory queue, and formatted and written by the writer thread in batches
+    of up to batch_size records: one write() and flush() per batch. The thread wakes up when a batch is full,
+    or every flush_interval seconds otherwise. Call flush() to write everything queued so far, e.g., before
+    reading the log back. Queued records are written at exit.
+
+    The queue holds at most max_queue records, so a burst of logging (or a stalled sink) cannot use unbounded
+    memory. When it is full, either the oldest queued record is dropped to make room (DROP_OLDEST, the default),
+    or the new one is (DROP_NEWEST). Drops are counted in .dropped, and reported in the log as a warning record.
+
+    Args:
+        sink (TextIO | str | PathLike | None): Text stream, or file path (opened for appending). Default is sys.stderr.
+        batch_size (int): Maximum number of records per write.
+        flush_interval (float): Maximum time, in seconds, a record waits in the queue.
+        max_queue (int | None): Maximum number of queued records. None for no limit.
+        drop (str): What to drop when the queue is full: DROP_OLDEST ('oldest') or DROP_NEWEST ('newest').
+    """
+
+    def __init__(self, sink: TextIO | str | os.PathLike | None = None, batch_size: int = 512,
+                 flush_interval: float = 0.1, max_queue: int | None = 100_000, drop: str = DROP_OLDEST):
+        if drop not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"drop must be {DROP_OLDEST!r} or {DROP_NEWEST!r}, not {drop!r}")
+        if max_queue is not None and max_queue < 1:
+            raise ValueError(f"max_queue must be at least 1, not {max_queue}")
+        if isinstance(sink, (str, os.PathLike)):
+            self.sink = open(sink, 'a', encoding='utf-8')
+            self._owns_sink = True
+        else:
+            self.sink = sink if sink is not None else sys.stderr
+            self._owns_sink = False
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.drop = drop
+        self.written = 0
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._drop_lock = threading.Lock()
+        # With DROP_OLDEST, the deque itself discards the oldest record when it is full.
+        self._queue = deque(maxlen=max_queue if drop == DROP_OLDEST else None)
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='koolkit-log-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, record: tuple) -> None:
+        """
+        Queue a record. Called by Logger; never blocks.
+        """
+        queue = self._queue
+        if self.max_queue is not None and len(queue) >= self.max_queue:
+            with self._drop_lock:
+                self.dropped += 1
+            if self.drop == DROP_NEWEST:
+                return
+        queue.append(record)
+        if len(queue) >= self.batch_size and not self._wake.is_set():
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+
+    def _drain(self):
+        queue = self._queue
+        with self._write_lock:
+            while queue:
+                batch = []
+                try:
+                    for _ in range(self.batch_size):
+                        batch.append(queue.popleft())
+                except IndexError:
+                    pass
+                self._write(batch)
+
+    def _write(self, batch: list[tuple]):
+        lines = []
+        for record in batch:
+            try:
+                lines.append(_format_record(record))
+            except Exception as e:
+                # Like logging.Handler.handleError(): a bad record must not take the writer down.
+                lines.append(json.dumps({'level': 'ERROR', 'logger': 'koolkit.logging',
+                                         'message': f"Could not format log record {record[3]!r}: {e!r}"}) + '\n')
+        dropped = self.dropped
+        if dropped > self._reported_dropped:
+            lines.append(_format_record((time.time(), WARNING, 'koolkit.logging', "Dropped %d log records (queue full)",
+                                         (dropped - self._reported_dropped,), {}, {'dropped_total': dropped}, None)))
+            self._reported_dropped = dropped
+        try:
+            self.sink.write(''.join(lines))
+            self.sink.flush()
+        except (OSError, ValueError) as e:  # e.g., disk full, or sink closed
+            sys.stderr.write(f"koolkit.logging: could not write {len(batch)} log records: {e!r}\n")
+            return
+        self.written += len(batch)
+
+    def flush(self) -> None:
+        """
+        Write all queued records now, from the calling thread.
+        """
+        self._drain()
+
+    def close(self) -> None:
+        """
+        Stop the writer thread, after writing all queued records. Closes the sink if it was opened from a path.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._drain()
+        if self._owns_sink:
+            self.sink.close()
+        atexit.unregister(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class _Limiter:
+    """
+    Sampling and per-call-site rate limiting, shared by a Logger and the loggers bound from it.
+    """
+    __slots__ = ('sample_rate', 'rate_limit', 'burst', 'exempt_level', 'sampled_out', 'rate_limited', '_buckets')
+
+    def __init__(self, sample_rate: float, rate_limit: float | None, burst: float | None, exempt_level: int):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError(f"sample_rate must be between 0 and 1, not {sample_rate}")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"rate_limit must be positive, not {rate_limit}")
+        self.sample_rate = sample_rate
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else max(rate_limit or 1, 1)
+        self.exempt_level = exempt_level
+        self.sampled_out = 0
+        self.rate_limited = 0
+        self._buckets: dict[tuple, list] = {}  # (code, line number) -> [tokens, last refill time]
+
+    def allow(self, level: int) -> bool:
+        """
+        Whether to log a record. Called from the Logger method that the call site called,
+        so the call site is two frames up.
+        """
+        if level >= self.exempt_level:
+            return True
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        if self.rate_limit is not None:
+            frame = sys._getframe(2)
+            key = (frame.f_code, frame.f_lineno)
+            now = time.monotonic()
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.burst, now]
+            # Token bucket: refill at rate_limit tokens per second, up to burst, and spend one per record.
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_limit)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                self.rate_limited += 1
+                return False
+            bucket[0] = tokens - 1
+        return True
+
+
+class Logger:
+    """
+    Structured logger: each record is a JSON line with the time, level, logger name, message,
+    and any keyword fields (plus fields bound with bind()).
+
+    e.g.,
+
+        log = get_logger('orders')
+        log.info("Processed %d orders", n, customer_id=42, elapsed_ms=12.5)
+        # {"time": "...", "level": "INFO", "logger": "orders", "message": "Processed 3 orders", "customer_id": 42, ...}
+
+        request_log = log.bind(request_id=request.id)
+        request_log.warning("Slow query")
+
+    Calls below the logger's level return right away. Otherwise, the record is queued as is, and the message
+    is %-formatted and serialized later, by the LogWriter's thread. So pass arguments rather than building
+    the message yourself, and don't mutate arguments after logging them.
+    Values that are not JSON-serializable are written with str().
+
+    To keep the cost of logging bounded under load, records below exempt_level (ERROR by default) can be:
+    - sampled: only a random sample_rate fraction of them is logged.
+    - rate limited: each call site (each line that logs) may log at most rate_limit records per second on average,
+      in bursts of up to burst records (token bucket).
+    Records skipped this way are counted in .sampled_out and .rate_limited. Loggers made with bind() share
+    the call sites' rate limits and the counters. The LogWriter's queue is bounded too (see LogWriter).
+
+        log = Logger('ingest', sample_rate=0.1, rate_limit=5)  # 10% of records, at most 5/s per line
+
+    Args:
+        name (str): Logger name, written with every record.
+        level (int | str): Minimum level to log, e.g., INFO or 'debug'.
+        writer (LogWriter | None): Where records go. Default is a shared writer to sys.stderr.
+        fields (dict | None): Fields added to every record.
+        sample_rate (float): Fraction of records to log, from 0 to 1. Default is 1 (all).
+        rate_limit (float | None): Maximum records per second per call site. Default is None (no limit).
+        burst (float | None): Records a call site may log at once before being rate limited. Default is rate_limit (at least 1).
+        exempt_level (int | str): Records at this level or above are never sampled or rate limited.
+    """
+    __slots__ = ('name', 'level', 'writer', 'fields', '_limiter')
+
+    def __init__(self, name: str, level: int | str = INFO, writer: LogWriter | None = None,
+                 fields: dict[str, Any] | None = None, sample_rate: float = 1.0, rate_limit: float | None = None,
+                 burst: float | None = None, exempt_level: int | str = ERROR):
+        self.name = name
+        self.level = _check_level(level)
+        self.writer = writer if writer is not None else _default_writer()
+        self.fields = fields or {}
+        if sample_rate != 1 or rate_limit is not None:
+            self._limiter = _Limiter(sample_rate, rate_limit, burst, _check_level(exempt_level))
+        else:
+            self._limiter = None  # The common case: one attribute check per call
+
+    @property
+    def sampled_out(self) -> int:
+        return self._limiter.sampled_out if self._limiter is not None else 0
+
+    @property
+    def rate_limited(self) -> int:
+        return self._limiter.rate_limited if self._limiter is not None else 0
+
+    def is_enabled_for(self, level: int | str) -> bool:
+        return _check_level(level) >= self.level
+
+    def bind(self, **fields) -> 'Logger':
+        """
+        A logger that adds these fields to every record, on top of this logger's.
+        """
+        logger = Logger(self.name, self.level, self.writer, {**self.fields, **fields})
+        logger._limiter = self._limiter
+        return logger
+
+    def log(self, level: int | str, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        level = _check_level(level)
+        if level >= self.level and (self._limiter is None or self._limiter.allow(level)):
+            self.writer.put((time.time(), level, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def debug(self, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        if self.level <= DEBUG and (self._limiter is None or self._limiter.allow(DEBUG)):
+            self.writer.put((time.time(), DEBUG, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def info(self, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        if self.level <= INFO and (self._limiter is None or self._limiter.allow(INFO)):
+            self.writer.put((time.time(), INFO, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def warning(self, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        if self.level <= WARNING and (self._limiter is None or self._limiter.allow(WARNING)):
+            self.writer.put((time.time(), WARNING, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def error(self, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        if self.level <= ERROR and (self._limiter is None or self._limiter.allow(ERROR)):
+            self.writer.put((time.time(), ERROR, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def exception(self, msg: str, *args, **fields) -> None:
+        """
+        Log an error with the traceback of the exception being handled.
+        """
+        if self.level <= ERROR and (self._limiter is None or self._limiter.allow(ERROR)):
+            self.writer.put((time.time(), ERROR, self.name, msg, args, self.fields, fields, sys.exc_info()))
+
+    def critical(self, msg: str, *args, exc_info: bool = False, **fields) -> None:
+        if self.level <= CRITICAL and (self._limiter is None or self._limiter.allow(CRITICAL)):
+            self.writer.put((time.time(), CRITICAL, self.name, msg, args, self.fields, fields,
+                             sys.exc_info() if exc_info else None))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, level={_LEVEL_NAMES.get(self.level, self.level)})"
+
+
+_writer = None
+_writer_lock = threading.Lock()
+_loggers: dict[str, Logger] = {}
+
+
+def _default_writer() -> LogWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = LogWriter()
+    return _writer
+
+
+def get_logger(name: str = 'koolkit', level: int | str | None = None) -> Logger:
+    """
+    Get the logger with this name, writing to sys.stderr, creating it on first use.
+    Its level defaults to the KOOLKIT_LOG_LEVEL environment variable, or INFO.
+    """
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, Logger(name, os.environ.get('KOOLKIT_LOG_LEVEL', INFO)))
+    if level is not None:
+        logger.level = _check_level(level)
+    return logger
@@ -1 +1,13 @@
-from .roman_numerals import *
+from .._lazy import lazy_attributes
+
+_EXPORTS = {
+    'roman_numerals': ['MAX_NUMBER', 'EXTENDED_NOTATIONS', 'Roman', 'convert_roman_to_arabic', 'convert_arabic_to_roman',
+                       'RomanNumeral'],
+    'bulk_roman_numerals': ['convert_many_arabic_to_roman', 'convert_many_roman_to_arabic'],
+    'roman_numeral_scanner': ['find_roman_numerals', 'replace_roman_numerals'],
+}
+
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+# Submodules are imported on first use (bulk_roman_numerals imports numpy, if installed)
+__getattr__, __dir__ = lazy_attributes(__name__, _EXPORTS)
@@ -0,0 +1,117 @@
+from functools import lru_cache
+from typing import Iterable
+
+from .roman_numerals import MAX_NUMBER, convert_arabic_to_roman, convert_roman_to_arabic
+
+try:
+    import numpy as np
+    _numpy_installed = True
+except ImportError:
+    _numpy_installed = False
+
+__all__ = ['convert_many_arabic_to_roman', 'convert_many_roman_to_arabic']
+
+
+@lru_cache(maxsize=None)
+def _numeral_table(lowercase: bool, nulla: bool) -> tuple[str, ...]:
+    """
+    Every Roman numeral from 0 to MAX_NUMBER, indexed by its Arabic value.
+    Built on first use and cached, so bulk encoding is a single index per element.
+    """
+    return tuple(convert_arabic_to_roman(i, lowercase=lowercase, nulla=nulla) for i in range(MAX_NUMBER + 1))
+
+
+@lru_cache(maxsize=None)
+def _value_table() -> dict[str, int]:
+    """
+    Map every canonical Roman numeral (upper and lowercase, plus 'N'/'n') to its Arabic value.
+    """
+    table = {numeral: i for i, numeral in enumerate(_numeral_table(lowercase=False, nulla=True))}
+    table.update({numeral: i for i, numeral in enumerate(_numeral_table(lowercase=True, nulla=True))})
+    return table
+
+
+@lru_cache(maxsize=None)
+def _numeral_array(lowercase: bool, nulla: bool):
+    """
+    NumPy version of _numeral_table(), using StringDType where available (NumPy >= 2.0) and object otherwise.
+    """
+    table = _numeral_table(lowercase, nulla)
+    try:
+        return np.array(table, dtype=np.dtypes.StringDType())
+    except AttributeError:
+        return np.array(table, dtype=object)
+
+
+def _check_range(low, high) -> None:
+    if low < 0:
+        raise ValueError(f"Cannot generate Roman numeral for {low}: negative numbers are not supported")
+    if high > MAX_NUMBER:
+        raise ValueError(f"Cannot generate Roman numeral for {high}: exceeds {MAX_NUMBER}")
+
+
+def _decode(roman_str: str, value_table: dict[str, int], strict: bool) -> int:
+    """
+    Look up a numeral in the canonical table, falling back to convert_roman_to_arabic()
+    for anything the table does not know (surrounding whitespace, mixed case, invalid input...).
+    """
+    arabic_int = value_table.get(roman_str)
+    if arabic_int is None:
+        return convert_roman_to_arabic(roman_str, strict=strict)
+    return arabic_int
+
+
+def convert_many_arabic_to_roman(arabic_ints: Iterable[int], lowercase: bool = False, nulla: bool = True):
+    """
+    Convert many Arabic numerals (ints) to Roman numerals (strs) at once.
+
+    The whole input is range-checked up front, then each element is encoded with a single lookup
+    into a precomputed 0-3999 table.
+
+    :param arabic_ints: Any iterable of ints, or a NumPy array of integers (of any shape, integer or object dtype).
+    :param lowercase: Boolean flag specifying whether should use lowercase letters. Default is False.
+    :param nulla: Boolean flag whether an Arabic zero (0) should be returned as 'N' for nulla. Default is True. If False, then '0' will be returned.
+    :return: A list of strs, or for NumPy input, an array of the same shape (StringDType on NumPy >= 2.0, else object).
+    """
+    if _numpy_installed and isinstance(arabic_ints, np.ndarray):
+        kind = arabic_ints.dtype.kind
+        if kind == 'O':
+            # e.g., Python ints: range-checked before converting, as they may not fit in 64 bits
+            if not all(isinstance(value, (int, np.integer)) for value in arabic_ints.flat):
+                raise TypeError("Array of objects must only hold integers")
+        elif kind not in 'biu':
+            raise TypeError(f"Array must have an integer dtype, not {arabic_ints.dtype}")
+        if arabic_ints.size:
+            _check_range(arabic_ints.min(), arabic_ints.max())
+        if kind in 'bO':
+            # Boolean arrays would index as a mask, and object arrays not at all. (True/False become 1/0,
+            # as in the scalar and list paths.)
+            arabic_ints = arabic_ints.astype(np.int64)
+        return _numeral_array(lowercase, nulla)[arabic_ints]
+
+    arabic_ints = arabic_ints if isinstance(arabic_ints, (list, tuple)) else list(arabic_ints)
+    if arabic_ints:
+        _check_range(min(arabic_ints), max(arabic_ints))
+    return list(map(_numeral_table(lowercase, nulla).__getitem__, arabic_ints))
+
+
+def convert_many_roman_to_arabic(roman_strs: Iterable[str], strict: bool = True):
+    """
+    Convert many Roman numerals (strs) to Arabic numerals (ints) at once.
+
+    Canonical numerals are resolved with a single dict lookup each; anything else is handed to
+    convert_roman_to_arabic(), so the results (and errors) match converting one at a time.
+
+    :param roman_strs: Any iterable of strs, or a NumPy string/object array (of any shape).
+    :param strict: If True (default), only canonical numerals are accepted. See convert_roman_to_arabic().
+    :return: A list of ints, or for NumPy input, an int64 array of the same shape.
+    """
+    value_table = _value_table()
+
+    if _numpy_installed and isinstance(roman_strs, np.ndarray):
+        # Columns tend to repeat values heavily, so only decode each distinct numeral once.
+        uniques, inverse = np.unique(roman_strs, return_inverse=True)
+        decoded = np.fromiter((_decode(str(s), value_table, strict) for s in uniques), dtype=np.int64, count=uniques.size)
+        return decoded[inverse].reshape(roman_strs.shape)
+
+    return [_decode(s, value_table, strict) for s in roman_strs]
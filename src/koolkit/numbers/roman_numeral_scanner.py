@@ -0,0 +1,191 @@
+import io
+import mmap
+import os
+import re
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterator, Union
+
+from .roman_numerals import RomanNumeral
+
+__all__ = ['find_roman_numerals', 'replace_roman_numerals']
+
+Source = Union[str, os.PathLike, BinaryIO]
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Longest traditional numeral: MMMDCCCLXXXVIII (3888)
+_MAX_NUMERAL_LENGTH = 15
+
+# Canonical numerals 1-3999 (the lookahead rules out the empty match).
+_NUMERAL = 'M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3})'
+
+# Numerals must be whole words. Any non-ASCII byte counts as part of a word, so that a numeral
+# directly next to an accented letter in UTF-8 text (e.g., 'éIV') is not picked up.
+_WORD_BYTE = rb'[A-Za-z0-9_\x80-\xff]'
+
+# A run of word bytes at the end of a chunk, which a numeral may still continue into the next chunk.
+_TRAILING_WORD_RE = re.compile(_WORD_BYTE + b'{0,%d}\\Z' % (_MAX_NUMERAL_LENGTH + 1))
+
+
+@lru_cache(maxsize=None)
+def _numeral_pattern(lowercase: bool, min_length: int) -> re.Pattern:
+    numeral = f'(?=[MDCLXVI]{{{max(min_length, 1)}}}){_NUMERAL}'
+    if lowercase:
+        # All-uppercase or all-lowercase, but not mixed case (e.g., 'Mix')
+        numeral = f'(?:{numeral}|{numeral.lower()})'
+    return re.compile(b'(?<!' + _WORD_BYTE + b')' + numeral.encode('ascii') + b'(?!' + _WORD_BYTE + b')')
+
+
+@contextmanager
+def _open_binary(target: Source, mode: str):
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, mode) as file:
+            yield file
+    elif isinstance(target, io.TextIOBase):
+        raise TypeError("Expected a file path or a binary stream, not a text stream.")
+    else:
+        yield target
+
+
+def _scan(stream: BinaryIO, pattern: re.Pattern, chunk_size: int):
+    """
+    Read a binary stream chunk by chunk, yielding (buffer, offset, cut, matches):
+    buffer[:cut] is final, and matches are the numerals that start in it. offset is the stream position of buffer[0].
+
+    The tail of each chunk that might be the start of a numeral continuing into the next chunk is carried over,
+    together with one byte of context for the word-boundary check, so memory stays at about one chunk.
+    """
+    offset = 0
+    carry = b''
+    search_from = 0  # Carried context bytes are only there for the lookbehind; numerals start after them.
+    while True:
+        chunk = stream.read(chunk_size)
+        buffer = carry + chunk if carry else chunk
+
+        if not chunk:
+            cut = len(buffer)
+            next_search_from = 0
+        else:
+            run_start = _TRAILING_WORD_RE.search(buffer, max(len(buffer) - _MAX_NUMERAL_LENGTH - 1, 0)).start()
+            if len(buffer) - run_start > _MAX_NUMERAL_LENGTH:
+                # Too long to be a numeral. Carry just its last byte, so that the word continues into the next chunk.
+                cut = len(buffer) - 1
+                next_search_from = 1
+            elif run_start > search_from:
+                # Carry the run, plus the non-word byte before it.
+                cut = run_start - 1
+                next_search_from = 1
+            else:
+                # Nothing but the run (and context) so far: carry it all.
+                cut = 0
+                next_search_from = search_from
+
+        matches = []
+        for match in pattern.finditer(buffer, search_from):
+            if match.start() >= cut:
+                break
+            matches.append(match)
+        yield buffer, offset, cut, matches
+
+        if not chunk:
+            return
+        offset += cut
+        carry = buffer[cut:]
+        search_from = next_search_from
+
+
+def find_roman_numerals(source: Source, lowercase: bool = False, min_length: int = 1,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE, use_mmap: bool = False) -> Iterator[tuple[int, RomanNumeral]]:
+    """
+    Find the Roman numerals in a (possibly huge) file, in constant memory.
+
+    Only whole-word, canonical numerals from 1 to 3999 are found, e.g., 'XIV' in "Chapter XIV",
+    but not 'IIII' or the 'MIX' in "MIXED". Text is scanned as bytes, so any ASCII-compatible encoding works.
+
+    e.g.,
+
+        for offset, numeral in find_roman_numerals('corpus.txt', min_length=2):
+            print(offset, numeral, int(numeral))
+
+    Args:
+        source (str | PathLike | binary stream): File path, or a binary stream opened for reading.
+        lowercase (bool): If True, also find all-lowercase numerals (e.g., 'xiv'). Mixed case never matches.
+        min_length (int): Skip numerals shorter than this, e.g., 2 to skip the pronoun 'I'.
+        chunk_size (int): Number of bytes read at a time.
+        use_mmap (bool): If True (and source is a path), memory-map the file and scan it in one pass instead of reading chunks.
+
+    Yields:
+        tuple[int, RomanNumeral]: Byte offset of each numeral in the source, and the numeral.
+    """
+    pattern = _numeral_pattern(lowercase, min_length)
+    numerals: dict[bytes, RomanNumeral] = {}
+
+    def to_numeral(token: bytes) -> RomanNumeral:
+        numeral = numerals.get(token)
+        if numeral is None:
+            numeral = numerals[token] = RomanNumeral(token.decode('ascii'), lowercase=token.islower())
+        return numeral
+
+    if use_mmap and isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for match in pattern.finditer(mapped):
+                    yield match.start(), to_numeral(match.group())
+        return
+
+    with _open_binary(source, 'rb') as stream:
+        for _, offset, _, matches in _scan(stream, pattern, chunk_size):
+            for match in matches:
+                yield offset + match.start(), to_numeral(match.group())
+
+
+def replace_roman_numerals(source: Source, destination: Source,
+                           replacement: Callable[[RomanNumeral], str] | None = None,
+                           lowercase: bool = False, min_length: int = 1,
+                           chunk_size: int = DEFAULT_CHUNK_SIZE, encoding: str = 'utf-8') -> int:
+    """
+    Copy a (possibly huge) file, rewriting the Roman numerals in it, in constant memory.
+    Numerals are found exactly as in find_roman_numerals().
+
+    e.g.,
+
+        replace_roman_numerals('louis.txt', 'louis_arabic.txt')  # "Louis XVI" -> "Louis 16"
+
+    Args:
+        source (str | PathLike | binary stream): File path, or a binary stream opened for reading.
+        destination (str | PathLike | binary stream): File path, or a binary stream opened for writing.
+        replacement (callable): Maps each RomanNumeral to its replacement text. Defaults to its Arabic value.
+        lowercase (bool): If True, also replace all-lowercase numerals (e.g., 'xiv').
+        min_length (int): Leave numerals shorter than this alone.
+        chunk_size (int): Number of bytes read at a time.
+        encoding (str): Encoding used to write the replacement text.
+
+    Returns:
+        int: The number of numerals replaced.
+    """
+    if replacement is None:
+        replacement = lambda numeral: str(int(numeral))
+
+    pattern = _numeral_pattern(lowercase, min_length)
+    replacements: dict[bytes, bytes] = {}
+    count = 0
+
+    with _open_binary(source, 'rb') as stream, _open_binary(destination, 'wb') as output:
+        for buffer, _, cut, matches in _scan(stream, pattern, chunk_size):
+            position = 0
+            for match in matches:
+                token = match.group()
+                replaced = replacements.get(token)
+                if replaced is None:
+                    numeral = RomanNumeral(token.decode('ascii'), lowercase=token.islower())
+                    replaced = replacements[token] = replacement(numeral).encode(encoding)
+                output.write(buffer[position:match.start()])
+                output.write(replaced)
+                position = match.end()
+            output.write(buffer[position:cut])
+            count += len(matches)
+
+    return count
@@ -1,11 +1,16 @@
+import re
 from enum import Enum
-from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
 from typing import Union
 
 
 # The maximum number encodable using traditional Roman numerals is 3999 (MMMCMXCIX)
-# The 'overline' method exists for bigger numbers, but that is not implemented here.
+# Bigger numbers need one of the extended notations, which are opt-in via the 'extended' argument:
+#   'vinculum':    an overline (Unicode combining overline) multiplies a symbol by 1000, e.g., 4000 = I̅V̅
+#   'apostrophus': powers of ten from 1000 up are written with C, I and reversed C, e.g., 1000 = CIↃ, 5000 = IↃↃ
 MAX_NUMBER = 3999
+EXTENDED_NOTATIONS = ('vinculum', 'apostrophus')
 
 
 class Roman(Enum):
@@ -39,11 +44,135 @@ class Roman(Enum):
 
 
 
-def convert_roman_to_arabic(roman_str: str) -> int:
+# Each decimal place of a Roman numeral, most significant first: (one, five, ten, place value)
+# The thousands place has no 'five' or 'ten' symbol, since MAX_NUMBER is 3999.
+_DECIMAL_PLACES = (
+    ('M', None, None, 1000),
+    ('C', 'D', 'M', 100),
+    ('X', 'L', 'C', 10),
+    ('I', 'V', 'X', 1),
+)
+
+# Value of each Roman numeral character, in both cases, for the lenient parser.
+_CHAR_VALUES = {**{r.name: r.value for r in Roman}, **{r.name.lower(): r.value for r in Roman}}
+
+
+def _build_parser_transitions() -> list[dict[str, tuple[int, int]]]:
+    """
+    Build the transition table of a DFA that accepts exactly the canonical Roman numerals from 1 to MAX_NUMBER.
+
+    transitions[state][char] is a (next_state, value_to_add) pair, so a numeral is parsed by summing
+    the values along its path. State 0 is the start state; every other state is accepting.
+    Characters are accepted in both cases, so no .upper() copy of the input is needed.
+    """
+    transitions = [{}]
+    last_place = [-1]  # Index (in _DECIMAL_PLACES) of the place each state is in; -1 for the start state.
+    place_entries = []
+
+    def new_state(place: int) -> int:
+        transitions.append({})
+        last_place.append(place)
+        return len(transitions) - 1
+
+    def add(state: int, char: str, next_state: int, value: int) -> None:
+        transitions[state][char.upper()] = transitions[state][char.lower()] = (next_state, value)
+
+    for place, (one, five, ten, unit) in enumerate(_DECIMAL_PLACES):
+        # 'one' repeated 1-3 times (e.g., I, II, III), optionally followed by a subtractive 'five' or 'ten' (IV, IX).
+        ones = [new_state(place) for _ in range(3)]
+        add(ones[0], one, ones[1], unit)
+        add(ones[1], one, ones[2], unit)
+        entries = [(one, ones[0], unit)]
+
+        if five:
+            # 'five' followed by 'one' repeated 0-3 times (e.g., V, VI, VII, VIII).
+            fives = [new_state(place) for _ in range(4)]
+            for current, following in zip(fives, fives[1:]):
+                add(current, one, following, unit)
+            subtractive = new_state(place)
+            add(ones[0], five, subtractive, 3 * unit)
+            add(ones[0], ten, subtractive, 8 * unit)
+            entries.append((five, fives[0], 5 * unit))
+
+        place_entries.append(entries)
+
+    # From any state, a numeral may continue with the first symbol of any *lower* place.
+    for state, place in enumerate(last_place):
+        for entries in place_entries[place + 1:]:
+            for char, next_state, value in entries:
+                add(state, char, next_state, value)
+
+    return transitions
+
+
+_PARSER_TRANSITIONS = _build_parser_transitions()
+
+
+def convert_roman_to_arabic(roman_str: str, strict: bool = True, extended: str | None = None) -> int:
     """
     Convert a Roman numeral (str) to an Arabic numeral (int).
+    :param roman_str: String representation of the Roman numeral (either case; surrounding whitespace is ignored).
+    :param strict: If True (default), only canonical numerals are accepted, e.g., 'IV' but not 'IIII', 'IIV' or 'VX'.
+        If False, any sequence of Roman numeral characters is summed, subtracting a value that precedes a larger one.
+    :param extended: None (default) for traditional numerals, or one of EXTENDED_NOTATIONS ('vinculum' or
+        'apostrophus') to parse numerals beyond MAX_NUMBER written in that notation.
+    :return: Integer representation of the Arabic numeral.
     """
+    roman_str = roman_str.strip()
+
+    if roman_str == 'N' or roman_str == 'n':
+        return 0
+
+    if extended is not None:
+        return _convert_roman_to_arabic_extended(roman_str, strict, extended)
+
+    if not strict:
+        return _parse_roman_lenient(roman_str)
+
+    transitions = _PARSER_TRANSITIONS
+    state = 0
+    arabic_int = 0
+    for char in roman_str:
+        try:
+            state, value = transitions[state][char]
+        except KeyError:
+            if char not in _CHAR_VALUES:
+                raise ValueError(f'Invalid Roman numeral character: "{char}"') from None
+            raise ValueError(f'Invalid Roman numeral: "{roman_str}" is not in canonical form') from None
+        arabic_int += value
 
+    if state == 0:
+        raise ValueError('Invalid Roman numeral: empty string')
+    return arabic_int
+
+
+def _parse_roman_lenient(roman_str: str) -> int:
+    """
+    Sum the characters of a (possibly non-canonical) Roman numeral in a single pass.
+    A value that precedes a larger one is subtracted instead of added, e.g., 'IIII' -> 4, 'IC' -> 99.
+    """
+    char_values = _CHAR_VALUES
+    arabic_int = 0
+    prev_value = 0
+    for char in roman_str:
+        try:
+            value = char_values[char]
+        except KeyError:
+            raise ValueError(f'Invalid Roman numeral character: "{char}"') from None
+        if prev_value < value:
+            # The previous value was added, but should have been subtracted.
+            arabic_int += value - 2 * prev_value
+        else:
+            arabic_int += value
+        prev_value = value
+    return arabic_int
+
+
+def _convert_roman_to_arabic_iterative(roman_str: str) -> int:
+    """
+    Previous implementation of convert_roman_to_arabic(), comparing each character with the next.
+    Kept as the benchmark baseline for the DFA parser. Note that it accepts some malformed numerals (e.g., 'IIV').
+    """
     roman_str = roman_str.strip().upper()
 
     if roman_str == 'N':
@@ -69,14 +198,64 @@ def convert_roman_to_arabic(roman_str: str) -> int:
     return arabic_int
 
 
-def convert_arabic_to_roman(arabic_int: int, lowercase: bool = False, nulla: bool = True) -> str:
+def _build_digit_place_table(one: str, five: str, ten: str) -> tuple[str, ...]:
+    """
+    Build the ten numerals for a single decimal place (0-9) from its 'one', 'five' and 'ten' symbols.
+    e.g., ('I', 'V', 'X') -> ('', 'I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX')
+    """
+    return ('',
+            one, one * 2, one * 3, one + five,
+            five, five + one, five + one * 2, five + one * 3, one + ten)
+
+
+# Digit-place tables, precomputed once at import time: (thousands, hundreds, tens, ones)
+# Only 0-3 are valid for the thousands place, since MAX_NUMBER is 3999.
+_UPPER_PLACE_TABLES = (
+    ('', 'M', 'MM', 'MMM'),
+    _build_digit_place_table('C', 'D', 'M'),
+    _build_digit_place_table('X', 'L', 'C'),
+    _build_digit_place_table('I', 'V', 'X'),
+)
+_LOWER_PLACE_TABLES = tuple(tuple(numeral.lower() for numeral in table) for table in _UPPER_PLACE_TABLES)
+
+
+def convert_arabic_to_roman(arabic_int: int, lowercase: bool = False, nulla: bool = True,
+                            extended: str | None = None) -> str:
     """
     Convert an Arabic numeral (int) to Roman numeral (str).
     :param arabic_int: Integer representation of the Arabic numeral that should be converted.
     :param lowercase: Boolean flag specifying whether should use lowercase letters. Default is False.
     :param nulla: Boolean flag whether an Arabic zero (0) should be returned as 'N' for nulla. Default is True. If False, then '0' will be returned.
+    :param extended: None (default) for traditional numerals (up to MAX_NUMBER), or one of EXTENDED_NOTATIONS
+        ('vinculum' or 'apostrophus') to encode arbitrarily large numbers in that notation.
     :return: String representation of the Roman numeral.
     """
+    if extended is not None:
+        return _convert_arabic_to_roman_extended(arabic_int, lowercase, nulla, extended)
+
+    if arabic_int > MAX_NUMBER:
+        raise ValueError(f"Cannot generate Roman numeral for {arabic_int}: exceeds {MAX_NUMBER}")
+    if arabic_int < 0:
+        raise ValueError(f"Cannot generate Roman numeral for {arabic_int}: negative numbers are not supported")
+
+    if arabic_int == 0:
+        if not nulla:
+            return '0'
+        else:
+            return 'N' if not lowercase else 'n'
+
+    thousands, hundreds, tens, ones = _LOWER_PLACE_TABLES if lowercase else _UPPER_PLACE_TABLES
+    return ''.join((thousands[arabic_int // 1000],
+                    hundreds[arabic_int // 100 % 10],
+                    tens[arabic_int // 10 % 10],
+                    ones[arabic_int % 10]))
+
+
+def _convert_arabic_to_roman_iterative(arabic_int: int, lowercase: bool = False, nulla: bool = True) -> str:
+    """
+    Reference implementation of convert_arabic_to_roman() that walks the Roman symbols greedily.
+    Kept as a correctness oracle and benchmark baseline for the table-driven encoder.
+    """
     if arabic_int > MAX_NUMBER:
         raise ValueError(f"Cannot generate Roman numeral for {arabic_int}: exceeds {MAX_NUMBER}")
 
@@ -109,28 +288,206 @@ def convert_arabic_to_roman(arabic_int: int, lowercase: bool = False, nulla: boo
 
 
 
-@dataclass(frozen=True)
+# ------------------------------------------------------------------------------------------------
+# EXTENDED NOTATIONS
+# Both encoders work one decimal place (apostrophus) or one group of three places (vinculum) at a time,
+# using cached per-place tables, so their cost grows with the number of digits rather than the value.
+# ------------------------------------------------------------------------------------------------
+
+_OVERLINE = '\u0305'          # COMBINING OVERLINE
+_DOUBLE_OVERLINE = '\u033f'   # COMBINING DOUBLE OVERLINE (accepted when parsing, counts as two overlines)
+_REVERSED_C = '\u2183'        # ROMAN NUMERAL REVERSED ONE HUNDRED (lowercase: U+2184)
+
+_VINCULUM_TOKEN_RE = re.compile(f'([IVXLCDMivxlcdm])([{_OVERLINE}{_DOUBLE_OVERLINE}]*)|(.)', re.DOTALL)
+_APOSTROPHUS_TOKEN_RE = re.compile(f'([Cc]*)[Ii]([{_REVERSED_C}{_REVERSED_C.lower()}]+)|(.)', re.DOTALL)
+
+
+def _check_notation(extended: str) -> None:
+    if extended not in EXTENDED_NOTATIONS:
+        raise ValueError(f"Unknown extended notation: {extended!r}. Expected one of {EXTENDED_NOTATIONS}.")
+
+
+@lru_cache(maxsize=None)
+def _vinculum_place_tables(level: int, lowercase: bool) -> tuple[tuple[str, ...], ...]:
+    """
+    The (thousands, hundreds, tens, ones) tables with every symbol overlined 'level' times,
+    i.e., multiplied by 1000 ** level.
+    """
+    tables = _LOWER_PLACE_TABLES if lowercase else _UPPER_PLACE_TABLES
+    overlines = _OVERLINE * level
+    return tuple(tuple(''.join(symbol + overlines for symbol in numeral) for numeral in table) for table in tables)
+
+
+@lru_cache(maxsize=None)
+def _apostrophus_place_table(power: int, lowercase: bool) -> tuple[str, ...]:
+    """
+    The numerals for the digits 0-9 at the decimal place 10 ** power, in apostrophus notation.
+
+    10 ** power (power >= 3) is written as (power - 2) C's, an I and (power - 2) reversed C's, e.g., 1000 = CIↃ,
+    and 5 * 10 ** power as an I and (power - 1) reversed C's, e.g., 5000 = IↃↃ.
+    Below 1000, traditional symbols are used, except that 900 is written with CIↃ (CCIↃ) rather than M.
+    D is kept for 500, since its apostrophus form (IↃ) would make 400 (CIↃ) indistinguishable from 1000.
+    """
+    if power < 2:
+        table = _UPPER_PLACE_TABLES[3 - power]
+    elif power == 2:
+        table = _build_digit_place_table('C', 'D', 'CI' + _REVERSED_C)
+    else:
+        one = 'C' * (power - 2) + 'I' + _REVERSED_C * (power - 2)
+        five = 'I' + _REVERSED_C * (power - 1)
+        ten = 'C' * (power - 1) + 'I' + _REVERSED_C * (power - 1)
+        table = _build_digit_place_table(one, five, ten)
+    return tuple(numeral.lower() for numeral in table) if lowercase else table
+
+
+def _encode_vinculum(arabic_int: int, lowercase: bool) -> str:
+    # Split off groups of three digits until what is left fits in traditional numerals (using M's),
+    # e.g., 4,321,987 -> IV (x 1000 ** 2), CCCXXI (x 1000), CMLXXXVII
+    groups = []
+    while arabic_int > MAX_NUMBER:
+        arabic_int, group = divmod(arabic_int, 1000)
+        groups.append(group)
+    groups.append(arabic_int)
+
+    parts = []
+    for level in range(len(groups) - 1, -1, -1):
+        group = groups[level]
+        thousands, hundreds, tens, ones = _vinculum_place_tables(level, lowercase)
+        parts += thousands[group // 1000], hundreds[group // 100 % 10], tens[group // 10 % 10], ones[group % 10]
+    return ''.join(parts)
+
+
+def _encode_apostrophus(arabic_int: int, lowercase: bool) -> str:
+    digits = str(arabic_int)
+    top_power = len(digits) - 1
+    return ''.join(_apostrophus_place_table(top_power - i, lowercase)[ord(digit) - 48]
+                   for i, digit in enumerate(digits))
+
+
+def _convert_arabic_to_roman_extended(arabic_int: int, lowercase: bool, nulla: bool, extended: str) -> str:
+    _check_notation(extended)
+    if arabic_int < 0:
+        raise ValueError(f"Cannot generate Roman numeral for {arabic_int}: negative numbers are not supported")
+
+    if arabic_int == 0:
+        if not nulla:
+            return '0'
+        else:
+            return 'N' if not lowercase else 'n'
+
+    if extended == 'vinculum':
+        return _encode_vinculum(arabic_int, lowercase)
+    return _encode_apostrophus(arabic_int, lowercase)
+
+
+def _vinculum_values(roman_str: str):
+    for symbol, overlines, invalid in _VINCULUM_TOKEN_RE.findall(roman_str):
+        if invalid:
+            raise ValueError(f'Invalid Roman numeral character: "{invalid}"')
+        level = len(overlines) + overlines.count(_DOUBLE_OVERLINE)
+        yield _CHAR_VALUES[symbol] * 1000 ** level
+
+
+def _apostrophus_values(roman_str: str):
+    for c_run, reversed_c_run, char in _APOSTROPHUS_TOKEN_RE.findall(roman_str):
+        if char:
+            try:
+                yield _CHAR_VALUES[char]
+            except KeyError:
+                raise ValueError(f'Invalid Roman numeral character: "{char}"') from None
+        else:
+            # C's beyond the number of reversed C's are plain hundreds, e.g., CCIↃ = C + CIↃ = 900.
+            c_count, reversed_c_count = len(c_run), len(reversed_c_run)
+            if c_count >= reversed_c_count:
+                yield from repeat(100, c_count - reversed_c_count)
+                yield 10 ** (reversed_c_count + 2)
+            else:
+                yield from repeat(100, c_count)
+                yield 5 * 10 ** (reversed_c_count + 1)
+
+
+def _convert_roman_to_arabic_extended(roman_str: str, strict: bool, extended: str) -> int:
+    _check_notation(extended)
+    values = _vinculum_values(roman_str) if extended == 'vinculum' else _apostrophus_values(roman_str)
+
+    arabic_int = 0
+    prev_value = 0
+    for value in values:
+        if prev_value < value:
+            arabic_int += value - 2 * prev_value
+        else:
+            arabic_int += value
+        prev_value = value
+
+    if strict:
+        if not roman_str:
+            raise ValueError('Invalid Roman numeral: empty string')
+        # A numeral is canonical if and only if encoding its value gives it back.
+        canonical = _convert_arabic_to_roman_extended(arabic_int, False, True, extended)
+        if canonical != roman_str.replace(_DOUBLE_OVERLINE, _OVERLINE * 2).upper():
+            raise ValueError(f'Invalid Roman numeral: "{roman_str}" is not in canonical {extended} form')
+    return arabic_int
+
+
 class RomanNumeral:
     """
-    A class for Roman numerals that can handle conversion via int().
+    An immutable Roman numeral that can handle conversion via int().
+
+    Instances are interned: RomanNumeral(42) always returns the same shared object (one per
+    lowercase/nulla/extended combination), so holding millions of them costs one reference each.
+    Pass extended='vinculum' or 'apostrophus' for numbers beyond MAX_NUMBER (see EXTENDED_NOTATIONS).
+    Comparison, hashing and arithmetic work on the integer value, and arithmetic results come
+    from the same cache, so no numeral is ever encoded twice.
     """
-    int_val: int
-    str_val: str
+    __slots__ = ('int_val', 'str_val', '_lowercase', '_nulla', '_extended')
+
+    # Flyweight cache: (lowercase, nulla, extended) -> list of interned instances, indexed by int_val.
+    # Extended numerals beyond MAX_NUMBER are unbounded, so they are created fresh rather than interned.
+    _instances: dict[tuple[bool, bool, str | None], list] = {}
 
-    def __init__(self, value: Union[int, str, 'RomanNumeral'], lowercase: bool = False, nulla: bool = True):
+    def __new__(cls, value: Union[int, str, 'RomanNumeral'], lowercase: bool = False, nulla: bool = True,
+                extended: str | None = None):
         if isinstance(value, RomanNumeral):
-            object.__setattr__(self, 'int_val', value.int_val)
-            object.__setattr__(self, 'str_val', value.str_val)
+            return value
         elif isinstance(value, int):
-            object.__setattr__(self, 'int_val', value)
-            object.__setattr__(self, 'str_val', convert_arabic_to_roman(value, lowercase=lowercase, nulla=nulla))
+            arabic_int = value
         elif isinstance(value, str):
-            parsed = convert_roman_to_arabic(value)
-            object.__setattr__(self, 'int_val', parsed)
-            object.__setattr__(self, 'str_val', convert_arabic_to_roman(parsed, lowercase=lowercase))
+            arabic_int = convert_roman_to_arabic(value, extended=extended)
         else:
             raise TypeError("Value must be int (Arabic number), str (Roman numeral), or RomanNumeral object.")
 
+        try:
+            instances = cls._instances[lowercase, nulla, extended]
+        except KeyError:
+            if extended is not None:
+                _check_notation(extended)
+            instances = cls._instances[lowercase, nulla, extended] = [None] * (MAX_NUMBER + 1)
+
+        interned = 0 <= arabic_int <= MAX_NUMBER
+        instance = instances[arabic_int] if interned else None
+        if instance is None:
+            # convert_arabic_to_roman() raises for out-of-range values before anything is cached.
+            str_val = convert_arabic_to_roman(arabic_int, lowercase=lowercase, nulla=nulla, extended=extended)
+            instance = object.__new__(cls)
+            object.__setattr__(instance, 'int_val', arabic_int)
+            object.__setattr__(instance, 'str_val', str_val)
+            object.__setattr__(instance, '_lowercase', lowercase)
+            object.__setattr__(instance, '_nulla', nulla)
+            object.__setattr__(instance, '_extended', extended)
+            if interned:
+                instances[arabic_int] = instance
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"RomanNumeral is immutable; cannot assign to '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"RomanNumeral is immutable; cannot delete '{name}'")
+
+    def __reduce__(self):
+        # Unpickling goes back through __new__, so it returns the interned instance.
+        return RomanNumeral, (self.int_val, self._lowercase, self._nulla, self._extended)
+
     def __str__(self):
         return self.str_val
 
@@ -140,5 +497,73 @@ class RomanNumeral:
     def __int__(self):
         return self.int_val
 
+    def __hash__(self):
+        return hash(self.int_val)
+
+    # Comparisons accept RomanNumeral or int operands.
+
+    def __eq__(self, other):
+        if isinstance(other, RomanNumeral):
+            return self.int_val == other.int_val
+        if isinstance(other, int):
+            return self.int_val == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self.int_val < int(other)
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self.int_val <= int(other)
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self.int_val > int(other)
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self.int_val >= int(other)
+        return NotImplemented
+
+    # Arithmetic accepts RomanNumeral or int operands, and returns a RomanNumeral in the same case as self.
+
+    def _from_result(self, arabic_int: int) -> 'RomanNumeral':
+        return RomanNumeral(arabic_int, lowercase=self._lowercase, nulla=self._nulla, extended=self._extended)
+
+    def __add__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self._from_result(self.int_val + int(other))
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self._from_result(self.int_val - int(other))
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, int):
+            return self._from_result(other - self.int_val)
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self._from_result(self.int_val * int(other))
+        return NotImplemented
+
+    __rmul__ = __mul__
 
+    def __floordiv__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self._from_result(self.int_val // int(other))
+        return NotImplemented
 
+    def __mod__(self, other):
+        if isinstance(other, (RomanNumeral, int)):
+            return self._from_result(self.int_val % int(other))
+        return NotImplemented
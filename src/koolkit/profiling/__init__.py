@@ -0,0 +1,14 @@
+from .._lazy import lazy_attributes
+
+_EXPORTS = {
+    'histogram': ['Histogram'],
+    'memory': ['MemoryUsage', 'traced_memory'],
+    'registry': ['OperationStats', 'Registry', 'default_registry', 'enable', 'disable', 'is_enabled'],
+    'sampler': ['SamplingProfiler'],
+    'timing': ['timed', 'timeit'],
+}
+
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+# Submodules are imported on first use
+__getattr__, __dir__ = lazy_attributes(__name__, _EXPORTS)
@@ -0,0 +1,186 @@
+from bisect import bisect_left
+from itertools import accumulate
+
+__all__ = ['Histogram']
+
+# Log-linear buckets, as in HdrHistogram: every power of two is split into 2**_SUB_BITS equal sub-buckets,
+# so any recorded value is known to within 1/2**_SUB_BITS (about 3%). Values below 2**(_SUB_BITS + 1) are exact.
+_SUB_BITS = 5
+_SUB_COUNT = 1 << _SUB_BITS
+MAX_VALUE = (1 << 64) - 1
+_BUCKET_COUNT = ((64 - _SUB_BITS - 1) << _SUB_BITS) + (MAX_VALUE >> (64 - _SUB_BITS - 1)) + 1
+
+
+def _bucket_index(value: int) -> int:
+    shift = value.bit_length() - _SUB_BITS - 1
+    if shift < 0:
+        shift = 0
+    return (shift << _SUB_BITS) + (value >> shift)
+
+
+def _bucket_bounds(index: int) -> tuple[int, int]:
+    """
+    Lowest and highest value that fall in a bucket.
+    """
+    if index < 2 * _SUB_COUNT:
+        return index, index
+    shift = (index >> _SUB_BITS) - 1
+    sub_bucket = index - (shift << _SUB_BITS)
+    return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+
+class Histogram:
+    """
+    Fixed-memory histogram of non-negative integers (typically nanosecond timings), for percentiles without
+    keeping every sample. Recording is O(1); percentiles are accurate to about 3%, while count, total, min
+    and max are exact.
+
+    Histograms can be merged, e.g., one per thread or per worker process, combined at the end:
+
+        histograms = [Histogram() for _ in range(n_threads)]  # Each thread records into its own
+        ...
+        total = Histogram()
+        for h in histograms:
+            total.merge(h)
+        total.percentile(99)
+
+    and exported to plain dicts (JSON-serializable) with to_dict(), then restored with Histogram.from_dict().
+
+    A Histogram is not thread-safe on its own: give each thread its own, or use OperationStats, which locks.
+    """
+    __slots__ = ('count', 'total', '_min', '_max', '_counts')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self._min = MAX_VALUE + 1  # Sentinels, so record() needs no None checks
+        self._max = -1
+        self._counts = [0] * _BUCKET_COUNT
+
+    def record(self, value: int) -> None:
+        """
+        Record a value.
+
+        Raises:
+            ValueError: If the value is negative or does not fit in 64 bits.
+        """
+        if value < 0:
+            raise ValueError(f"Cannot record {value}: values must be between 0 and {MAX_VALUE}")
+        # Same as _bucket_index(), inlined with _SUB_BITS = 5: this is the hot path.
+        shift = value.bit_length() - 6
+        if shift < 0:
+            shift = 0
+        try:
+            self._counts[(shift << 5) + (value >> shift)] += 1
+        except IndexError:
+            raise ValueError(f"Cannot record {value}: values must be between 0 and {MAX_VALUE}") from None
+
+        self.count += 1
+        self.total += value
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+
+    @property
+    def min(self) -> int | None:
+        return self._min if self.count else None
+
+    @property
+    def max(self) -> int | None:
+        return self._max if self.count else None
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count else None
+
+    def percentiles(self, *qs: float) -> list[int | None]:
+        """
+        Estimated q-th percentiles (0-100) of the recorded values, in one pass.
+        """
+        if not self.count:
+            return [None] * len(qs)
+
+        cumulative = list(accumulate(self._counts))
+        results = []
+        for q in qs:
+            if not 0 <= q <= 100:
+                raise ValueError(f"Percentile must be between 0 and 100, not {q}")
+            rank = max(-(-q * self.count // 100), 1)  # ceil(), without float rounding on exact ranks
+            low, high = _bucket_bounds(bisect_left(cumulative, rank))
+            # Middle of the bucket, but never beyond the values actually seen.
+            results.append(min(max((low + high) // 2, self.min), self.max))
+        return results
+
+    def percentile(self, q: float) -> int | None:
+        """
+        Estimated q-th percentile (0-100) of the recorded values.
+        """
+        return self.percentiles(q)[0]
+
+    def merge(self, other: 'Histogram') -> 'Histogram':
+        """
+        Add another histogram's values to this one. Returns self.
+        """
+        if other.count:
+            self._counts = [a + b for a, b in zip(self._counts, other._counts)]
+            self.count += other.count
+            self.total += other.total
+            self._min = min(self._min, other._min)
+            self._max = max(self._max, other._max)
+        return self
+
+    def copy(self) -> 'Histogram':
+        histogram = Histogram()
+        histogram.merge(self)
+        return histogram
+
+    def reset(self) -> None:
+        self.__init__()
+
+    def to_dict(self) -> dict:
+        """
+        Export as a JSON-serializable dict. Only non-empty buckets are included, as [lowest value, count] pairs.
+        """
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': [[_bucket_bounds(i)[0], n] for i, n in enumerate(self._counts) if n],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Histogram':
+        """
+        Restore a histogram exported with to_dict().
+        """
+        histogram = cls()
+        for low, n in data['buckets']:
+            histogram._counts[_bucket_index(low)] += n
+        histogram.count = data['count']
+        histogram.total = data['total']
+        if histogram.count:
+            histogram._min = data['min']
+            histogram._max = data['max']
+        return histogram
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        if not isinstance(other, Histogram):
+            return NotImplemented
+        return (self.count, self.total, self._min, self._max, self._counts) == \
+               (other.count, other.total, other._min, other._max, other._counts)
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        restored = Histogram.from_dict(state)
+        for attr in self.__slots__:
+            object.__setattr__(self, attr, getattr(restored, attr))
+
+    def __repr__(self):
+        return f"{type(self).__name__}(count={self.count}, min={self.min}, max={self.max})"
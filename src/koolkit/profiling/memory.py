@@ -0,0 +1,199 @@
+import inspect
+import os
+import threading
+import tracemalloc
+from contextvars import ContextVar
+from functools import wraps
+
+from . import registry as _registry
+from .registry import Registry
+
+try:
+    import psutil
+    _process = psutil.Process()
+except ImportError:
+    _process = None
+
+__all__ = ['MemoryUsage', 'traced_memory']
+
+# Measurements in progress, innermost last. tracemalloc's peak is process-wide, so starting a measurement
+# (which resets it) first hands the peak so far to the enclosing ones.
+_active = []
+_active_lock = threading.Lock()
+_started_tracing = False  # Whether tracemalloc was started by us, and so should be stopped by us
+
+# The MemoryUsages of the traced_memory() blocks entered in the current thread or task, innermost first, as a
+# linked stack: (usage, (outer usage, (...))). Kept in a ContextVar rather than on the instance, so that one
+# instance (e.g., a decorated function's) can be entered by several threads or tasks at once.
+_usages = ContextVar('koolkit_traced_memory_usages', default=None)
+
+_IGNORED_FILES = (tracemalloc.__file__, os.path.join(os.path.dirname(__file__), '*'))
+
+
+def _current_rss() -> int | None:
+    """
+    Resident set size of the process, in bytes, using psutil if installed, else /proc (Linux). None if unavailable.
+    """
+    if _process is not None:
+        return _process.memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _take_snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, filename) for filename in _IGNORED_FILES])
+
+
+class MemoryUsage:
+    """
+    Memory used by one run of an operation (see traced_memory()). All sizes are in bytes.
+
+    Attributes:
+        peak_bytes (int): Highest traced allocation above the starting point.
+        net_bytes (int): Traced allocation still alive at the end (negative if memory was freed).
+        rss_bytes (int | None): Growth of the process's resident set size, if it can be read.
+        top_lines (list[tuple[str, int, int, int]]): The lines that allocated the most (net),
+            as (filename, line number, bytes, number of blocks), largest first.
+    """
+    __slots__ = ('name', 'peak_bytes', 'net_bytes', 'rss_bytes', 'top_lines', '_start_bytes', '_start_rss',
+                 '_peak_seen', '_snapshot')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.peak_bytes = None
+        self.net_bytes = None
+        self.rss_bytes = None
+        self.top_lines = []
+
+    def report(self) -> str:
+        lines = [f"{self.name}: peak {self.peak_bytes / 1024:.1f} KiB, net {self.net_bytes / 1024:.1f} KiB"
+                 + (f", RSS {self.rss_bytes / 1024:.1f} KiB" if self.rss_bytes is not None else '')]
+        for filename, lineno, size, count in self.top_lines:
+            lines.append(f"    {filename}:{lineno}: {size / 1024:.1f} KiB in {count} blocks")
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}, peak_bytes={self.peak_bytes}, net_bytes={self.net_bytes}, " \
+               f"rss_bytes={self.rss_bytes})"
+
+
+class traced_memory:
+    """
+    Measure the peak and net memory allocated by an operation, with tracemalloc, plus the growth of the
+    process's RSS, and record them in a Registry (default_registry unless given), alongside timed()'s timings.
+    Works as a decorator, for both regular and async functions, and as a context manager, which returns
+    the MemoryUsage (filled in on exit). The last MemoryUsage is also kept in .last.
+
+    e.g.,
+
+        with traced_memory('load_csv') as usage:
+            rows = load_csv(path)
+        print(usage.report())  # Peak/net allocation and the top allocating lines
+
+        @traced_memory()
+        def build_index(rows): ...
+
+    tracemalloc is started on entry if it is not already tracing, and stopped again when the last measurement
+    exits, so nothing is left running in between. Tracing slows Python code down noticeably, so use this for
+    investigating, not on hot paths, and don't mix it with timed() on the same operation.
+    When profiling is disabled (see koolkit.profiling.disable()), nothing is measured,
+    and functions decorated from then on are returned unwrapped.
+
+    Measurements may be nested, and made by several threads or tasks at once. tracemalloc is process-wide,
+    though, so allocations by other threads during a measurement are counted too.
+
+    Args:
+        name (str | None): Operation name. Defaults to the decorated function's qualified name.
+        registry (Registry | None): Where to record measurements. Defaults to default_registry.
+        top (int): Number of top allocating lines to keep in MemoryUsage.top_lines. 0 skips the
+            (relatively costly) tracemalloc snapshots.
+    """
+
+    def __init__(self, name: str | None = None, registry: Registry | None = None, top: int = 10):
+        self.name = name
+        self.registry = registry
+        self.top = top
+        self.last = None
+
+    def __call__(self, func):
+        if not _registry._enabled:
+            return func
+
+        measure = traced_memory(self.name or func.__qualname__, self.registry, self.top)
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _registry._enabled:
+                    return await func(*args, **kwargs)
+                with measure:
+                    return await func(*args, **kwargs)
+            async_wrapper.memory = measure
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _registry._enabled:
+                return func(*args, **kwargs)
+            with measure:
+                return func(*args, **kwargs)
+        wrapper.memory = measure  # e.g., func.memory.last.report()
+        return wrapper
+
+    def __enter__(self) -> MemoryUsage:
+        global _started_tracing
+        usage = MemoryUsage(self.name or 'unnamed')
+        _usages.set((usage, _usages.get()))
+        if not _registry._enabled:
+            usage._start_bytes = None
+            return usage
+
+        usage._start_rss = _current_rss()
+        with _active_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+            # Snapshots are traced allocations too: take it before the starting point, so it is not counted.
+            usage._snapshot = _take_snapshot() if self.top > 0 else None
+            current, peak = tracemalloc.get_traced_memory()
+            for outer in _active:
+                outer._peak_seen = max(outer._peak_seen, peak)
+            tracemalloc.reset_peak()
+            usage._start_bytes = usage._peak_seen = current
+            _active.append(usage)
+        return usage
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        global _started_tracing
+        usage, outer = _usages.get()
+        _usages.set(outer)
+        if usage._start_bytes is None:
+            return
+
+        with _active_lock:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = _take_snapshot() if usage._snapshot is not None else None
+            _active.remove(usage)
+            if not _active and _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+        rss = _current_rss()
+
+        usage.peak_bytes = max(usage._peak_seen, peak) - usage._start_bytes
+        usage.net_bytes = current - usage._start_bytes
+        if rss is not None and usage._start_rss is not None:
+            usage.rss_bytes = rss - usage._start_rss
+        if snapshot is not None:
+            usage.top_lines = [
+                (diff.traceback[0].filename, diff.traceback[0].lineno, diff.size_diff, diff.count_diff)
+                for diff in snapshot.compare_to(usage._snapshot, 'lineno')[:self.top] if diff.size_diff > 0
+            ]
+        usage._snapshot = None
+        self.last = usage
+
+        (self.registry or _registry.default_registry).record_memory(
+            usage.name, usage.peak_bytes, usage.net_bytes, usage.rss_bytes)
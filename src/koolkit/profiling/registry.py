@@ -0,0 +1,231 @@
+import os
+import threading
+
+from .histogram import Histogram
+
+__all__ = ['OperationStats', 'Registry', 'default_registry', 'enable', 'disable', 'is_enabled']
+
+# Profiling can be switched off for the whole process with KOOLKIT_PROFILING=0 (or 'false', 'off', 'no').
+# Functions decorated while profiling is off are returned unwrapped, so they cost nothing at all.
+_enabled = os.environ.get('KOOLKIT_PROFILING', '1').strip().lower() not in ('0', 'false', 'off', 'no')
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+class OperationStats:
+    """
+    Running statistics for one named operation: call count, total/min/max time, and percentiles.
+
+    Timings are kept in a fixed-memory Histogram, so memory stays bounded however many calls are recorded.
+    Memory measurements (see traced_memory()), if any, are kept alongside: a Histogram of peak allocation,
+    and the total net allocation and RSS growth.
+    """
+    __slots__ = ('name', 'histogram', 'peak_bytes', 'net_bytes', 'rss_bytes', '_lock')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.histogram = Histogram()
+        self.peak_bytes = None  # Created on the first memory measurement
+        self.net_bytes = 0
+        self.rss_bytes = 0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ns: int) -> None:
+        with self._lock:
+            self.histogram.record(elapsed_ns)
+
+    def record_memory(self, peak_bytes: int, net_bytes: int, rss_bytes: int | None = None) -> None:
+        with self._lock:
+            if self.peak_bytes is None:
+                self.peak_bytes = Histogram()
+            self.peak_bytes.record(peak_bytes)
+            self.net_bytes += net_bytes
+            self.rss_bytes += rss_bytes or 0
+
+    def merge(self, histogram: Histogram, peak_bytes: Histogram | None = None,
+              net_bytes: int = 0, rss_bytes: int = 0) -> None:
+        with self._lock:
+            self.histogram.merge(histogram)
+            if peak_bytes is not None:
+                if self.peak_bytes is None:
+                    self.peak_bytes = Histogram()
+                self.peak_bytes.merge(peak_bytes)
+            self.net_bytes += net_bytes
+            self.rss_bytes += rss_bytes
+
+    def reset(self) -> None:
+        with self._lock:
+            self.histogram.reset()
+            self.peak_bytes = None
+            self.net_bytes = 0
+            self.rss_bytes = 0
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    @property
+    def total_ns(self) -> int:
+        return self.histogram.total
+
+    @property
+    def min_ns(self) -> int | None:
+        return self.histogram.min
+
+    @property
+    def max_ns(self) -> int | None:
+        return self.histogram.max
+
+    @property
+    def mean_ns(self) -> float | None:
+        return self.histogram.mean
+
+    def percentile(self, q: float) -> int | None:
+        """
+        Estimated q-th percentile (0-100) of the recorded timings, in nanoseconds.
+        """
+        with self._lock:
+            return self.histogram.percentile(q)
+
+    def summary(self) -> dict:
+        with self._lock:
+            histogram = self.histogram.copy()
+            peak_bytes = self.peak_bytes.copy() if self.peak_bytes is not None else Histogram()
+            net_bytes, rss_bytes = self.net_bytes, self.rss_bytes
+        p50, p95, p99 = histogram.percentiles(50, 95, 99)
+        return {
+            'name': self.name,
+            'count': histogram.count,
+            'total_ns': histogram.total,
+            'mean_ns': histogram.mean,
+            'min_ns': histogram.min,
+            'max_ns': histogram.max,
+            'p50_ns': p50,
+            'p95_ns': p95,
+            'p99_ns': p99,
+            'memory_count': peak_bytes.count,
+            'peak_bytes_p50': peak_bytes.percentile(50),
+            'peak_bytes_max': peak_bytes.max,
+            'net_bytes': net_bytes,
+            'rss_bytes': rss_bytes,
+        }
+
+
+class Registry:
+    """
+    Collects OperationStats by operation name. Thread-safe.
+    default_registry is the process-wide instance that the timers record to by default.
+    """
+
+    def __init__(self):
+        self._stats: dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, name: str) -> OperationStats:
+        """
+        Get the stats for an operation, creating them on first use.
+        """
+        try:
+            return self._stats[name]
+        except KeyError:
+            with self._lock:
+                return self._stats.setdefault(name, OperationStats(name))
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        self.stats(name).record(elapsed_ns)
+
+    def record_memory(self, name: str, peak_bytes: int, net_bytes: int, rss_bytes: int | None = None) -> None:
+        self.stats(name).record_memory(peak_bytes, net_bytes, rss_bytes)
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Summaries of all operations recorded so far, by name.
+        """
+        with self._lock:
+            stats = list(self._stats.values())
+        return {s.name: s.summary() for s in stats}
+
+    def reset(self) -> None:
+        """
+        Clear all statistics. Operations are kept, with nothing recorded, as decorated functions record
+        to their OperationStats directly.
+        """
+        with self._lock:
+            stats = list(self._stats.values())
+        for s in stats:
+            s.reset()
+
+    def export(self) -> dict[str, dict]:
+        """
+        All statistics, by operation name, as JSON-serializable dicts (histograms as in Histogram.to_dict()).
+        e.g., to send a worker process's timings back to the parent, which merge()s them.
+        """
+        with self._lock:
+            stats = list(self._stats.values())
+        exported = {}
+        for s in stats:
+            with s._lock:
+                exported[s.name] = {
+                    'time_ns': s.histogram.to_dict(),
+                    'peak_bytes': s.peak_bytes.to_dict() if s.peak_bytes is not None else None,
+                    'net_bytes': s.net_bytes,
+                    'rss_bytes': s.rss_bytes,
+                }
+        return exported
+
+    def merge(self, other: 'Registry | dict[str, dict]') -> None:
+        """
+        Add the timings of another Registry, or of a Registry.export(), to this one.
+        """
+        exported = other.export() if isinstance(other, Registry) else other
+        for name, data in exported.items():
+            peak_bytes = Histogram.from_dict(data['peak_bytes']) if data['peak_bytes'] is not None else None
+            self.stats(name).merge(Histogram.from_dict(data['time_ns']), peak_bytes, data['net_bytes'], data['rss_bytes'])
+
+    def report(self) -> str:
+        """
+        A plain-text table of all operations, slowest total time first,
+        followed by a table of memory measurements if there are any.
+        """
+        def ms(ns):
+            return '-' if ns is None else f"{ns / 1e6:.3f}"
+
+        rows = sorted(self.snapshot().values(), key=lambda s: s['total_ns'], reverse=True)
+        header = f"{'operation':<40} {'calls':>10} {'total ms':>12} {'mean ms':>10} {'min ms':>10} " \
+                 f"{'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'max ms':>10}"
+        lines = [header, '-' * len(header)]
+        for s in rows:
+            if not s['count'] and s['memory_count']:
+                continue  # Only measured with traced_memory()
+            lines.append(f"{s['name']:<40} {s['count']:>10} {ms(s['total_ns']):>12} {ms(s['mean_ns']):>10} "
+                         f"{ms(s['min_ns']):>10} {ms(s['p50_ns']):>10} {ms(s['p95_ns']):>10} "
+                         f"{ms(s['p99_ns']):>10} {ms(s['max_ns']):>10}")
+
+        memory_rows = [s for s in rows if s['memory_count']]
+        if memory_rows:
+            def kib(n):
+                return '-' if n is None else f"{n / 1024:.1f}"
+
+            header = f"{'operation':<40} {'measured':>10} {'peak KiB p50':>14} {'peak KiB max':>14} " \
+                     f"{'net KiB/call':>14} {'RSS KiB/call':>14}"
+            lines += ['', header, '-' * len(header)]
+            for s in sorted(memory_rows, key=lambda s: s['peak_bytes_max'], reverse=True):
+                lines.append(f"{s['name']:<40} {s['memory_count']:>10} {kib(s['peak_bytes_p50']):>14} "
+                             f"{kib(s['peak_bytes_max']):>14} {kib(s['net_bytes'] / s['memory_count']):>14} "
+                             f"{kib(s['rss_bytes'] / s['memory_count']):>14}")
+        return '\n'.join(lines)
+
+
+default_registry = Registry()
@@ -0,0 +1,187 @@
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from typing import TextIO
+
+from . import registry as _registry
+
+__all__ = ['SamplingProfiler']
+
+_TRUNCATED = '[truncated]'
+_TRUNCATED_FRAMES = '<truncated>'  # Stands for the outer frames of a stack cut at max_depth
+
+
+def _frame_label(code) -> str:
+    if code is _TRUNCATED_FRAMES:
+        return code
+    # ';' separates frames in the collapsed format, and the last space separates the count.
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a background thread snapshots the stack of every thread (sys._current_frames())
+    at a fixed rate, and counts how often each stack is seen. Unlike timed(), it covers code nobody wrapped.
+
+    Results are collapsed stacks ("outer;inner;leaf count" lines), as read by flamegraph.pl, speedscope,
+    or inferno, e.g.,
+
+        with SamplingProfiler(output='profile.folded'):
+            run_batch()
+
+        @SamplingProfiler(rate=200, output='handler.folded')
+        def handle(request): ...
+
+        $ flamegraph.pl profile.folded > profile.svg
+
+    Overhead is bounded: the sampler backs off so it never uses more than max_overhead of the wall-clock time,
+    only the innermost max_depth frames of each stack are walked (the rest show as a '<truncated>' root frame),
+    and at most max_stacks distinct stacks are kept (further new stacks are
+    counted under '[truncated]'). Nothing runs when profiling is disabled (see koolkit.profiling.disable()).
+
+    The same instance may be entered several times (nested, or from several threads); sampling runs while at least
+    one is active, and the output file (if any) is written when the last one exits.
+
+    Args:
+        rate (float): Samples per second. Default is 100.
+        output (str | PathLike | None): File to write the collapsed stacks to when sampling stops.
+        max_stacks (int): Maximum number of distinct stacks kept.
+        max_depth (int): Maximum number of frames kept per stack, from the innermost (leaf) one.
+        max_overhead (float): Maximum fraction of the time spent sampling. Default is 0.02 (2%).
+    """
+
+    def __init__(self, rate: float = 100, output: str | os.PathLike | None = None,
+                 max_stacks: int = 10_000, max_depth: int = 128, max_overhead: float = 0.02):
+        if rate <= 0:
+            raise ValueError(f"Sampling rate must be positive, not {rate}")
+        if not 0 < max_overhead <= 1:
+            raise ValueError(f"max_overhead must be between 0 and 1, not {max_overhead}")
+        self.interval = 1 / rate
+        self.output = output
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.max_overhead = max_overhead
+        self.sample_count = 0
+        self.sampling_ns = 0  # Total time spent taking samples
+        self._stacks = Counter()  # Stacks as tuples of code objects (or _TRUNCATED_FRAMES), outermost first
+        self._active = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if not _registry._enabled:
+            return
+        with self._lock:
+            self._active += 1
+            if self._active > 1:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='koolkit-sampling-profiler', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._active == 0:
+                return
+            self._active -= 1
+            if self._active > 0:
+                return
+            self._stop_event.set()
+            thread, self._thread = self._thread, None
+        thread.join()
+        if self.output is not None:
+            self.write_collapsed(self.output)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while True:
+            start = time.perf_counter_ns()
+            self._sample(own_ident)
+            elapsed = time.perf_counter_ns() - start
+            self.sampling_ns += elapsed
+            self.sample_count += 1
+            # Wait at least long enough that sampling stays within max_overhead of the time.
+            delay = max(self.interval, elapsed / 1e9 / self.max_overhead - elapsed / 1e9)
+            if self._stop_event.wait(delay):
+                return
+
+    def _sample(self, own_ident: int):
+        stacks = self._stacks
+        max_depth = self.max_depth
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            codes = []
+            while frame is not None and len(codes) < max_depth:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            if frame is not None:
+                codes.append(_TRUNCATED_FRAMES)
+            codes.reverse()
+            stack = tuple(codes)
+            if stack in stacks or len(stacks) < self.max_stacks:
+                stacks[stack] += 1
+            else:
+                stacks[_TRUNCATED] += 1
+
+    def collapsed(self) -> dict[str, int]:
+        """
+        Sample counts by collapsed stack ("outer;inner;leaf"), most frequent first.
+        """
+        collapsed = Counter()
+        for stack, count in list(self._stacks.items()):
+            key = stack if stack == _TRUNCATED else ';'.join(map(_frame_label, stack))
+            collapsed[key] += count
+        return dict(collapsed.most_common())
+
+    def write_collapsed(self, file: str | os.PathLike | TextIO) -> None:
+        """
+        Write the collapsed stacks, one "stack count" line each, to a file path or text stream.
+        """
+        lines = ''.join(f"{stack} {count}\n" for stack, count in self.collapsed().items())
+        if hasattr(file, 'write'):
+            file.write(lines)
+        else:
+            with open(file, 'w', encoding='utf-8') as f:
+                f.write(lines)
+
+    def reset(self) -> None:
+        self._stacks.clear()
+        self.sample_count = 0
+        self.sampling_ns = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __call__(self, func):
+        if not _registry._enabled:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with self:
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rate={1 / self.interval:g}, samples={self.sample_count}, running={self.running})"
@@ -1,3 +1,15 @@
-from .ripple_progress_bar import RippleProgressBar
-from .spinner_progress_bar import SpinnerProgressBar
-from .ellipsis_progress_bar import EllipsisProgressBar
\ No newline at end of file
+from .._lazy import lazy_attributes
+
+_EXPORTS = {
+    'scheduler': ['ANIMATE', 'OFF', 'STATUS', 'RenderScheduler', 'render_scheduler'],
+    'ripple_progress_bar': ['RippleProgressBar'],
+    'spinner_progress_bar': ['SpinnerProgressBar'],
+    'ellipsis_progress_bar': ['EllipsisProgressBar'],
+    'determinate_progress_bar': ['Progress'],
+    'shared_progress_bar': ['ProgressCounter', 'SharedProgress'],
+}
+
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+# Submodules are imported on first use, so a command line tool only pays for the bars it shows
+__getattr__, __dir__ = lazy_attributes(__name__, _EXPORTS)
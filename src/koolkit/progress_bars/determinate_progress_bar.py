@@ -0,0 +1,250 @@
+import time
+from typing import Any, Awaitable, Iterable, Iterator, TypeVar
+
+from .scheduler import _format_duration, _handle_sigint, _restore_sigint, render_scheduler
+
+T = TypeVar('T')
+
+# Eighths of a block, for sub-character precision
+_PARTIAL_BLOCKS = " ▏▎▍▌▋▊▉"
+_FULL_BLOCK = "█"
+
+
+def _format_rate(rate: float) -> str:
+    for unit in ('', 'k', 'M', 'G'):
+        if rate < 1000:
+            return f"{rate:.1f}{unit}"
+        rate /= 1000
+    return f"{rate:.1f}T"
+
+
+class Progress:
+    def __init__(
+        self,
+        iterable: Iterable[T] | None = None,
+        total: int | None = None,
+        msg: str | None = "",
+        exit_msg: str | None = None,
+        fps: float = 10,
+        width: int = 30,
+        unit: str = "it",
+        leave: bool = True,
+    ):
+        """
+        Determinate progress bar, with percentage, throughput and ETA, e.g.,
+
+            for row in Progress(rows, msg="Importing"):
+                ...
+
+            with Progress(total=n_bytes, unit="B") as progress:
+                for chunk in chunks:
+                    ...
+                    progress.update(len(chunk))
+
+            results = await Progress(msg="Fetching").gather(*(fetch(url) for url in urls))
+
+        Counting is all that happens on the caller's side (an integer increment per item, or per update()),
+        so it is cheap enough for tight loops of millions of items. Drawing happens on the render scheduler's
+        thread, at a fixed frame rate, or, with 'async with' (and gather() and as_completed()), from the
+        event loop. update() is meant to be called from one thread at a time.
+
+        Args:
+            iterable (iterable): Items to iterate over, counting each one. Optional with update().
+            total (int): Expected number of items. Defaults to len(iterable), if it has one.
+                Without a total, only the count and rate are shown.
+            msg (str): Message shown before the bar.
+            exit_msg (str): Message to print when the process is completed.
+            fps (float): Frames per second.
+            width (int): Width of the bar, in characters.
+            unit (str): Unit of the items, shown with the count and rate.
+            leave (bool): If True, leave the final state of the bar on screen on exit; otherwise clear it.
+        """
+
+        self.iterable = iterable
+        if total is None and iterable is not None:
+            try:
+                total = len(iterable)
+            except TypeError:
+                pass
+        self.total = total
+        self.msg = msg
+        self.exit_msg = exit_msg
+        self.interval = 1 / fps  # Seconds between frames, for the render scheduler
+        self.width = width
+        self.unit = unit
+        self.leave = leave
+
+        self.n = 0
+        self.start_time = None
+        self._active = False
+        self._rate = None  # Smoothed items per second
+        self._last_n = 0
+        self._last_time = None
+
+    def update(self, n: int = 1) -> None:
+        """
+        Advance the count by n items.
+        """
+        self.n += n
+
+    def __iter__(self) -> Iterator[T]:
+        if self.iterable is None:
+            raise TypeError("Progress was created without an iterable; use update() instead")
+        entered = not self._active
+        if entered:
+            self.__enter__()
+        try:
+            for item in self.iterable:
+                yield item
+                self.n += 1
+        finally:
+            if entered:
+                self.__exit__(None, None, None)
+
+    def __len__(self):
+        if self.total is None:
+            raise TypeError("Progress has no total")
+        return self.total
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start_time if self.start_time is not None else 0.0
+
+    @property
+    def rate(self) -> float | None:
+        """
+        Items per second, smoothed over recent frames.
+        """
+        return self._rate
+
+    def _update_rate(self, n: int, now: float):
+        if self._last_time is None:
+            self._last_time = self.start_time
+        dt = now - self._last_time
+        if dt <= 0:
+            return
+        rate = (n - self._last_n) / dt
+        # Exponential moving average, so the ETA follows changes in speed without jumping around.
+        self._rate = rate if self._rate is None else 0.3 * rate + 0.7 * self._rate
+        self._last_n = n
+        self._last_time = now
+
+    def _bar(self, fraction: float) -> str:
+        eighths = int(fraction * self.width * 8)
+        full, partial = divmod(eighths, 8)
+        if full >= self.width:
+            return _FULL_BLOCK * self.width
+        return _FULL_BLOCK * full + _PARTIAL_BLOCKS[partial] + " " * (self.width - full - 1)
+
+    def _render(self, final: bool = False) -> str:
+        n = self.n
+        now = time.monotonic()
+        elapsed = now - self.start_time
+        if final:
+            rate = n / elapsed if elapsed > 0 else None
+        else:
+            self._update_rate(n, now)
+            rate = self._rate
+        rate_text = f"{_format_rate(rate)} {self.unit}/s" if rate is not None else f"? {self.unit}/s"
+        msg = f"{self.msg} " if self.msg else ""
+
+        if self.total:
+            fraction = min(n / self.total, 1.0)
+            if final or n >= self.total:
+                eta = "00:00"
+            elif rate:
+                eta = _format_duration((self.total - n) / rate)
+            else:
+                eta = "?"
+            return f"{msg}{fraction:4.0%} |{self._bar(fraction)}| {n}/{self.total} " \
+                   f"[{_format_duration(elapsed)}<{eta}, {rate_text}]"
+        return f"{msg}{n} {self.unit} [{_format_duration(elapsed)}, {rate_text}]"
+
+    def _next_frame(self) -> str:
+        return self._render()
+
+    def _status_line(self, elapsed: float) -> str:
+        return self._render()
+
+    async def _counted(self, aw: Awaitable):
+        # Counts in the task itself, which is cheaper than a done callback (scheduled separately on the loop).
+        try:
+            return await aw
+        finally:
+            self.n += 1
+
+    def _track(self, aws: Iterable[Awaitable]) -> list[Awaitable]:
+        tracked = [self._counted(aw) for aw in aws]
+        if self.total is None:
+            self.total = len(tracked)
+        return tracked
+
+    async def gather(self, *aws: Awaitable, return_exceptions: bool = False) -> list[Any]:
+        """
+        Like asyncio.gather(), advancing by one as each awaitable completes. The total defaults to the number
+        of awaitables. Enters the progress bar (as with 'async with') for the duration, unless entered already.
+        """
+        import asyncio  # Imported by then, but slow to import up front
+
+        tracked = self._track(aws)
+        entered = not self._active
+        if entered:
+            await self.__aenter__()
+        try:
+            return await asyncio.gather(*tracked, return_exceptions=return_exceptions)
+        finally:
+            if entered:
+                await self.__aexit__(None, None, None)
+
+    def as_completed(self, aws: Iterable[Awaitable], timeout: float | None = None) -> Iterator[Awaitable]:
+        """
+        Like asyncio.as_completed(), advancing by one as each awaitable completes, e.g.,
+
+            for next_done in Progress(msg="Fetching").as_completed(tasks):
+                result = await next_done
+
+        The total defaults to the number of awaitables. Enters the progress bar (as with 'async with')
+        on the first item, unless entered already, and exits after the last.
+        """
+        import asyncio
+
+        tracked = self._track(aws)
+        entered = not self._active
+        if entered:
+            self._start(render_scheduler.register_async)
+        try:
+            yield from asyncio.as_completed(tracked, timeout=timeout)
+        finally:
+            if entered:
+                self._stop()
+
+    def _start(self, register):
+        self.start_time = time.monotonic()
+        self._active = True
+        self._shown = not render_scheduler.disabled
+        if self._shown:
+            register(self)
+
+    def _stop(self):
+        if not self._active:
+            return
+        self._active = False
+        if self._shown:
+            render_scheduler.unregister(self, self.exit_msg, self._render(final=True) if self.leave else None)
+
+    def __enter__(self):
+        self._previous_sigint = None if render_scheduler.disabled else _handle_sigint(self)
+        self._start(render_scheduler.register)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop()
+        _restore_sigint(self._previous_sigint)
+
+    async def __aenter__(self):
+        # No signal handler: asyncio handles Ctrl+C by cancelling the task, which exits this normally.
+        self._start(render_scheduler.register_async)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._stop()
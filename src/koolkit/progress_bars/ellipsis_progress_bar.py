@@ -1,10 +1,4 @@
-import sys
-import time
-import threading
-import signal
-
-HIDE_CURSOR = "\033[?25l"
-SHOW_CURSOR = "\033[?25h"
+from .scheduler import _format_duration, _handle_sigint, _restore_sigint, render_scheduler
 
 
 class EllipsisProgressBar:
@@ -29,9 +23,8 @@ class EllipsisProgressBar:
         self.msg = msg
         self.exit_msg = exit_msg
         self.speed = {"fast": 0.1, "medium": 0.25, "slow": 0.5}.get(speed.lower(), 0.25)
+        self.interval = self.speed  # Seconds between frames, for the render scheduler
 
-        self._stop = threading.Event()
-        self._thread = None
         self._frame_index = 0
 
         if forward_only:
@@ -39,34 +32,31 @@ class EllipsisProgressBar:
         else:
             self.frames = ["", ".", "..", "...", "..", ".", ""]
 
-    def _animate(self):
-        num_frames = len(self.frames)
-        max_len = len(self.msg) + 3  # max length with "..."
-        while not self._stop.is_set():
-            frame = self.frames[self._frame_index]
-            display = f"{self.msg}{frame}"
-            # Pad with spaces to clear previous longer text
-            padded_display = display.ljust(max_len)
-
-            sys.stderr.write(f"\r{padded_display}")
-            sys.stderr.flush()
+    def _next_frame(self) -> str:
+        frame = self.frames[self._frame_index]
+        self._frame_index = (self._frame_index + 1) % len(self.frames)
+        return f"{self.msg}{frame}"
 
-            self._frame_index = (self._frame_index + 1) % num_frames
-            time.sleep(self.speed)
+    def _status_line(self, elapsed: float) -> str:
+        return f"{self.msg} [{_format_duration(elapsed)}]"
 
     def __enter__(self):
-        sys.stderr.write(HIDE_CURSOR)
-        sys.stderr.flush()
-        signal.signal(signal.SIGINT, lambda *_: self.__exit__(None, None, None))
-        self._thread = threading.Thread(target=self._animate, daemon=True)
-        self._thread.start()
+        self._previous_sigint = None
+        if render_scheduler.disabled:
+            return self
+        self._previous_sigint = _handle_sigint(self)
+        render_scheduler.register(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self._stop.set()
-        self._thread.join()
-        clear_line = "\r" + " " * (len(self.msg) + 5) + "\r"
-        sys.stderr.write(clear_line)
-        sys.stderr.write(SHOW_CURSOR)
-        sys.stderr.flush()
-        print(self.exit_msg)
+        render_scheduler.unregister(self, self.exit_msg)
+        _restore_sigint(self._previous_sigint)
+
+    async def __aenter__(self):
+        # No signal handler: asyncio handles Ctrl+C by cancelling the task, which exits this normally.
+        if not render_scheduler.disabled:
+            render_scheduler.register_async(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        render_scheduler.unregister(self, self.exit_msg)
@@ -1,17 +1,10 @@
 import sys
-import time
-import threading
-import signal
+from importlib.util import find_spec
 
-try:
-    from rich.console import Console
-    from rich.text import Text
-    _rich_installed = True
-except ImportError:
-    _rich_installed = False
+from .scheduler import _format_duration, _handle_sigint, _restore_sigint, render_scheduler
 
-HIDE_CURSOR = "\033[?25l"
-SHOW_CURSOR = "\033[?25h"
+# Rich is slow to import, so it is only imported once a bar that uses it is shown.
+_rich_installed = find_spec('rich') is not None
 
 ANSI_COLOR_CODES = {
     "black": 30,
@@ -66,6 +59,7 @@ class RippleProgressBar:
         self.msg = msg
         self.exit_msg = exit_msg
         self.speed = {"fast": 0.05, "medium": 0.1, "slow": 0.2}.get(speed.lower(), 0.1)
+        self.interval = self.speed  # Seconds between frames, for the render scheduler
         self.rainbow = rainbow
         self.inverse = inverse
         if use_rich is None:
@@ -75,12 +69,11 @@ class RippleProgressBar:
 
         self._index = 0
         self._direction = 1
-        self._stop = threading.Event()
-        self._thread = None
-        self.console = Console() if self.use_rich else None
+        self.console = None  # Rich console, created on first use
 
         if not colors:
             colors = ["red", "yellow", "green", "cyan", "blue", "magenta"]
+        colors = list(colors)  # Don't extend the caller's list
         if len(colors) < 6:
             needed = 6 - len(colors)
             extension = colors[-needed:][::-1]
@@ -88,6 +81,8 @@ class RippleProgressBar:
         self.colors = colors
 
     def _rich_frame(self):
+        from rich.text import Text
+
         t = Text()
         length = len(self.msg)
         for i, char in enumerate(self.msg):
@@ -145,47 +140,76 @@ class RippleProgressBar:
                     output += f"{DIM}{ch}{RESET}"
         return output
 
-    def _animate(self):
+    def _step(self):
         length = len(self.msg)
-        while not self._stop.is_set():
-            # Move index back and forth between 0 and len(text)-2
-            if self._index >= length - 2:
-                self._direction = -1
-            elif self._index <= 0:
-                self._direction = 1
-            self._index += self._direction
-
-            if self.use_rich:
-                frame = self._rich_frame()
-                # Print frame without newline or automatic carriage return
-                self.console.print(frame, end="")
-                # Move cursor back to start to overwrite in next iteration
-                self.console.file.write("\r")
-                self.console.file.flush()
-            else:
-                frame = self._ansi_frame()
-                sys.stderr.write(f"\r{frame}")
-                sys.stderr.flush()
-
-            time.sleep(self.speed)
+        # Move index back and forth between 0 and len(text)-2
+        if self._index >= length - 2:
+            self._direction = -1
+        elif self._index <= 0:
+            self._direction = 1
+        self._index += self._direction
+
+    def _rendered_rich_frame(self) -> str:
+        if self.console is None:
+            from rich.console import Console
+            self.console = Console(file=sys.stderr)
+        # Render to a string, so that the render scheduler writes it along with the other indicators.
+        with self.console.capture() as capture:
+            self.console.print(self._rich_frame(), end="")
+        return capture.get()
+
+    def _reset_frames(self):
+        """
+        Work out the animation's cycle. A frame only depends on the index, which bounces back and forth,
+        so the animation is a short cycle of indexes: each distinct frame is rendered the first time it is
+        shown, and every tick after that is a lookup. (Rendering them all here would stall __enter__ for
+        long messages, especially with Rich.)
+        """
+        cycle = []
+        positions = {}  # (index, direction) before each step -> position of the frame after it
+        self._index, self._direction = 0, 1
+        while (self._index, self._direction) not in positions:
+            positions[self._index, self._direction] = len(cycle)
+            self._step()
+            cycle.append(self._index)
+        self._cycle = cycle
+        self._loop_position = positions[self._index, self._direction]  # Where the cycle starts again
+        self._position = 0
+        self._frames = {}  # Index -> rendered frame
+
+    def _next_frame(self) -> str:
+        index = self._cycle[self._position]
+        self._position += 1
+        if self._position == len(self._cycle):
+            self._position = self._loop_position
+        frame = self._frames.get(index)
+        if frame is None:
+            self._index = index
+            frame = self._frames[index] = self._rendered_rich_frame() if self.use_rich else self._ansi_frame()
+        return frame
+
+    def _status_line(self, elapsed: float) -> str:
+        return f"{self.msg} [{_format_duration(elapsed)}]"
 
     def __enter__(self):
-        # Hide cursor and start animation thread
-        sys.stderr.write(HIDE_CURSOR)
-        sys.stderr.flush()
-        signal.signal(signal.SIGINT, lambda *_: self.__exit__(None, None, None))
-        self._thread = threading.Thread(target=self._animate, daemon=True)
-        self._thread.start()
+        self._previous_sigint = None
+        if render_scheduler.disabled:
+            return self
+        self._reset_frames()
+        self._previous_sigint = _handle_sigint(self)
+        render_scheduler.register(self)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        # Stop animation and clean up
-        self._stop.set()
-        self._thread.join()
-        clear_line = "\r" + " " * (len(self.msg) + 10) + "\r"
-        sys.stderr.write(clear_line)
-        sys.stderr.write(SHOW_CURSOR)
-        sys.stderr.flush()
-        print(self.exit_msg)
-
+        render_scheduler.unregister(self, self.exit_msg)
+        _restore_sigint(self._previous_sigint)
+
+    async def __aenter__(self):
+        # No signal handler: asyncio handles Ctrl+C by cancelling the task, which exits this normally.
+        if not render_scheduler.disabled:
+            self._reset_frames()
+            render_scheduler.register_async(self)
+        return self
 
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        render_scheduler.unregister(self, self.exit_msg)
@@ -0,0 +1,287 @@
+import os
+import signal
+import sys
+import threading
+import time
+import warnings
+from typing import TextIO
+
+__all__ = ['ANIMATE', 'STATUS', 'OFF', 'RenderScheduler', 'render_scheduler']
+
+# Display modes
+ANIMATE = 'animate'  # Redraw the indicators in place, on each frame
+STATUS = 'status'  # Print a plain status line per indicator every so often, e.g., for logs
+OFF = 'off'  # Show nothing
+_MODES = (ANIMATE, STATUS, OFF)
+
+HIDE_CURSOR = "\033[?25l"
+SHOW_CURSOR = "\033[?25h"
+ERASE_TO_END_OF_LINE = "\033[K"
+ERASE_TO_END_OF_SCREEN = "\033[J"
+
+# Frames due within this many seconds (or half their interval, if shorter) are drawn together, a little early,
+# rather than in separate writes.
+_COALESCE_WINDOW = 0.01
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+class RenderScheduler:
+    """
+    Drives all active progress indicators from a single background thread.
+
+    Each indicator has an 'interval' (seconds between frames) and a '_next_frame()' method that advances its
+    animation and returns its current line. The thread sleeps until the next frame of any indicator is due,
+    then redraws all of them, one line each in the order they were entered, with a single write() and flush().
+    The thread only runs while at least one indicator is active.
+
+    Indicators entered with 'async with' are registered with register_async() instead, and animated by a timer
+    callback on the running event loop, so no thread is started. (If the thread is already running, it draws
+    them too.)
+
+    Animation only makes sense on a terminal. When the stream isn't one (e.g., redirected to a file, or under
+    systemd), the indicators are shown in STATUS mode instead: a plain line for each of them (its
+    '_status_line(elapsed)') when it's entered and then every status_interval seconds, with no escape codes.
+    In OFF mode, nothing is shown at all, not even exit messages, and entering an indicator costs next to nothing.
+    The mode is chosen when the first of a set of indicators is entered, and kept until they have all exited.
+
+    render_scheduler is the shared instance the progress bars use, writing to sys.stderr. Its mode and status
+    interval default to the KOOLKIT_PROGRESS ('auto', 'animate', 'status' or 'off') and
+    KOOLKIT_PROGRESS_INTERVAL (seconds) environment variables.
+
+    Args:
+        stream (TextIO | None): Where to draw. Default is sys.stderr (looked up on each write).
+        mode (str | None): ANIMATE, STATUS or OFF. None (default) animates if the stream is a terminal,
+            and shows status lines otherwise.
+        status_interval (float): Seconds between status lines, in STATUS mode.
+    """
+
+    def __init__(self, stream: TextIO | None = None, mode: str | None = None, status_interval: float = 30):
+        self.stream = stream
+        self.mode = mode
+        self.status_interval = status_interval
+        self._due: dict[object, float] = {}  # Active indicators (in order) -> time their next frame is due
+        self._lines: dict[object, str] = {}  # Active indicators -> their current line
+        self._started: dict[object, float] = {}  # Active indicators -> time they were entered
+        self._status = False  # Whether the active indicators are shown in STATUS mode
+        self._condition = threading.Condition()
+        self._thread = None
+        self._loop = None  # Event loop animating the indicators, if not the thread
+        self._timer = None  # Its next scheduled frame
+        self._drawn = False  # Whether the block of lines is on screen
+
+    def _write(self, text: str) -> None:
+        stream = self.stream or sys.stderr
+        stream.write(text)
+        stream.flush()
+
+    @property
+    def mode(self) -> str | None:
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: str | None):
+        if mode is not None and mode not in _MODES:
+            raise ValueError(f"mode must be one of {', '.join(_MODES)}, or None; got {mode!r}")
+        self._mode = mode
+
+    @property
+    def disabled(self) -> bool:
+        """
+        Whether the mode is OFF, in which case indicators needn't prepare anything to show.
+        """
+        return self._mode == OFF
+
+    def _is_terminal(self) -> bool:
+        try:
+            return (self.stream or sys.stderr).isatty()
+        except (AttributeError, ValueError):  # No isatty(), or closed
+            return False
+
+    def _add(self, indicator) -> bool:
+        if self._mode == OFF:
+            return False
+        if not self._due:
+            self._status = (self._mode or (ANIMATE if self._is_terminal() else STATUS)) == STATUS
+            if not self._status:
+                self._write(HIDE_CURSOR)
+        self._due[indicator] = self._started[indicator] = time.monotonic()
+        self._lines[indicator] = ''
+        return True
+
+    def register(self, indicator) -> None:
+        """
+        Start drawing an indicator. Its first frame is drawn right away.
+        """
+        with self._condition:
+            if not self._add(indicator):
+                return
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='koolkit-progress-render', daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def register_async(self, indicator) -> None:
+        """
+        Start drawing an indicator from the running event loop, without a thread. Its first frame is drawn
+        as soon as the loop gets to it. Must be called from a coroutine or callback.
+        """
+        import asyncio  # Imported by then, but slow to import up front
+
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self._thread is not None or self._loop not in (None, loop):
+                # Already drawn by the thread, or by another event loop, which can't share: use the thread.
+                self.register(indicator)
+                return
+            if not self._add(indicator):
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._loop = loop
+            self._timer = loop.call_soon(self._run_async)
+
+    def unregister(self, indicator, exit_msg: str | None = None, final_line: str | None = None) -> None:
+        """
+        Stop drawing an indicator, clear the block of lines, and print exit_msg (to stdout) where it was,
+        after final_line (to the stream), e.g., the indicator's last frame. The remaining indicators,
+        if any, are drawn again below them. (In STATUS mode, only final_line and exit_msg are printed.)
+        """
+        if indicator not in self._due:  # e.g., never shown, in OFF mode (checked again under the lock)
+            return
+        with self._condition:
+            if self._due.pop(indicator, None) is None:
+                return
+            del self._lines[indicator]
+            del self._started[indicator]
+            text = "\r" + ERASE_TO_END_OF_SCREEN if self._drawn else ''
+            if final_line is not None:
+                text += final_line + "\n"
+            self._drawn = False
+            if not self._due:
+                if not self._status:
+                    text += SHOW_CURSOR
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = self._loop = None
+            if text:
+                self._write(text)
+            if exit_msg is not None:
+                print(exit_msg, flush=True)
+            self._condition.notify()
+
+    @property
+    def active(self) -> list:
+        with self._condition:
+            return list(self._due)
+
+    def _tick(self) -> float:
+        """
+        Draw the frames that are due, and return the seconds until the next one is. Call with the lock held.
+        """
+        now = time.monotonic()
+        if self._status:
+            self._print_status(now)
+        else:
+            redraw = not self._drawn
+            for indicator, due in self._due.items():
+                if due <= now + min(_COALESCE_WINDOW, indicator.interval / 2):
+                    self._lines[indicator] = indicator._next_frame()
+                    # Stay on the indicator's own schedule, unless it fell behind by more than a frame.
+                    self._due[indicator] = max(due + indicator.interval, now)
+                    redraw = True
+            if redraw:
+                self._draw()
+        return max(min(self._due.values(), default=now) - time.monotonic(), 0)
+
+    def _run(self):
+        with self._condition:
+            while self._due:
+                self._condition.wait(self._tick())
+            self._thread = None
+
+    def _run_async(self):
+        with self._condition:
+            if not self._due or self._thread is not None:
+                self._timer = self._loop = None
+                return
+            self._timer = self._loop.call_later(self._tick(), self._run_async)
+
+    def _print_status(self, now: float):
+        lines = []
+        for indicator, due in self._due.items():
+            if due <= now + _COALESCE_WINDOW:
+                lines.append(indicator._status_line(now - self._started[indicator]))
+                self._due[indicator] = max(due + self.status_interval, now)
+        if lines:
+            self._write("\n".join(lines) + "\n")
+
+    def _draw(self):
+        lines = list(self._lines.values())
+        # One line per indicator, clearing leftovers of longer lines, and of indicators that have since exited.
+        # The cursor is then moved back to the start of the block, ready for the next draw.
+        text = "\r" + (ERASE_TO_END_OF_LINE + "\n").join(lines) + ERASE_TO_END_OF_SCREEN
+        if len(lines) > 1:
+            text += f"\033[{len(lines) - 1}A\r"
+        self._write(text)
+        self._drawn = True
+
+
+def _handle_sigint(indicator):
+    """
+    Install a SIGINT handler that exits the indicator (clearing it from the screen) before handing the signal
+    on to the handler it replaces, which by default raises KeyboardInterrupt. Returns that handler, for
+    _restore_sigint() on exit. Only the main thread can install signal handlers, so elsewhere this does
+    nothing and returns None.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return None
+
+    def handler(signum, frame):
+        indicator.__exit__(None, None, None)
+        if callable(previous):
+            previous(signum, frame)
+
+    previous = signal.signal(signal.SIGINT, handler)
+    return previous
+
+
+def _restore_sigint(previous) -> None:
+    if previous is not None:
+        signal.signal(signal.SIGINT, previous)
+
+
+# Invalid values of the environment variables are ignored, with a warning, rather than failing the import.
+
+def _mode_from_environment() -> str | None:
+    mode = os.environ.get('KOOLKIT_PROGRESS', 'auto').strip().lower()
+    if mode == 'auto':
+        return None
+    if mode not in _MODES:
+        warnings.warn(f"Ignoring KOOLKIT_PROGRESS={mode!r}: expected 'auto', {', '.join(map(repr, _MODES))}",
+                      RuntimeWarning, stacklevel=2)
+        return None
+    return mode
+
+
+def _status_interval_from_environment() -> float:
+    value = os.environ.get('KOOLKIT_PROGRESS_INTERVAL', '30')
+    try:
+        interval = float(value)
+    except ValueError:
+        interval = None
+    if interval is None or not interval > 0:
+        warnings.warn(f"Ignoring KOOLKIT_PROGRESS_INTERVAL={value!r}: expected a positive number of seconds",
+                      RuntimeWarning, stacklevel=2)
+        return 30
+    return interval
+
+
+render_scheduler = RenderScheduler(mode=_mode_from_environment(), status_interval=_status_interval_from_environment())
@@ -0,0 +1,194 @@
+import inspect
+import os
+import secrets
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+from .determinate_progress_bar import Progress
+
+__all__ = ['ProgressCounter', 'SharedProgress']
+
+# This process's slot of each counter, by counter name -> (segment, 64-bit view of it)
+_slots: dict[str, tuple[shared_memory.SharedMemory, memoryview]] = {}
+_inherited_slots = []
+
+# Slots belong to the counter's owner, who frees them. Where possible (Python 3.13+), they aren't tracked by the
+# process that creates them, in case it has its own resource tracker, which would free them when it exits.
+_UNTRACKED = {'track': False} if 'track' in inspect.signature(shared_memory.SharedMemory).parameters else {}
+
+
+def _forget_slots():
+    # A forked child inherits the parent's mappings, and writing to them would count towards the parent's slot.
+    # They're set aside rather than dropped, as closing a segment while its view exists raises.
+    _inherited_slots.extend(_slots.values())
+    _slots.clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_slots)
+
+
+class ProgressCounter:
+    """
+    A count shared between processes, e.g., with the workers of a ProcessPoolExecutor (see SharedProgress).
+
+    Each process that calls update() gets its own slot, a small shared memory block only it writes to,
+    so updating is a plain local increment: no locks, and nothing sent between processes. The process that
+    created the counter sums the slots when it reads value.
+
+    A slot is claimed the first time a process calls update(), by creating the next free block
+    ('<name>_0', '<name>_1', ...), which the operating system does atomically. So the counter can be passed to
+    workers as a task argument (it is pickled by name) or inherited (with fork), with any start method.
+
+    update() is meant to be called from one thread at a time in each process. On Windows, shared memory
+    disappears when no process has it open, so counts by workers that exit before the counter is next read
+    are lost; process pools keep their workers running until shutdown, so this doesn't affect them.
+
+    Args:
+        name (str | None): Name of the shared memory blocks. Random if not given.
+    """
+
+    def __init__(self, name: str | None = None):
+        self.name = name or f"kk_{secrets.token_hex(6)}"
+        if os.name == 'posix':
+            # Start the resource tracker now, so that processes forked from here on share it, rather than each
+            # starting their own.
+            resource_tracker.ensure_running()
+        self._init_reader()
+
+    def _init_reader(self):
+        self._segments = []  # Slots attached to for reading, in order
+        self._views = []
+        self._lock = threading.Lock()  # For reading, e.g., by a render thread and on exit at the same time
+
+    def __getstate__(self):
+        return {'name': self.name}
+
+    def __setstate__(self, state):
+        self.name = state['name']
+        self._init_reader()
+
+    def update(self, n: int = 1) -> None:
+        """
+        Add n to this process's slot.
+        """
+        try:
+            view = _slots[self.name][1]
+        except KeyError:
+            view = self._claim_slot()
+        view[0] += n
+
+    def _claim_slot(self) -> memoryview:
+        index = 0
+        while True:
+            try:
+                segment = shared_memory.SharedMemory(f"{self.name}_{index}", create=True, size=8, **_UNTRACKED)
+            except FileExistsError:
+                index += 1
+                continue
+            view = segment.buf.cast('q')
+            view[0] = 0
+            _slots[self.name] = segment, view
+            return view
+
+    def _attach_new_slots(self):
+        while True:
+            try:
+                segment = shared_memory.SharedMemory(f"{self.name}_{len(self._segments)}")
+            except FileNotFoundError:
+                return
+            except ValueError:
+                # Created, but not sized yet: try again on the next read
+                return
+            self._segments.append(segment)
+            self._views.append(segment.buf.cast('q'))
+
+    @property
+    def value(self) -> int:
+        """
+        The total count, over all processes.
+        """
+        with self._lock:
+            self._attach_new_slots()
+            return sum(view[0] for view in self._views)
+
+    def close(self) -> None:
+        """
+        Free the shared memory, once the count is no longer needed. Only call this in the process that created
+        the counter, once the other processes are done updating it.
+        """
+        with self._lock:
+            self._attach_new_slots()
+            own = _slots.pop(self.name, None)
+            if own is not None:
+                own[1].release()
+            for view in self._views:
+                view.release()
+            for segment in self._segments:
+                segment.close()
+                try:
+                    segment.unlink()
+                except FileNotFoundError:  # Already freed by a worker's own resource tracker
+                    pass
+            if own is not None:
+                own[0].close()
+            self._segments = []
+            self._views = []
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class SharedProgress(Progress):
+    def __init__(
+        self,
+        total: int | None = None,
+        msg: str | None = "",
+        exit_msg: str | None = None,
+        fps: float = 10,
+        width: int = 30,
+        unit: str = "it",
+        leave: bool = True,
+    ):
+        """
+        Determinate progress bar (see Progress) for work done in other processes, e.g.,
+
+            def work(chunk, counter):
+                for item in chunk:
+                    ...
+                    counter.update()
+
+            with SharedProgress(total=n_items, msg="Processing") as progress:
+                with ProcessPoolExecutor() as pool:
+                    list(pool.map(work, chunks, itertools.repeat(progress.counter)))
+
+        Workers update progress.counter (a ProgressCounter), which costs about as much as a local increment.
+        The bar sums the workers' counts on each frame, in this process. update() works here too.
+        The counter's shared memory is freed on exit.
+
+        Args:
+            total (int): Expected number of items. Without a total, only the count and rate are shown.
+            msg (str): Message shown before the bar.
+            exit_msg (str): Message to print when the process is completed.
+            fps (float): Frames per second.
+            width (int): Width of the bar, in characters.
+            unit (str): Unit of the items, shown with the count and rate.
+            leave (bool): If True, leave the final state of the bar on screen on exit; otherwise clear it.
+        """
+        super().__init__(None, total, msg, exit_msg, fps, width, unit, leave)
+        self.counter = ProgressCounter()
+
+    def update(self, n: int = 1) -> None:
+        """
+        Advance the count by n items.
+        """
+        self.counter.update(n)
+
+    def _render(self, final: bool = False) -> str:
+        self.n = self.counter.value
+        return super()._render(final)
+
+    def _stop(self):
+        if self._active:
+            super()._stop()
+            self.counter.close()
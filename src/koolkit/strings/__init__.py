@@ -1,3 +1,14 @@
-from .edit_strings import *
-from .evaluate_as_f_string import *
+from .._lazy import lazy_attributes
 
+_EXPORTS = {
+    'edit_strings': ['convert_to_single_line', 'stream_single_line', 'write_single_line', 'convert_case',
+                     'CaseConverter', 'make_case_converter', 'convert_keys', 'camel2under', 'under2camel',
+                     'camel2under_many', 'under2camel_many'],
+    'evaluate_as_f_string': ['evaluate_as_f_string'],
+    'templates': ['Template', 'compile_template', 'render_template', 'render_many', 'write_rendered'],
+}
+
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+# Submodules are imported on first use
+__getattr__, __dir__ = lazy_attributes(__name__, _EXPORTS)
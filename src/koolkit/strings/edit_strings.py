@@ -1,4 +1,6 @@
 import re
+from functools import lru_cache, partial
+from typing import Iterable, Iterator, TextIO
 
 
 def convert_to_single_line(text: str) -> str:
@@ -12,12 +14,154 @@ def convert_to_single_line(text: str) -> str:
     Returns:
         str: The resulting single-line string with whitespace normalized to spaces.
     """
+    # str.split() splits on exactly the characters that r"\s" matches, and avoids the regex engine.
+    return " ".join(text.split())
+
+
+def _convert_to_single_line_regex(text: str) -> str:
+    """
+    Previous implementation of convert_to_single_line(), kept as the benchmark baseline.
+    """
     return re.sub(r"\s+", " ", text).strip()
 
 
+def stream_single_line(source: Iterable[str] | TextIO, chunk_size: int = 1 << 16) -> Iterator[str]:
+    """
+    Streaming version of convert_to_single_line(), for text too large to hold in memory twice.
+
+    Whitespace runs are collapsed to single spaces even when they (or the words around them)
+    are split across chunks, and leading and trailing whitespace is dropped, so joining the
+    output gives exactly convert_to_single_line() of the whole text.
+
+    e.g.,
+
+        with open('dump.txt') as source, open('dump_flat.txt', 'w') as destination:
+            destination.writelines(stream_single_line(source))
+
+    Args:
+        source (iterable of str or text stream): Chunks of text, or a stream opened in text mode.
+        chunk_size (int): Number of characters to read at a time, if source is a stream.
+
+    Yields:
+        str: Pieces of the normalized single-line text.
+    """
+    chunks = iter(lambda: source.read(chunk_size), '') if hasattr(source, 'read') else source
+
+    started = False        # Whether anything has been output yet (so leading whitespace is dropped)
+    pending_space = False  # Whether whitespace was seen since the last output
+    for chunk in chunks:
+        if not chunk:
+            continue
+        words = chunk.split()
+        if not words:
+            pending_space = started
+            continue
+        output = " ".join(words)
+        if started and (pending_space or chunk[0].isspace()):
+            output = " " + output
+        yield output
+        started = True
+        pending_space = chunk[-1].isspace()
+
+
+def write_single_line(source: Iterable[str] | TextIO, destination: TextIO, chunk_size: int = 1 << 16) -> int:
+    """
+    Write the streaming single-line version of source (see stream_single_line()) to a text stream.
+
+    Returns:
+        int: The number of characters written.
+    """
+    written = 0
+    for piece in stream_single_line(source, chunk_size=chunk_size):
+        written += destination.write(piece)
+    return written
+
+
+# Words are runs of ASCII letters and digits; underscores, hyphens and everything else separate them.
+_WORD_RE = re.compile(r'[A-Za-z0-9]+')
+
+# With split_camel=True, words are also split within a run where camel2under() splits them: before a capital
+# that follows a lowercase letter or a digit, and before the last capital of an acronym that is followed by
+# lowercase letters, e.g., 'getHTTP2Response' -> get, HTTP2, Response. Digits stay with the word before them.
+_CAMEL_WORD_RE = re.compile(r'[A-Z]+(?![a-z])[a-z0-9]*|[A-Z]?[a-z0-9]+')
+
+
+def _to_title_case(text: str, findall=_WORD_RE.findall) -> str:
+    return " ".join(word.capitalize() for word in findall(text))
+
+
+def _to_sentence_case(text: str, findall=_WORD_RE.findall) -> str:
+    words = findall(text)
+    if not words:
+        return ""
+    first_word = words[0].capitalize()
+    remaining_words = " ".join(word.lower() for word in words[1:])
+    return f"{first_word} {remaining_words}".strip()
+
+
+def _to_upper_case(text: str, findall=_WORD_RE.findall) -> str:
+    return text.upper()
+
+
+def _to_lower_case(text: str, findall=_WORD_RE.findall) -> str:
+    return text.lower()
+
+
+def _to_snake_case(text: str, findall=_WORD_RE.findall) -> str:
+    return "_".join(word.lower() for word in findall(text))
+
+
+def _to_upper_snake_case(text: str, findall=_WORD_RE.findall) -> str:
+    return "_".join(word.upper() for word in findall(text))
+
+
+def _to_camel_case(text: str, findall=_WORD_RE.findall) -> str:
+    words = findall(text)
+    if not words:
+        return ""
+    first_word = words[0].lower()
+    capitalized_words = "".join(word.capitalize() for word in words[1:])
+    return first_word + capitalized_words
+
+
+def _to_pascal_case(text: str, findall=_WORD_RE.findall) -> str:
+    return "".join(word.capitalize() for word in findall(text))
+
+
+def _to_kebab_case(text: str, findall=_WORD_RE.findall) -> str:
+    return "-".join(word.lower() for word in findall(text))
+
 
+_CASE_STYLES = {
+    "Title Case": _to_title_case,
+    "title": _to_title_case,
+    "Sentence case": _to_sentence_case,
+    "sentence": _to_sentence_case,
+    "UPPER CASE": _to_upper_case,
+    "upper": _to_upper_case,
+    "lower case": _to_lower_case,
+    "lower": _to_lower_case,
+    "snake_case": _to_snake_case,
+    "snake": _to_snake_case,
+    "UPPER_SNAKE_CASE": _to_upper_snake_case,
+    "camelCase": _to_camel_case,
+    "camel": _to_camel_case,
+    "PascalCase": _to_pascal_case,
+    "pascal": _to_pascal_case,
+    "kebab-case": _to_kebab_case,
+    "kebab": _to_kebab_case,
+}
 
-def convert_case(text: str, to_case: str) -> str:
+
+def _resolve_case_style(to_case: str, split_camel: bool = False):
+    try:
+        convert = _CASE_STYLES[to_case]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown case style: {to_case}") from None
+    return partial(convert, findall=_CAMEL_WORD_RE.findall) if split_camel else convert
+
+
+def convert_case(text: str, to_case: str, split_camel: bool = False) -> str:
     """
     Convert a string to a specified case style.
 
@@ -32,9 +176,16 @@ def convert_case(text: str, to_case: str) -> str:
         - 'pascal' or 'PascalCase'            → PascalCase (each word capitalized, no separators)
         - 'kebab' or 'kebab-case'             → lowercase-words-separated-by-hyphens
 
+    Words are separated by anything other than ASCII letters and digits, so 'helloWorld' is one word
+    ('helloworld' in snake case). With split_camel=True, changes of case separate words too, as in camel2under(),
+    so camelCase and PascalCase input converts as well, e.g., 'getHTTP2Response' -> 'get_http2_response'.
+
+    To convert many strings to the same style, use a CaseConverter (see make_case_converter()) instead.
+
     Args:
         text (str): The input string to convert.
         to_case (str): The desired case style. Defaults to 'sentence'.
+        split_camel (bool): Also split words at changes of case. Default is False.
 
     Returns:
         str: The text converted to the specified case style.
@@ -43,58 +194,144 @@ def convert_case(text: str, to_case: str) -> str:
         TypeError: If 'text' is not a string.
         ValueError: If an unsupported case style is specified.
     """
-    
-    def split_words_from_text(text: str) -> list[str]:
-        # Replace underscores and hyphens with space, then split on non-alphanumerics
-        text = re.sub(r'[_\-]', ' ', text)
-        return re.findall(r'[A-Za-z0-9]+', text)
-
     if not isinstance(text, str):
         raise TypeError(f"text must be a string, not {type(text).__name__}")
 
-    words = split_words_from_text(text)
+    return _resolve_case_style(to_case, split_camel)(text)
+
+
+class CaseConverter:
+    """
+    Callable that converts strings to one case style, e.g., for translating every key of a
+    large JSON payload between camelCase and snake_case.
+
+    The style is resolved once, and results are memoized in an LRU cache, since the same
+    few keys tend to come up over and over again.
+
+    e.g.,
+
+        to_snake = CaseConverter('snake', split_camel=True)
+        to_snake('userId')  # 'user_id'
+
+    Args:
+        to_case (str): The desired case style. See convert_case() for the supported styles.
+        cache_size (int | None): Maximum number of cached conversions. None for unbounded, 0 to disable caching.
+        split_camel (bool): Also split words at changes of case (see convert_case()). Default is False.
+
+    Raises:
+        ValueError: If an unsupported case style is specified.
+    """
+
+    def __init__(self, to_case: str, cache_size: int | None = 4096, split_camel: bool = False):
+        self.to_case = to_case
+        self.cache_size = cache_size
+        self.split_camel = split_camel
+        self._convert = lru_cache(maxsize=cache_size)(_resolve_case_style(to_case, split_camel))
 
-    match to_case:
-        case "Title Case" | "title":
-            return " ".join(word.capitalize() for word in words)
+    def __call__(self, text: str) -> str:
+        if not isinstance(text, str):
+            raise TypeError(f"text must be a string, not {type(text).__name__}")
+        return self._convert(text)
 
-        case "Sentence case" | "sentence":
-            if not words:
-                return ""
-            first_word = words[0].capitalize()
-            remaining_words = " ".join(word.lower() for word in words[1:])
-            return f"{first_word} {remaining_words}".strip()
+    def cache_info(self):
+        return self._convert.cache_info()
 
-        case "UPPER CASE" | "upper":
-            return text.upper()
+    def cache_clear(self) -> None:
+        self._convert.cache_clear()
 
-        case "lower case" | "lower":
-            return text.lower()
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_case!r}, cache_size={self.cache_size!r}, split_camel={self.split_camel!r})"
 
-        case "snake_case" | "snake":
-            return "_".join(word.lower() for word in words)
 
-        case "UPPER_SNAKE_CASE":
-            return "_".join(word.upper() for word in words)
+@lru_cache(maxsize=None)
+def make_case_converter(to_case: str, cache_size: int | None = 4096, split_camel: bool = False) -> CaseConverter:
+    """
+    Get a CaseConverter for the given style. Converters (and their caches) are shared between callers
+    asking for the same style, cache size and word splitting.
+    """
+    return CaseConverter(to_case, cache_size=cache_size, split_camel=split_camel)
 
-        case "camelCase" | "camel":
-            if not words:
-                return ""
-            first_word = words[0].lower()
-            capitalized_words = "".join(word.capitalize() for word in words[1:])
-            return first_word + capitalized_words
 
-        case "PascalCase" | "pascal":
-            return "".join(word.capitalize() for word in words)
+def convert_keys(obj, to_case: str, in_place: bool = False, split_camel: bool = True):
+    """
+    Convert the (string) keys of every dict in a nested structure of dicts and lists,
+    such as a parsed JSON document, to a specified case style.
 
-        case "kebab-case" | "kebab":
-            return "-".join(word.lower() for word in words)
+    The structure is walked iteratively, so arbitrarily deep nesting is fine. Each distinct key is
+    converted once per call (and cached across calls, see make_case_converter()), and values
+    other than dicts and lists are never copied. Unlike convert_case(), changes of case separate words
+    by default, so camelCase keys convert too.
 
-        case _:
-            raise ValueError(f"Unknown case style: {to_case}")
+    e.g.,
 
+        convert_keys({'userId': 1, 'addressLines': [{'streetName': 'Main'}]}, 'snake')
+        # {'user_id': 1, 'address_lines': [{'street_name': 'Main'}]}
+
+    Args:
+        obj: A dict, a list, or any other value (which is returned as is).
+        to_case (str): The desired case style. See convert_case() for the supported styles.
+        in_place (bool): If True, rewrite the dicts in place instead of building a converted copy,
+            which avoids holding two copies of a large document in memory.
+        split_camel (bool): Also split words at changes of case (see convert_case()). Default is True.
 
+    Returns:
+        The converted structure (obj itself if in_place is True).
+        If two keys of a dict convert to the same key, the last one wins.
 
+    Raises:
+        ValueError: If an unsupported case style is specified.
+    """
+    convert = make_case_converter(to_case, split_camel=split_camel)
+    converted_keys = {}
+
+    def convert_key(key):
+        new_key = converted_keys.get(key)
+        if new_key is None:
+            new_key = converted_keys[key] = convert(key) if isinstance(key, str) else key
+        return new_key
+
+    if in_place:
+        stack = [obj] if isinstance(obj, (dict, list)) else []
+        while stack:
+            container = stack.pop()
+            if isinstance(container, dict):
+                values = container.values()
+                items = list(container.items())
+                if any(convert_key(key) != key for key, _ in items):
+                    container.clear()
+                    for key, value in items:
+                        container[convert_key(key)] = value
+            else:
+                values = container
+            stack.extend(value for value in values if isinstance(value, (dict, list)))
+        return obj
+
+    if not isinstance(obj, (dict, list)):
+        return obj
+    root = {} if isinstance(obj, dict) else []
+    stack = [(obj, root)]
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    stack.append((value, child))
+                    value = child
+                target[convert_key(key)] = value
+        else:
+            for value in source:
+                if isinstance(value, (dict, list)):
+                    child = {} if isinstance(value, dict) else []
+                    stack.append((value, child))
+                    value = child
+                target.append(value)
+    return root
+
+
+# An uppercase letter starts a new word if it follows a lowercase letter or digit ('parseTest', 'base64Encoder'),
+# or if it starts a capitalized word after an acronym ('HTTPServer' -> 'HTTP', 'Server').
+_camel2under_re = re.compile(r'((?<=[a-z0-9])[A-Z]|(?!^)[A-Z](?=[a-z]))')
 
 
 def camel2under(camel_string):
@@ -103,6 +340,8 @@ def camel2under(camel_string):
 
     >>> camel2under('BasicParseTest')
     'basic_parse_test'
+    >>> camel2under('HTTPServerError')
+    'http_server_error'
     """
     return _camel2under_re.sub(r'_\1', camel_string).lower()
 
@@ -115,3 +354,28 @@ def under2camel(under_string):
     'ComplexTokenizer'
     """
     return ''.join(w.capitalize() or '_' for w in under_string.split('_'))
+
+
+# Shared by the batch functions below: identifiers repeat a lot, both within and across batches.
+_camel2under_cached = lru_cache(maxsize=4096)(camel2under)
+_under2camel_cached = lru_cache(maxsize=4096)(under2camel)
+
+
+def camel2under_many(camel_strings):
+    """Converts many camelcased strings to underscores (see camel2under()),
+    converting each distinct string only once.
+
+    >>> camel2under_many(['BasicParseTest', 'HTTPServerError', 'BasicParseTest'])
+    ['basic_parse_test', 'http_server_error', 'basic_parse_test']
+    """
+    return list(map(_camel2under_cached, camel_strings))
+
+
+def under2camel_many(under_strings):
+    """Converts many underscored strings to camelcased (see under2camel()),
+    converting each distinct string only once.
+
+    >>> under2camel_many(['complex_tokenizer', 'basic_parse_test'])
+    ['ComplexTokenizer', 'BasicParseTest']
+    """
+    return list(map(_under2camel_cached, under_strings))
@@ -1,8 +1,13 @@
+import sys
+
+from .templates import _compile_template
+
+
 def evaluate_as_f_string(input: str):
     """
     Takes a non-f-string that contains curly brace {placeholders},
     appends an 'f' to it, and then calls eval() to substitute the placeholders
-    in what is now an f-string.
+    in what is now an f-string. Placeholders are evaluated with the caller's variables.
 
     e.g.,
 
@@ -14,13 +19,11 @@ def evaluate_as_f_string(input: str):
 
         print(f_str)
 
+    The compiled f-string is cached, so evaluating the same string again is cheap.
+    See also Template, for rendering against explicit variables or without eval().
+
     ⚠️ WARNING: This is a security risk -- do not use `eval` with untrusted input.
     The text within the curly braces is arbitrary Python code and could be exploited
     for malicious purposes. Cf. Bobby Tables, https://xkcd.com/327/
     """
-
-    # The triple quote below allows multiline strings to be input.
-    output = eval(f'f"""{input}"""')
-    return output
-
-
+    return _compile_template(input, False)._render(None, sys._getframe(1))
@@ -0,0 +1,265 @@
+import builtins
+import sys
+from _string import formatter_field_name_split
+from collections import ChainMap, deque
+from concurrent.futures import Executor
+from functools import lru_cache
+from itertools import islice
+from string import Formatter
+from typing import Any, Iterable, Iterator, Mapping, TextIO
+
+__all__ = ['Template', 'compile_template', 'render_template', 'render_many', 'write_rendered']
+
+_EVAL_GLOBALS = {'__builtins__': builtins}
+
+
+def _check_safe_fields(text: str) -> None:
+    """
+    Check that a template only uses names, attribute and index lookups, conversions and format specs
+    (i.e., str.format() syntax, but without positional fields or private attributes).
+    """
+    for _, field_name, format_spec, _ in Formatter().parse(text):
+        if field_name is None:
+            continue
+        root, rest = formatter_field_name_split(field_name)
+        if not isinstance(root, str) or not root.isidentifier():
+            raise ValueError(f'Invalid placeholder "{{{field_name}}}": safe templates only support named fields')
+        for is_attribute, key in rest:
+            if is_attribute and key.startswith('_'):
+                raise ValueError(f'Invalid placeholder "{{{field_name}}}": private attributes are not allowed')
+        if format_spec:
+            _check_safe_fields(format_spec)
+
+
+def _field_end(text: str, start: int) -> int:
+    """
+    Index just past the '}' that closes the replacement field opening at text[start], following f-string rules:
+    quotes and brackets are matched in the expression, and fields may be nested in the format spec.
+    Returns len(text) if the field isn't closed.
+    """
+    i, depth, quote, in_spec = start + 1, 0, None, False
+    while i < len(text):
+        c = text[i]
+        if quote:
+            if text.startswith(quote, i):
+                i += len(quote)
+                quote = None
+            else:
+                i += 1
+        elif in_spec:
+            if c == '{':
+                i = _field_end(text, i)
+                continue
+            if c == '}':
+                return i + 1
+            i += 1
+        elif c in '\'"':
+            quote = text[i:i + 3] if text[i:i + 3] in ("'''", '"""') else c
+            i += len(quote)
+        else:
+            if c in '([{':
+                depth += 1
+            elif c in ')]}':
+                if depth == 0 and c == '}':
+                    return i + 1
+                depth -= 1
+            elif c == ':' and depth == 0:
+                in_spec = True
+            i += 1
+    return len(text)
+
+
+def _f_string_source(text: str) -> str:
+    """
+    Python source for an f-string with the given text. The literal text is written as plain string literals,
+    so quotes and backslashes in it are kept as they are, and each field as an f-string literal of its own,
+    delimited by quotes it doesn't contain. They are joined by implicit concatenation.
+    """
+    pieces = []
+    literal = []
+    i = 0
+    while i < len(text):
+        c = text[i]
+        if c in '{}' and text[i + 1:i + 2] == c:  # Escaped brace
+            literal.append(c)
+            i += 2
+        elif c == '{':
+            if literal:
+                pieces.append(repr(''.join(literal)))
+                literal = []
+            end = _field_end(text, i)
+            field = text[i:end]
+            quote = next((q for q in ("'", '"', "'''") if q not in field and (len(q) == 3 or '\n' not in field)),
+                         '"""')
+            pieces.append(f'f{quote}{field}{quote}')
+            i = end
+        elif c == '}':
+            raise SyntaxError("f-string: single '}' is not allowed")
+        else:
+            literal.append(c)
+            i += 1
+    if literal or not pieces:
+        pieces.append(repr(''.join(literal)))
+    return f"({' '.join(pieces)})"
+
+
+class Template:
+    """
+    A {placeholder} template, parsed once and rendered many times.
+
+    By default, placeholders are f-string expressions, so anything goes: {name}, {price * 1.2:.2f}, {items[-1]!r}.
+    With safe=True, placeholders are limited to str.format() fields: names, attribute and index lookups,
+    conversions and format specs ({user.name}, {rows[0]}, {price:.2f}). Nothing is evaluated,
+    and private attributes (e.g., {obj.__class__}) are rejected, so safe templates may come from untrusted input.
+
+    e.g.,
+
+        greeting = Template("Hello, {name}. It is {time:%H:%M}.")
+        greeting.render(name='Bob', time=datetime.now())
+
+        name, time = 'Bob', datetime.now()
+        greeting.render()  # Uses the caller's variables
+
+    ⚠️ WARNING: Unless safe=True, the text within the curly braces is arbitrary Python code.
+    Do not render templates from untrusted input that way. Cf. Bobby Tables, https://xkcd.com/327/
+
+    Args:
+        text (str): The template.
+        safe (bool): Restrict placeholders to str.format() fields, without eval(). Default is False.
+
+    Raises:
+        SyntaxError: If the template is not a valid f-string (safe=False).
+        ValueError: If the template has invalid or disallowed placeholders (safe=True).
+    """
+    __slots__ = ('text', 'safe', '_code')
+
+    def __init__(self, text: str, safe: bool = False):
+        self.text = text
+        self.safe = safe
+        if safe:
+            _check_safe_fields(text)
+            self._code = None
+        else:
+            self._code = compile(_f_string_source(text), '<template>', 'eval')
+
+    def render(self, mapping: Mapping[str, Any] | None = None, /, **kwargs) -> str:
+        """
+        Render the template with the variables in mapping and/or keyword arguments.
+        If neither is given, the caller's local and global variables are used.
+        """
+        if kwargs:
+            mapping = {**mapping, **kwargs} if mapping else kwargs
+        return self._render(mapping, sys._getframe(1))
+
+    def _render(self, mapping: Mapping[str, Any] | None, frame) -> str:
+        if self.safe:
+            if mapping is None:
+                mapping = ChainMap(frame.f_locals, frame.f_globals)
+            return self.text.format_map(mapping)
+
+        if mapping is None:
+            return eval(self._code, frame.f_globals, frame.f_locals)
+        return eval(self._code, _EVAL_GLOBALS, mapping)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.text!r}, safe={self.safe!r})"
+
+
+def compile_template(text: str, safe: bool = False) -> Template:
+    """
+    Get the compiled Template for a template text. The most recently used templates are cached,
+    so rendering the same text again skips parsing and compiling it.
+    """
+    return _compile_template(text, bool(safe))
+
+
+# Called with positional arguments only, so that each template has a single cache key.
+@lru_cache(maxsize=1024)
+def _compile_template(text: str, safe: bool) -> Template:
+    return Template(text, safe=safe)
+
+
+def render_template(text: str, mapping: Mapping[str, Any] | None = None, /, *, safe: bool = False, **kwargs) -> str:
+    """
+    Render a template text (see Template) with the variables in mapping and/or keyword arguments,
+    or if neither is given, with the caller's variables. The compiled template is cached.
+    """
+    if kwargs:
+        mapping = {**mapping, **kwargs} if mapping else kwargs
+    return _compile_template(text, bool(safe))._render(mapping, sys._getframe(1))
+
+
+def _render_chunk(text: str, safe: bool, records: list[Mapping[str, Any]]) -> list[str]:
+    # Runs in executor workers. Takes the template text rather than the Template, since code objects
+    # cannot be pickled for process pools; each worker compiles it once through the cache.
+    template = _compile_template(text, bool(safe))
+    return [template._render(record, None) for record in records]
+
+
+def render_many(template: str | Template, records: Iterable[Mapping[str, Any]], safe: bool = False,
+                executor: Executor | None = None, chunksize: int = 1000, max_pending: int = 16) -> Iterator[str]:
+    """
+    Render a template once per record, lazily, e.g., to format a message for every row of a CSV file or DB cursor.
+    The template is compiled once.
+
+    e.g.,
+
+        for line in render_many("{name} owes {amount:,.2f}", csv.DictReader(file)):
+            ...
+
+    Args:
+        template (str | Template): The template (see Template). A str is compiled through compile_template().
+        records (iterable of mappings): The variables to render each record with.
+        safe (bool): If template is a str, compile it in safe mode (see Template).
+        executor (Executor | None): Optional thread or process pool to fan rendering out to, in chunks.
+            Only worthwhile for expensive placeholders; records must be picklable for a process pool.
+        chunksize (int): Number of records sent to the executor at a time.
+        max_pending (int): Maximum number of chunks in flight, so records are still read lazily with an executor.
+
+    Yields:
+        str: The rendered template for each record, in order.
+    """
+    if isinstance(template, str):
+        template = _compile_template(template, bool(safe))
+
+    if executor is None:
+        render = template._render
+        for record in records:
+            yield render(record, None)
+        return
+
+    records = iter(records)
+    pending = deque()
+    while chunk := list(islice(records, chunksize)):
+        pending.append(executor.submit(_render_chunk, template.text, template.safe, chunk))
+        if len(pending) >= max_pending:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+def write_rendered(template: str | Template, records: Iterable[Mapping[str, Any]], file: TextIO,
+                   end: str = '\n', buffer_size: int = 1 << 16, **kwargs) -> int:
+    """
+    Render a template once per record (see render_many()) and write the results to a text stream,
+    each followed by 'end'. Output is collected into writes of about buffer_size characters.
+    Other keyword arguments are passed on to render_many().
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    buffer = []
+    buffered = 0
+    for rendered in render_many(template, records, **kwargs):
+        buffer.append(rendered)
+        buffer.append(end)
+        buffered += len(rendered) + len(end)
+        count += 1
+        if buffered >= buffer_size:
+            file.write(''.join(buffer))
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        file.write(''.join(buffer))
+    return count
@@ -0,0 +1,107 @@
+import logging
+import timeit
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koolkit.logging import Logger, LogWriter
+
+N_MESSAGES = 10_000
+
+
+class NullSink:
+    def write(self, s):
+        pass
+
+    def flush(self):
+        pass
+
+
+@pytest.fixture(scope="module")
+def writer():
+    with LogWriter(NullSink()) as writer:
+        yield writer
+
+
+@pytest.fixture(scope="module")
+def stdlib_logger():
+    logger = logging.getLogger('koolkit.benchmark')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(NullSink())
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    logger.addHandler(handler)
+    yield logger
+    logger.removeHandler(handler)
+
+
+def _log_koolkit(log):
+    for i in range(N_MESSAGES):
+        log.info("Processed %d items", i, user='bob')
+
+
+def _log_stdlib(logger):
+    for i in range(N_MESSAGES):
+        logger.info("Processed %d items", i, extra={'user': 'bob'})
+
+
+def _messages_per_sec(benchmark):
+    if benchmark.stats is not None:  # None with --benchmark-disable
+        benchmark.extra_info['messages_per_sec'] = round(N_MESSAGES / benchmark.stats.stats.mean)
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK THROUGHPUT (messages/sec in extra_info)
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_koolkit_logging_caller(benchmark, writer):
+    # Cost to the logging thread; formatting and I/O happen on the writer thread.
+    benchmark(_log_koolkit, Logger('benchmark', writer=writer))
+    _messages_per_sec(benchmark)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_koolkit_logging_end_to_end(benchmark, writer):
+    log = Logger('benchmark', writer=writer)
+
+    def log_and_flush():
+        _log_koolkit(log)
+        writer.flush()
+
+    benchmark(log_and_flush)
+    _messages_per_sec(benchmark)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_koolkit_logging_disabled_level(benchmark, writer):
+    log = Logger('benchmark', level='WARNING', writer=writer)
+    benchmark(_log_koolkit, log)
+    _messages_per_sec(benchmark)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_koolkit_logging_rate_limited(benchmark, writer):
+    # Nearly every record is rejected by the call site's token bucket.
+    benchmark(_log_koolkit, Logger('benchmark', writer=writer, rate_limit=10))
+    _messages_per_sec(benchmark)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_koolkit_logging_sampled(benchmark, writer):
+    benchmark(_log_koolkit, Logger('benchmark', writer=writer, sample_rate=0.01))
+    _messages_per_sec(benchmark)
+
+
+@pytest.mark.benchmark(group="logging")
+def test_benchmark_stdlib_logging_stream_handler(benchmark, stdlib_logger):
+    benchmark(_log_stdlib, stdlib_logger)
+    _messages_per_sec(benchmark)
+
+
+def test_koolkit_logging_caller_faster_than_stdlib(writer, stdlib_logger):
+    log = Logger('benchmark', writer=writer)
+    koolkit_time = min(timeit.repeat(lambda: _log_koolkit(log), number=1, repeat=5))
+    stdlib_time = min(timeit.repeat(lambda: _log_stdlib(stdlib_logger), number=1, repeat=5))
+    assert koolkit_time < stdlib_time
@@ -0,0 +1,59 @@
+import timeit
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koolkit.profiling import Histogram, OperationStats, Registry, timed
+
+TIMINGS = [1_234, 56_789, 1_000_000, 42_000_000] * 250
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK HISTOGRAM
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.benchmark(group="histogram")
+def test_benchmark_histogram_record(benchmark):
+    record = Histogram().record
+    benchmark(lambda: [record(ns) for ns in TIMINGS])
+
+
+@pytest.mark.benchmark(group="histogram")
+def test_benchmark_operation_stats_record(benchmark):
+    record = OperationStats('op').record
+    benchmark(lambda: [record(ns) for ns in TIMINGS])
+
+
+@pytest.mark.benchmark(group="histogram")
+def test_benchmark_histogram_percentiles(benchmark):
+    histogram = Histogram()
+    for ns in TIMINGS:
+        histogram.record(ns)
+    benchmark(histogram.percentiles, 50, 95, 99)
+
+
+def test_histogram_record_overhead():
+    # A few hundred nanoseconds per record on typical hardware; the bound leaves room for slow CI machines.
+    record = Histogram().record
+    per_record = min(timeit.repeat(lambda: [record(ns) for ns in TIMINGS], number=10, repeat=5)) / (10 * len(TIMINGS))
+    assert per_record < 1e-6
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK TIMED()
+# ------------------------------------------------------------------------------------------------
+
+def _work():
+    return None
+
+
+@pytest.mark.benchmark(group="timed")
+def test_benchmark_untimed_call(benchmark):
+    benchmark(lambda: [_work() for _ in range(1000)])
+
+
+@pytest.mark.benchmark(group="timed")
+def test_benchmark_timed_call(benchmark):
+    work = timed('work', registry=Registry())(_work)
+    benchmark(lambda: [work() for _ in range(1000)])
@@ -0,0 +1,230 @@
+import asyncio
+import io
+import timeit
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koolkit.progress_bars import (ANIMATE, OFF, Progress, RippleProgressBar, SharedProgress, SpinnerProgressBar,
+                                   render_scheduler)
+
+N_ITEMS = 100_000
+LONG_MSG = "Crunching the numbers for the quarterly report, please hold on... " * 3
+
+
+@pytest.fixture(autouse=True)
+def quiet_scheduler(monkeypatch):
+    monkeypatch.setattr(render_scheduler, 'stream', io.StringIO())
+    monkeypatch.setattr(render_scheduler, 'mode', ANIMATE)
+
+
+def _bare_loop():
+    for _ in range(N_ITEMS):
+        pass
+
+
+def _progress_loop():
+    for _ in Progress(range(N_ITEMS)):
+        pass
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK PER-ITERATION OVERHEAD
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.benchmark(group="progress")
+def test_benchmark_bare_loop(benchmark):
+    benchmark(_bare_loop)
+
+
+@pytest.mark.benchmark(group="progress")
+def test_benchmark_progress_iterable(benchmark):
+    benchmark(_progress_loop)
+
+
+@pytest.mark.benchmark(group="progress")
+def test_benchmark_progress_update(benchmark):
+    def loop():
+        with Progress(total=N_ITEMS) as progress:
+            for _ in range(N_ITEMS):
+                progress.update()
+
+    benchmark(loop)
+
+
+@pytest.mark.benchmark(group="progress")
+def test_benchmark_shared_progress_update(benchmark):
+    # The cost to a worker process, which updates the counter
+    def loop():
+        with SharedProgress(total=N_ITEMS) as progress:
+            update = progress.counter.update
+            for _ in range(N_ITEMS):
+                update()
+
+    benchmark(loop)
+
+
+@pytest.mark.benchmark(group="progress")
+def test_benchmark_rich_progress_track(benchmark):
+    rich_progress = pytest.importorskip("rich.progress")
+    from rich.console import Console
+
+    def loop():
+        for _ in rich_progress.track(range(N_ITEMS), console=Console(file=io.StringIO())):
+            pass
+
+    benchmark(loop)
+
+
+def test_progress_overhead_under_a_microsecond():
+    bare_time = min(timeit.repeat(_bare_loop, number=1, repeat=5))
+    progress_time = min(timeit.repeat(_progress_loop, number=1, repeat=5))
+    assert (progress_time - bare_time) / N_ITEMS < 1e-6
+
+
+def test_shared_progress_update_under_a_microsecond():
+    with SharedProgress() as progress:
+        update = progress.counter.update
+        update()
+        assert min(timeit.repeat(update, number=N_ITEMS, repeat=5)) / N_ITEMS < 1e-6
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK ASYNC (tracking N_TASKS tasks)
+# ------------------------------------------------------------------------------------------------
+
+N_TASKS = 10_000
+
+
+async def _task():
+    await asyncio.sleep(0)
+
+
+def _gather():
+    async def main():
+        await asyncio.gather(*(_task() for _ in range(N_TASKS)))
+
+    asyncio.run(main())
+
+
+def _progress_gather():
+    async def main():
+        await Progress().gather(*(_task() for _ in range(N_TASKS)))
+
+    asyncio.run(main())
+
+
+@pytest.mark.benchmark(group="async")
+def test_benchmark_gather(benchmark):
+    benchmark(_gather)
+
+
+@pytest.mark.benchmark(group="async")
+def test_benchmark_progress_gather(benchmark):
+    benchmark(_progress_gather)
+
+
+def test_progress_gather_overhead():
+    # Counting costs a coroutine per task, rather than another callback on the loop
+    gather_time = min(timeit.repeat(_gather, number=1, repeat=5))
+    progress_time = min(timeit.repeat(_progress_gather, number=1, repeat=5))
+    assert progress_time < 1.5 * gather_time
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK DISABLED (enter and exit, with KOOLKIT_PROGRESS=off)
+# ------------------------------------------------------------------------------------------------
+
+class _Nothing:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def _enter_exit(bar):
+    with bar:
+        pass
+
+
+@pytest.mark.benchmark(group="disabled")
+def test_benchmark_enter_exit_nothing(benchmark):
+    benchmark(_enter_exit, _Nothing())
+
+
+@pytest.mark.benchmark(group="disabled")
+@pytest.mark.parametrize("bar", [
+    lambda: SpinnerProgressBar(),
+    lambda: RippleProgressBar(LONG_MSG, use_rich=False),
+    lambda: Progress(total=10),
+])
+def test_benchmark_enter_exit_disabled(benchmark, monkeypatch, bar):
+    monkeypatch.setattr(render_scheduler, 'mode', OFF)
+    benchmark(_enter_exit, bar())
+
+
+def test_disabled_enter_exit_under_a_microsecond(monkeypatch):
+    monkeypatch.setattr(render_scheduler, 'mode', OFF)
+    bar, nothing = RippleProgressBar(LONG_MSG), _Nothing()
+    bar_time = min(timeit.repeat(lambda: _enter_exit(bar), number=10_000, repeat=5))
+    nothing_time = min(timeit.repeat(lambda: _enter_exit(nothing), number=10_000, repeat=5))
+    assert (bar_time - nothing_time) / 10_000 < 1e-6
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK RIPPLE FRAMES (CPU time per second of animation)
+# ------------------------------------------------------------------------------------------------
+
+def _ripple(use_rich=False, warm=True):
+    bar = RippleProgressBar(LONG_MSG, speed='fast', rainbow=True, use_rich=use_rich)
+    bar._reset_frames()
+    if warm:
+        # Show the whole cycle once, so that every frame is cached
+        for _ in bar._cycle:
+            bar._next_frame()
+    return bar
+
+
+def _animate_cached(bar):
+    # One second of animation
+    for _ in range(round(1 / bar.interval)):
+        bar._next_frame()
+
+
+def _animate_uncached(bar):
+    render = bar._rendered_rich_frame if bar.use_rich else bar._ansi_frame
+    for _ in range(round(1 / bar.interval)):
+        bar._step()
+        render()
+
+
+@pytest.mark.benchmark(group="ripple")
+def test_benchmark_ripple_cached_frames(benchmark):
+    benchmark(_animate_cached, _ripple())
+
+
+@pytest.mark.benchmark(group="ripple")
+def test_benchmark_ripple_uncached_ansi_frames(benchmark):
+    benchmark(_animate_uncached, _ripple())
+
+
+@pytest.mark.benchmark(group="ripple")
+def test_benchmark_ripple_uncached_rich_frames(benchmark):
+    pytest.importorskip("rich")
+    benchmark(_animate_uncached, _ripple(use_rich=True))
+
+
+@pytest.mark.benchmark(group="ripple")
+def test_benchmark_ripple_reset_frames(benchmark):
+    # Paid on each __enter__
+    bar = _ripple(warm=False)
+    benchmark(bar._reset_frames)
+
+
+def test_ripple_cached_frames_faster():
+    bar = _ripple()
+    cached_time = min(timeit.repeat(lambda: _animate_cached(bar), number=10, repeat=5))
+    uncached_time = min(timeit.repeat(lambda: _animate_uncached(bar), number=10, repeat=5))
+    assert cached_time * 10 < uncached_time
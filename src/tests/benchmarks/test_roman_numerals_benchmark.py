@@ -0,0 +1,131 @@
+import random
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koolkit.numbers import RomanNumeral, convert_arabic_to_roman, convert_roman_to_arabic, MAX_NUMBER
+from koolkit.numbers.roman_numerals import _convert_arabic_to_roman_iterative, _convert_roman_to_arabic_iterative
+
+ARABIC_INTS = range(1, MAX_NUMBER + 1)
+ROMAN_STRS = [convert_arabic_to_roman(arabic_int) for arabic_int in ARABIC_INTS]
+
+# Random strings of Roman numeral characters that are not canonical numerals.
+_canonical = set(ROMAN_STRS)
+_rng = random.Random(3999)
+INVALID_ROMAN_STRS = [s for s in (''.join(_rng.choices('IVXLCDM', k=_rng.randint(2, 12))) for _ in range(4000))
+                      if s not in _canonical]
+
+
+def _encode_all(encoder):
+    for arabic_int in ARABIC_INTS:
+        encoder(arabic_int)
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK CONVERT_ARABIC_TO_ROMAN()
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.benchmark(group="convert_arabic_to_roman")
+def test_benchmark_convert_arabic_to_roman_table(benchmark):
+    benchmark(_encode_all, convert_arabic_to_roman)
+
+
+@pytest.mark.benchmark(group="convert_arabic_to_roman")
+def test_benchmark_convert_arabic_to_roman_iterative(benchmark):
+    benchmark(_encode_all, _convert_arabic_to_roman_iterative)
+
+
+def test_table_encoder_is_faster_than_iterative():
+    # Guard the speedup: the table-driven encoder should comfortably beat the greedy loop.
+    table_time = min(timeit.repeat(lambda: _encode_all(convert_arabic_to_roman), number=1, repeat=5))
+    iterative_time = min(timeit.repeat(lambda: _encode_all(_convert_arabic_to_roman_iterative), number=1, repeat=5))
+    assert table_time * 2 < iterative_time
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK CONVERT_ROMAN_TO_ARABIC()
+# ------------------------------------------------------------------------------------------------
+
+def _decode_all(decoder, roman_strs):
+    for roman_str in roman_strs:
+        try:
+            decoder(roman_str)
+        except ValueError:
+            pass
+
+
+@pytest.mark.benchmark(group="convert_roman_to_arabic (valid)")
+def test_benchmark_convert_roman_to_arabic_dfa(benchmark):
+    benchmark(_decode_all, convert_roman_to_arabic, ROMAN_STRS)
+
+
+@pytest.mark.benchmark(group="convert_roman_to_arabic (valid)")
+def test_benchmark_convert_roman_to_arabic_iterative(benchmark):
+    benchmark(_decode_all, _convert_roman_to_arabic_iterative, ROMAN_STRS)
+
+
+@pytest.mark.benchmark(group="convert_roman_to_arabic (invalid)")
+def test_benchmark_convert_roman_to_arabic_dfa_invalid(benchmark):
+    benchmark(_decode_all, convert_roman_to_arabic, INVALID_ROMAN_STRS)
+
+
+@pytest.mark.benchmark(group="convert_roman_to_arabic (invalid)")
+def test_benchmark_convert_roman_to_arabic_iterative_invalid(benchmark):
+    benchmark(_decode_all, _convert_roman_to_arabic_iterative, INVALID_ROMAN_STRS)
+
+
+def test_dfa_parser_is_faster_than_iterative():
+    dfa_time = min(timeit.repeat(lambda: _decode_all(convert_roman_to_arabic, ROMAN_STRS), number=1, repeat=5))
+    iterative_time = min(timeit.repeat(lambda: _decode_all(_convert_roman_to_arabic_iterative, ROMAN_STRS), number=1, repeat=5))
+    assert dfa_time * 2 < iterative_time
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK ROMANNUMERAL
+# ------------------------------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class LegacyRomanNumeral:
+    """
+    The previous frozen-dataclass RomanNumeral (one __dict__-backed object per construction), as a baseline.
+    """
+    int_val: int
+    str_val: str
+
+    def __init__(self, value: int):
+        object.__setattr__(self, 'int_val', value)
+        object.__setattr__(self, 'str_val', convert_arabic_to_roman(value))
+
+
+def _allocated_bytes_per_instance(factory, count: int = 100_000) -> float:
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        instances = [factory(i % MAX_NUMBER + 1) for i in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+    return (after - before) / count
+
+
+@pytest.mark.benchmark(group="RomanNumeral construction")
+def test_benchmark_roman_numeral_interned(benchmark):
+    benchmark(_encode_all, RomanNumeral)
+
+
+@pytest.mark.benchmark(group="RomanNumeral construction")
+def test_benchmark_roman_numeral_legacy(benchmark):
+    benchmark(_encode_all, LegacyRomanNumeral)
+
+
+def test_roman_numeral_memory_per_instance():
+    RomanNumeral(1)  # Make sure the cache exists, so only what each instance costs is measured.
+    legacy_bytes = _allocated_bytes_per_instance(LegacyRomanNumeral)
+    interned_bytes = _allocated_bytes_per_instance(RomanNumeral)
+    assert interned_bytes * 4 < legacy_bytes, \
+        f"Bytes per instance: legacy dataclass {legacy_bytes:.1f}, interned slots {interned_bytes:.1f}"
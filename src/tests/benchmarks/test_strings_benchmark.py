@@ -0,0 +1,141 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from koolkit.strings import (CaseConverter, camel2under, camel2under_many, convert_case, convert_to_single_line,
+                             stream_single_line, under2camel, under2camel_many)
+import io
+
+from koolkit.strings import Template, evaluate_as_f_string, render_many, render_template, write_rendered
+from koolkit.strings.edit_strings import _convert_to_single_line_regex
+
+# A few hundred distinct keys, repeated, like the keys of a large JSON payload.
+KEYS = [f"someFieldName{i}WithHTTPStuff" for i in range(300)] * 50
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK CONVERT_CASE() / CASECONVERTER
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.benchmark(group="convert_case")
+def test_benchmark_convert_case(benchmark):
+    benchmark(lambda: [convert_case(key, "snake", split_camel=True) for key in KEYS])
+
+
+@pytest.mark.benchmark(group="convert_case")
+def test_benchmark_case_converter(benchmark):
+    to_snake = CaseConverter("snake", split_camel=True)
+    benchmark(lambda: [to_snake(key) for key in KEYS])
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK CAMEL2UNDER() / UNDER2CAMEL()
+# ------------------------------------------------------------------------------------------------
+
+UNDER_KEYS = camel2under_many(KEYS)
+
+
+@pytest.mark.benchmark(group="camel2under")
+def test_benchmark_camel2under_per_call(benchmark):
+    benchmark(lambda: [camel2under(key) for key in KEYS])
+
+
+@pytest.mark.benchmark(group="camel2under")
+def test_benchmark_camel2under_many(benchmark):
+    benchmark(camel2under_many, KEYS)
+
+
+@pytest.mark.benchmark(group="under2camel")
+def test_benchmark_under2camel_per_call(benchmark):
+    benchmark(lambda: [under2camel(key) for key in UNDER_KEYS])
+
+
+@pytest.mark.benchmark(group="under2camel")
+def test_benchmark_under2camel_many(benchmark):
+    benchmark(under2camel_many, UNDER_KEYS)
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK CONVERT_TO_SINGLE_LINE()
+# ------------------------------------------------------------------------------------------------
+
+MULTILINE_TEXT = "Some words on a line,\n\tthen   an indented\r\nline and a blank one\n\n" * 20_000
+
+
+@pytest.mark.benchmark(group="convert_to_single_line")
+def test_benchmark_convert_to_single_line_split(benchmark):
+    benchmark(convert_to_single_line, MULTILINE_TEXT)
+
+
+@pytest.mark.benchmark(group="convert_to_single_line")
+def test_benchmark_convert_to_single_line_regex(benchmark):
+    benchmark(_convert_to_single_line_regex, MULTILINE_TEXT)
+
+
+@pytest.mark.benchmark(group="convert_to_single_line")
+def test_benchmark_stream_single_line(benchmark):
+    chunks = [MULTILINE_TEXT[i:i + (1 << 16)] for i in range(0, len(MULTILINE_TEXT), 1 << 16)]
+    benchmark(lambda: "".join(stream_single_line(chunks)))
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK EVALUATE_AS_F_STRING() / TEMPLATE
+# ------------------------------------------------------------------------------------------------
+
+TEMPLATE_TEXT = "Hello, {name}. You have {count} new messages, {ratio:.1%} of your inbox."
+TEMPLATE_VARIABLES = {"name": "Bob", "count": 3, "ratio": 0.25}
+
+
+def _uncached_eval(text, variables):
+    # What evaluate_as_f_string() used to do: parse and compile on every call.
+    return eval(f'f"""{text}"""', {}, variables)
+
+
+@pytest.mark.benchmark(group="templates")
+def test_benchmark_uncached_eval(benchmark):
+    benchmark(_uncached_eval, TEMPLATE_TEXT, TEMPLATE_VARIABLES)
+
+
+def _evaluate_with_locals():
+    name, count, ratio = "Bob", 3, 0.25
+    return evaluate_as_f_string(TEMPLATE_TEXT)
+
+
+@pytest.mark.benchmark(group="templates")
+def test_benchmark_evaluate_as_f_string(benchmark):
+    benchmark(_evaluate_with_locals)
+
+
+@pytest.mark.benchmark(group="templates")
+def test_benchmark_template(benchmark):
+    benchmark(Template(TEMPLATE_TEXT).render, TEMPLATE_VARIABLES)
+
+
+@pytest.mark.benchmark(group="templates")
+def test_benchmark_template_safe(benchmark):
+    benchmark(Template(TEMPLATE_TEXT, safe=True).render, TEMPLATE_VARIABLES)
+
+
+# ------------------------------------------------------------------------------------------------
+# BENCHMARK RENDER_MANY() OVER 1M RECORDS
+# ------------------------------------------------------------------------------------------------
+
+@pytest.fixture(scope="module")
+def million_records():
+    # Built only when these benchmarks run, rather than whenever the module is imported
+    return [{"name": "Bob", "count": i, "ratio": i / 1_000_000} for i in range(1_000_000)]
+
+
+@pytest.mark.benchmark(group="render 1M records")
+def test_benchmark_render_template_per_record(benchmark, million_records):
+    benchmark.pedantic(lambda: [render_template(TEMPLATE_TEXT, record) for record in million_records], rounds=3)
+
+
+@pytest.mark.benchmark(group="render 1M records")
+def test_benchmark_render_many(benchmark, million_records):
+    benchmark.pedantic(lambda: list(render_many(TEMPLATE_TEXT, million_records)), rounds=3)
+
+
+@pytest.mark.benchmark(group="render 1M records")
+def test_benchmark_write_rendered(benchmark, million_records):
+    benchmark.pedantic(lambda: write_rendered(TEMPLATE_TEXT, million_records, io.StringIO()), rounds=3)
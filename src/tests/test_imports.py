@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import koolkit
+
+# Import time budget for koolkit's own modules, in milliseconds (best of a few runs). Generous, as it
+# includes compiling them when there is no bytecode cache; importing Rich or asyncio alone takes longer.
+STARTUP_BUDGET_MS = 40
+
+HEAVY_MODULES = ('rich', 'asyncio', 'multiprocessing', 'numpy', 'concurrent', 'tracemalloc', 'json')
+
+
+def _importtime(code):
+    """
+    Run code in a fresh interpreter with -X importtime. Returns {module: cumulative microseconds}
+    of the modules it imported, and the total for the top-level koolkit imports.
+    """
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(koolkit.__file__)))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            env=env, capture_output=True, text=True, check=True)
+    modules, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules[name.strip()] = int(cumulative)
+        if name.startswith(' koolkit'):  # Top level, not nested in another import
+            total += int(cumulative)
+    return modules, total
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST LAZY IMPORTS
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("code", [
+    "import koolkit",
+    "import koolkit.numbers, koolkit.strings, koolkit.profiling, koolkit.progress_bars",
+    "from koolkit.progress_bars import SpinnerProgressBar, EllipsisProgressBar, RippleProgressBar, Progress",
+    "from koolkit.numbers import convert_arabic_to_roman",
+])
+def test_import_is_lazy(code):
+    modules, _ = _importtime(code)
+    assert not [name for name in modules if name.split('.')[0] in HEAVY_MODULES]
+
+
+def test_rich_imported_when_a_rich_bar_is_shown():
+    pytest.importorskip("rich")
+    _importtime(
+        "from koolkit.progress_bars import ANIMATE, RippleProgressBar, render_scheduler\n"
+        "import io, sys, time\n"
+        "render_scheduler.stream, render_scheduler.mode = io.StringIO(), ANIMATE\n"
+        "bar = RippleProgressBar(use_rich=True)\n"
+        "assert 'rich' not in sys.modules\n"
+        "with bar: time.sleep(0.05)\n"
+        "assert 'rich' in sys.modules"
+    )
+
+
+def test_startup_budget():
+    code = "from koolkit.progress_bars import SpinnerProgressBar, Progress"
+    total = min(_importtime(code)[1] for _ in range(3))
+    assert total / 1000 < STARTUP_BUDGET_MS
+
+
+def test_lazy_attributes():
+    import koolkit.numbers
+
+    assert 'convert_arabic_to_roman' in dir(koolkit.numbers)
+    assert koolkit.numbers.convert_arabic_to_roman(4) == 'IV'
+    assert 'convert_arabic_to_roman' in vars(koolkit.numbers)  # Stored, for plain lookups from then on
+    assert koolkit.numbers.roman_numerals.MAX_NUMBER == 3999  # Submodules too
+    assert koolkit.strings.camel2under('camelCase') == 'camel_case'
+    with pytest.raises(AttributeError):
+        koolkit.numbers.nonexistent
+    with pytest.raises(AttributeError):
+        koolkit.nonexistent
+
+
+@pytest.mark.parametrize("package", ['koolkit', 'koolkit.numbers', 'koolkit.strings', 'koolkit.profiling',
+                                     'koolkit.progress_bars'])
+def test_all_names_exist(package):
+    namespace = {}
+    exec(f"from {package} import *", namespace)
+    module = sys.modules[package]
+    assert set(module.__all__) <= set(namespace)
@@ -0,0 +1,260 @@
+import io
+import json
+import random
+import threading
+
+import pytest
+
+from koolkit.logging import DEBUG, DROP_NEWEST, DROP_OLDEST, INFO, WARNING, Logger, LogWriter, get_logger
+
+
+@pytest.fixture
+def sink():
+    return io.StringIO()
+
+
+@pytest.fixture
+def writer(sink):
+    with LogWriter(sink, flush_interval=60) as writer:
+        yield writer
+
+
+def _records(writer, sink):
+    writer.flush()
+    return [json.loads(line) for line in sink.getvalue().splitlines()]
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST LOGGER
+# ------------------------------------------------------------------------------------------------
+
+def test_logger_json_lines(writer, sink):
+    log = Logger('orders', writer=writer)
+    log.info("Processed %d orders", 3, customer_id=42, tags=['a', 'b'])
+
+    [record] = _records(writer, sink)
+    assert record['level'] == 'INFO'
+    assert record['logger'] == 'orders'
+    assert record['message'] == "Processed 3 orders"
+    assert record['customer_id'] == 42
+    assert record['tags'] == ['a', 'b']
+    assert record['time'].endswith('+00:00')
+
+
+def test_logger_levels(writer, sink):
+    log = Logger('app', level='warning', writer=writer)
+    log.debug("no")
+    log.info("no")
+    log.warning("yes")
+    log.error("yes")
+    log.critical("yes")
+    log.log(DEBUG, "no")
+    log.log('ERROR', "yes")
+    assert [r['level'] for r in _records(writer, sink)] == ['WARNING', 'ERROR', 'CRITICAL', 'ERROR']
+    assert log.is_enabled_for(WARNING) and not log.is_enabled_for(INFO)
+
+
+def test_logger_invalid_level():
+    with pytest.raises(ValueError):
+        Logger('app', level='verbose', writer=LogWriter(io.StringIO()))
+
+
+def test_logger_formats_lazily(writer, sink):
+    class Expensive:
+        formatted = 0
+
+        def __str__(self):
+            Expensive.formatted += 1
+            return 'expensive'
+
+    log = Logger('app', level=INFO, writer=writer)
+    log.debug("value: %s", Expensive())
+    assert not writer._queue
+    log.info("value: %s", Expensive())
+    assert Expensive.formatted == 0  # Only formatted by the writer
+    assert _records(writer, sink)[0]['message'] == "value: expensive"
+    assert Expensive.formatted == 1
+
+
+def test_logger_bind(writer, sink):
+    log = Logger('app', writer=writer).bind(request_id='r1')
+    log.bind(user='bob').info("hello", extra=1)
+    log.info("bye", request_id='overridden?')
+
+    first, second = _records(writer, sink)
+    assert (first['request_id'], first['user'], first['extra']) == ('r1', 'bob', 1)
+    assert second['request_id'] == 'r1'  # Bound fields come first
+    assert 'user' not in second
+
+
+def test_logger_exception(writer, sink):
+    log = Logger('app', writer=writer)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log.exception("Failed")
+
+    [record] = _records(writer, sink)
+    assert record['level'] == 'ERROR'
+    assert 'ZeroDivisionError' in record['exception']
+
+
+def test_logger_non_serializable_and_bad_format(writer, sink):
+    log = Logger('app', writer=writer)
+    log.info("object", value={1, 2}.__class__)
+    log.info("%d", 'not a number')
+    log.info("after")
+
+    records = _records(writer, sink)
+    assert records[0]['value'] == "<class 'set'>"
+    assert records[1]['logger'] == 'koolkit.logging'  # The writer survives bad records
+    assert records[2]['message'] == "after"
+
+
+def test_get_logger_is_cached():
+    assert get_logger('test_get_logger') is get_logger('test_get_logger')
+    assert get_logger('test_get_logger', level=DEBUG).level == DEBUG
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST LOGWRITER
+# ------------------------------------------------------------------------------------------------
+
+def test_writer_batches_writes():
+    class CountingSink(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            CountingSink.writes += 1
+            return super().write(s)
+
+    sink = CountingSink()
+    with LogWriter(sink, batch_size=100, flush_interval=60) as writer:
+        log = Logger('app', writer=writer)
+        with writer._write_lock:  # Hold the writer back, so everything is queued
+            for i in range(1000):
+                log.info("message %d", i)
+        writer.flush()
+
+    assert len(sink.getvalue().splitlines()) == 1000
+    assert CountingSink.writes <= 10 + 1
+
+
+def test_writer_background_flush(sink):
+    with LogWriter(sink, flush_interval=0.01) as writer:
+        Logger('app', writer=writer).info("hello")
+        for _ in range(500):
+            if sink.getvalue():
+                break
+            threading.Event().wait(0.01)
+        assert 'hello' in sink.getvalue()
+
+
+def test_writer_close_drains(sink):
+    writer = LogWriter(sink, flush_interval=60)
+    log = Logger('app', writer=writer)
+    for i in range(10):
+        log.info("message %d", i)
+    writer.close()
+    assert len(sink.getvalue().splitlines()) == 10
+    assert writer.written == 10
+
+
+def test_writer_path_sink(tmp_path):
+    path = tmp_path / 'app.jsonl'
+    with LogWriter(path) as writer:
+        Logger('app', writer=writer).info("to file")
+    assert json.loads(path.read_text())['message'] == "to file"
+
+
+def test_writer_many_threads(writer, sink):
+    log = Logger('app', writer=writer)
+
+    def work(n):
+        for i in range(1000):
+            log.info("thread %d message %d", n, i)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(_records(writer, sink)) == 8000
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST SAMPLING, RATE LIMITING, AND DROP POLICY
+# ------------------------------------------------------------------------------------------------
+
+def test_sampling(writer, sink):
+    random.seed(0)
+    log = Logger('app', writer=writer, sample_rate=0.1)
+    for i in range(10_000):
+        log.info("message %d", i)
+    log.error("always logged")
+
+    records = _records(writer, sink)
+    assert 800 < len(records) - 1 < 1200
+    assert log.sampled_out == 10_000 - (len(records) - 1)
+    assert records[-1]['message'] == "always logged"
+
+
+def test_rate_limit_per_call_site(writer, sink, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('koolkit.logging.time.monotonic', lambda: now[0])
+    log = Logger('app', writer=writer, rate_limit=2, burst=3)
+
+    def spam(n):
+        for i in range(n):
+            log.info("first site %d", i)
+
+    def other_site():
+        log.warning("second site")
+
+    spam(10)  # Burst of 3, then limited
+    other_site()  # Has its own bucket
+    now[0] += 1.0  # Refills 2 tokens
+    spam(10)
+    log.bind(user='bob').info("bound")  # Shares the limiter
+
+    messages = [r['message'] for r in _records(writer, sink)]
+    assert messages == ["first site 0", "first site 1", "first site 2", "second site",
+                        "first site 0", "first site 1", "bound"]
+    assert log.rate_limited == 7 + 8
+
+
+def test_rate_limit_exempt_level(writer, sink):
+    log = Logger('app', writer=writer, rate_limit=1)
+    for _ in range(5):
+        log.error("error")
+        log.info("info")
+    levels = [r['level'] for r in _records(writer, sink)]
+    assert levels.count('ERROR') == 5
+    assert levels.count('INFO') == 1
+
+
+@pytest.mark.parametrize("kwargs", [{'sample_rate': 1.5}, {'rate_limit': 0}])
+def test_limiter_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        Logger('app', writer=LogWriter(io.StringIO()), **kwargs)
+
+
+@pytest.mark.parametrize("drop, kept", [(DROP_OLDEST, list(range(90, 100))), (DROP_NEWEST, list(range(10)))])
+def test_bounded_queue_drop_policy(sink, drop, kept):
+    with LogWriter(sink, max_queue=10, drop=drop, flush_interval=60) as writer:
+        log = Logger('app', writer=writer)
+        with writer._write_lock:  # Hold the writer back, so the queue fills up
+            for i in range(100):
+                log.info("message", i=i)
+            assert len(writer._queue) == 10
+        assert writer.dropped == 90
+        records = _records(writer, sink)
+
+    assert [r['i'] for r in records[:-1]] == kept
+    assert records[-1]['message'] == "Dropped 90 log records (queue full)"
+    assert records[-1]['dropped_total'] == 90
+
+
+def test_writer_invalid_drop_policy():
+    with pytest.raises(ValueError):
+        LogWriter(io.StringIO(), drop='random')
@@ -0,0 +1,517 @@
+import asyncio
+import json
+import math
+import pickle
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from koolkit.profiling import (Histogram, Registry, SamplingProfiler, default_registry, disable, enable, is_enabled, timed,
+                               timeit, traced_memory)
+from koolkit.profiling.histogram import MAX_VALUE, _BUCKET_COUNT, _bucket_bounds, _bucket_index
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+@pytest.fixture
+def profiling_disabled():
+    disable()
+    yield
+    enable()
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST TIMED() AND REGISTRY
+# ------------------------------------------------------------------------------------------------
+
+def test_timed_keeps_return_value(registry):
+    @timed('double', registry=registry)
+    def double(x):
+        return x * 2
+
+    assert double(21) == 42
+    assert double.__name__ == 'double'
+    assert registry.stats('double').count == 1
+
+
+def test_timed_defaults_to_qualname(registry):
+    @timed(registry=registry)
+    def some_function():
+        return None
+
+    some_function()
+    assert list(registry.snapshot()) == [some_function.__qualname__]
+
+
+def test_timed_records_on_exception(registry):
+    @timed('fails', registry=registry)
+    def fails():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        fails()
+    assert registry.stats('fails').count == 1
+
+
+def test_registry_stats(registry):
+    for ns in range(1, 101):
+        registry.record('op', ns * 1000)
+
+    summary = registry.snapshot()['op']
+    assert summary['count'] == 100
+    assert summary['total_ns'] == sum(range(1, 101)) * 1000
+    assert summary['min_ns'] == 1000
+    assert summary['max_ns'] == 100_000
+    assert summary['mean_ns'] == pytest.approx(50_500)
+    assert summary['p50_ns'] == pytest.approx(50_000, rel=0.05)
+    assert summary['p99_ns'] == pytest.approx(99_000, rel=0.05)
+
+
+def test_registry_report_and_reset(registry):
+    registry.record('op', 1_500_000)
+    report = registry.report()
+    assert 'op' in report and '1.500' in report
+
+    registry.reset()
+    assert registry.snapshot()['op']['count'] == 0
+    assert registry.snapshot()['op']['total_ns'] == 0
+
+
+def test_timed_records_after_reset(registry):
+    @timed('op', registry=registry)
+    def func():
+        return 1
+
+    func()
+    registry.reset()
+    func()
+    assert registry.stats('op').count == 1
+    assert registry.snapshot()['op']['count'] == 1
+
+
+def test_timed_async(registry):
+    @timed('sleepy', registry=registry)
+    async def sleepy():
+        await asyncio.sleep(0.01)
+        return 'done'
+
+    assert asyncio.run(sleepy()) == 'done'
+    assert registry.stats('sleepy').count == 1
+    assert registry.stats('sleepy').min_ns >= 5_000_000
+
+
+def test_timed_context_manager(registry):
+    timer = timed('block', registry=registry)
+    with timer:
+        with timer:  # Nested use of the same instance
+            time.sleep(0.001)
+
+    stats = registry.stats('block')
+    assert stats.count == 2
+    assert stats.max_ns >= stats.min_ns >= 1_000_000
+
+
+def test_timed_async_context_manager(registry):
+    async def main():
+        async with timed('async block', registry=registry):
+            await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert registry.stats('async block').count == 1
+
+
+def test_timed_shared_by_tasks(registry):
+    timer = timed('block', registry=registry)
+
+    async def block(delay, duration):
+        await asyncio.sleep(delay)
+        async with timer:
+            await asyncio.sleep(duration)
+
+    async def main():
+        # Both blocks are entered before the first one exits
+        await asyncio.gather(block(0, 0.05), block(0.01, 0.1))
+
+    asyncio.run(main())
+    stats = registry.stats('block')
+    assert stats.count == 2
+    assert 50_000_000 <= stats.min_ns < 100_000_000
+    assert stats.max_ns >= 100_000_000
+
+
+def test_timed_default_registry():
+    name = 'test_timed_default_registry'
+    with timed(name):
+        pass
+    assert default_registry.snapshot()[name]['count'] == 1
+
+
+def test_disabled_returns_function_unwrapped(registry, profiling_disabled):
+    assert not is_enabled()
+
+    def func():
+        return 1
+
+    assert timed(registry=registry)(func) is func
+    with timed('block', registry=registry):
+        pass
+    assert registry.snapshot() == {}
+
+
+def test_disabled_after_decoration(registry):
+    @timed('op', registry=registry)
+    def func():
+        return 1
+
+    disable()
+    try:
+        assert func() == 1
+    finally:
+        enable()
+    assert registry.snapshot()['op']['count'] == 0
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST HISTOGRAM
+# ------------------------------------------------------------------------------------------------
+
+def test_histogram_buckets_are_contiguous():
+    previous_high = -1
+    for index in range(_BUCKET_COUNT):
+        low, high = _bucket_bounds(index)
+        assert low == previous_high + 1
+        assert _bucket_index(low) == index == _bucket_index(high)
+        previous_high = high
+    assert previous_high == MAX_VALUE
+
+
+def test_histogram_small_values_are_exact():
+    histogram = Histogram()
+    for value in range(64):
+        histogram.record(value)
+    assert [histogram.percentile(q) for q in (0, 50, 100)] == [0, 31, 63]
+
+
+def test_histogram_percentiles_are_accurate():
+    rng = random.Random(42)
+    values = [int(rng.lognormvariate(12, 2)) for _ in range(50_000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    assert histogram.count == len(values)
+    assert histogram.total == sum(values)
+    assert (histogram.min, histogram.max) == (values[0], values[-1])
+    for q in (1, 25, 50, 90, 99, 99.9):
+        exact = values[max(math.ceil(len(values) * q / 100), 1) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=1 / 32)
+
+
+def test_histogram_empty():
+    histogram = Histogram()
+    assert histogram.count == 0
+    assert histogram.min is None and histogram.max is None and histogram.mean is None
+    assert histogram.percentiles(50, 99) == [None, None]
+
+
+@pytest.mark.parametrize("value", [-1, -1000, MAX_VALUE + 1])
+def test_histogram_out_of_range(value):
+    histogram = Histogram()
+    with pytest.raises(ValueError):
+        histogram.record(value)
+    assert histogram.count == 0
+
+
+def test_histogram_invalid_percentile():
+    histogram = Histogram()
+    histogram.record(1)
+    with pytest.raises(ValueError):
+        histogram.percentile(101)
+
+
+def test_histogram_merge_equals_single_histogram():
+    rng = random.Random(0)
+    values = [rng.randrange(1, 10 ** 9) for _ in range(10_000)]
+    whole = Histogram()
+    parts = [Histogram() for _ in range(4)]
+    for i, value in enumerate(values):
+        whole.record(value)
+        parts[i % 4].record(value)
+
+    merged = Histogram()
+    for part in parts:
+        merged.merge(part)
+    assert merged == whole
+    assert merged.percentiles(50, 99) == whole.percentiles(50, 99)
+
+
+def test_histogram_export_round_trip():
+    histogram = Histogram()
+    for value in (5, 500, 50_000, 5_000_000_000):
+        histogram.record(value)
+
+    exported = json.loads(json.dumps(histogram.to_dict()))
+    assert Histogram.from_dict(exported) == histogram
+    assert pickle.loads(pickle.dumps(histogram)) == histogram
+    assert Histogram.from_dict(Histogram().to_dict()) == Histogram()
+
+
+def _record_in_worker(seed):
+    registry = Registry()
+    rng = random.Random(seed)
+    for _ in range(1000):
+        registry.record('work', rng.randrange(1, 10 ** 6))
+    return registry.export()
+
+
+def test_registry_merge_across_processes(registry):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        for exported in executor.map(_record_in_worker, range(4)):
+            registry.merge(exported)
+
+    expected = Registry()
+    for seed in range(4):
+        expected.merge(_record_in_worker(seed))
+    assert registry.snapshot() == expected.snapshot()
+    assert registry.snapshot()['work']['count'] == 4000
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST SAMPLINGPROFILER
+# ------------------------------------------------------------------------------------------------
+
+def _busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _busy_root(seconds):
+    _busy_leaf(seconds)
+
+
+def test_sampling_profiler_collapsed_stacks(tmp_path):
+    output = tmp_path / 'profile.folded'
+    with SamplingProfiler(rate=500, output=output) as profiler:
+        assert profiler.running
+        _busy_root(0.2)
+    assert not profiler.running
+
+    stacks = profiler.collapsed()
+    assert profiler.sample_count > 10
+    busy = sum(count for stack, count in stacks.items() if '_busy_root' in stack and '_busy_leaf' in stack)
+    assert busy >= profiler.sample_count // 2
+    # Outermost frame first, leaf last
+    assert any(stack.index('_busy_root') < stack.index('_busy_leaf') for stack in stacks if '_busy_leaf' in stack)
+
+    lines = output.read_text().splitlines()
+    assert len(lines) == len(stacks)
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        assert stacks[stack] == int(count)
+
+
+def test_sampling_profiler_decorator():
+    profiler = SamplingProfiler(rate=500)
+
+    @profiler
+    def work():
+        _busy_leaf(0.05)
+        return 'done'
+
+    assert work() == 'done'
+    assert work.__name__ == 'work'
+    assert not profiler.running
+    assert profiler.sample_count > 0
+
+
+def test_sampling_profiler_nested():
+    profiler = SamplingProfiler(rate=500)
+    with profiler:
+        with profiler:
+            pass
+        assert profiler.running
+    assert not profiler.running
+
+
+def test_sampling_profiler_bounds():
+    profiler = SamplingProfiler(rate=1000, max_stacks=1, max_depth=2)
+    with profiler:
+        _busy_root(0.05)
+        _busy_leaf(0.05)
+    stacks = profiler.collapsed()
+    assert all(stack == '[truncated]' or stack.count(';') <= 2 for stack in stacks)
+    assert len(stacks) <= 2
+
+
+def test_sampling_profiler_max_depth_keeps_leaf_frames():
+    profiler = SamplingProfiler(rate=1000, max_depth=1)
+    with profiler:
+        _busy_root(0.1)
+    busy = [stack for stack in profiler.collapsed() if '_busy_leaf' in stack]
+    assert busy
+    for stack in busy:
+        root, leaf = stack.split(';')
+        assert root == '<truncated>'
+        assert leaf.startswith('_busy_leaf ')
+
+
+def test_sampling_profiler_overhead_bound():
+    profiler = SamplingProfiler(rate=100_000, max_overhead=0.05)
+    start = time.perf_counter_ns()
+    with profiler:
+        _busy_leaf(0.2)
+    elapsed = time.perf_counter_ns() - start
+    assert profiler.sampling_ns < 0.15 * elapsed
+
+
+def test_sampling_profiler_disabled(profiling_disabled):
+    profiler = SamplingProfiler()
+
+    def func():
+        return 1
+
+    assert profiler(func) is func
+    with profiler:
+        assert not profiler.running
+    assert profiler.sample_count == 0
+
+
+@pytest.mark.parametrize("kwargs", [{'rate': 0}, {'max_overhead': 0}, {'max_overhead': 2}])
+def test_sampling_profiler_invalid_arguments(kwargs):
+    with pytest.raises(ValueError):
+        SamplingProfiler(**kwargs)
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST TRACED_MEMORY()
+# ------------------------------------------------------------------------------------------------
+
+def _allocate(n_bytes, keep):
+    garbage = bytearray(n_bytes)  # Freed on return: counts toward peak only
+    kept = bytearray(keep)
+    del garbage
+    return kept
+
+
+def test_traced_memory_peak_and_net(registry):
+    with traced_memory('alloc', registry=registry) as usage:
+        kept = _allocate(4_000_000, 1_000_000)
+
+    assert 4_000_000 <= usage.peak_bytes < 5_200_000
+    assert 1_000_000 <= usage.net_bytes < 1_100_000
+    filename, lineno, size, _ = usage.top_lines[0]
+    assert filename == __file__ and size >= 1_000_000
+    assert 'alloc: peak' in usage.report()
+
+    summary = registry.snapshot()['alloc']
+    assert summary['memory_count'] == 1
+    assert summary['net_bytes'] == usage.net_bytes
+    assert summary['peak_bytes_max'] == usage.peak_bytes
+    assert summary['count'] == 0  # Memory measurements are not timings
+    assert 'peak KiB' in registry.report()
+    del kept
+
+
+def test_traced_memory_stops_tracing():
+    assert not tracemalloc.is_tracing()
+    with traced_memory(registry=Registry()):
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_traced_memory_nested(registry):
+    with traced_memory('outer', registry=registry, top=0) as outer:
+        _allocate(2_000_000, 0)
+        with traced_memory('inner', registry=registry, top=0) as inner:
+            _allocate(500_000, 0)
+
+    assert 500_000 <= inner.peak_bytes < 2_000_000
+    assert outer.peak_bytes >= 2_000_000  # Not lost when the inner measurement reset the peak
+
+
+def test_traced_memory_shared_by_threads(registry):
+    measure = traced_memory('shared', registry=registry, top=0)
+    first_entered, second_entered, first_exited = threading.Event(), threading.Event(), threading.Event()
+    usages = {}
+
+    def first():
+        with measure as usage:
+            data = _allocate(0, 2_000_000)
+            first_entered.set()
+            second_entered.wait()
+        usages['first'] = usage.net_bytes  # Filled in on its own exit
+        first_exited.set()
+        del data
+
+    def second():
+        first_entered.wait()
+        with measure as usage:
+            second_entered.set()
+            first_exited.wait()
+        usages['second'] = usage.net_bytes
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert usages['first'] >= 2_000_000
+    assert usages['second'] < 2_000_000
+    assert registry.snapshot()['shared']['memory_count'] == 2
+
+
+def test_traced_memory_decorator(registry):
+    @traced_memory(registry=registry)
+    def build(n):
+        return list(range(n))
+
+    assert len(build(100_000)) == 100_000
+    assert build.memory.last.net_bytes > 0  # The result is only freed after the measurement
+    assert registry.snapshot()[build.__qualname__]['memory_count'] == 1
+
+
+def test_traced_memory_export_and_merge(registry):
+    with traced_memory('alloc', registry=registry, top=0):
+        _allocate(100_000, 0)
+
+    merged = Registry()
+    merged.merge(json.loads(json.dumps(registry.export())))
+    merged.merge(registry)
+    summary = merged.snapshot()['alloc']
+    assert summary['memory_count'] == 2
+    assert summary['net_bytes'] == 2 * registry.snapshot()['alloc']['net_bytes']
+
+
+def test_traced_memory_disabled(registry, profiling_disabled):
+    def func():
+        return 1
+
+    assert traced_memory(registry=registry)(func) is func
+    with traced_memory('off', registry=registry) as usage:
+        assert not tracemalloc.is_tracing()
+    assert usage.peak_bytes is None
+    assert registry.snapshot() == {}
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST TIMEIT()
+# ------------------------------------------------------------------------------------------------
+
+def test_timeit_backward_compatible(capsys):
+    @timeit('Adding')
+    def add(a, b):
+        return a + b
+
+    result, execution_time = add(1, 2)
+    assert result == 3
+    assert execution_time >= 0
+    assert capsys.readouterr().out.startswith("Adding took 0.00 seconds")
@@ -0,0 +1,519 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import pickle
+import re
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+
+import pytest
+
+from koolkit.progress_bars import (ANIMATE, OFF, STATUS, EllipsisProgressBar, Progress, ProgressCounter, RenderScheduler,
+                                   RippleProgressBar, SharedProgress, SpinnerProgressBar, render_scheduler)
+from koolkit.progress_bars import scheduler as scheduler_module
+from koolkit.progress_bars.determinate_progress_bar import _format_duration, _format_rate
+
+
+@pytest.fixture(autouse=True)
+def stream(monkeypatch):
+    # Draw into a buffer (animated, as if it were a terminal), and restore the SIGINT handler the bars install.
+    stream = io.StringIO()
+    monkeypatch.setattr(render_scheduler, 'stream', stream)
+    monkeypatch.setattr(render_scheduler, 'mode', ANIMATE)
+    handler = signal.getsignal(signal.SIGINT)
+    yield stream
+    signal.signal(signal.SIGINT, handler)
+
+
+def _strip_ansi(text):
+    return re.sub(r'\x1b\[[0-9;?]*[A-Za-z]', '', text)
+
+
+def _render_threads():
+    return [t for t in threading.enumerate() if t.name == 'koolkit-progress-render']
+
+
+def _wait_for_render_thread_to_stop():
+    for _ in range(100):
+        if not _render_threads():
+            return
+        time.sleep(0.01)
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST RENDER SCHEDULER
+# ------------------------------------------------------------------------------------------------
+
+class Counter:
+    def __init__(self, interval):
+        self.interval = interval
+        self.frames = 0
+
+    def _next_frame(self):
+        self.frames += 1
+        return f"frame {self.frames}"
+
+
+def test_scheduler_frame_rates():
+    scheduler = RenderScheduler(io.StringIO(), ANIMATE)
+    fast, slow = Counter(0.01), Counter(0.1)
+    scheduler.register(fast)
+    scheduler.register(slow)
+    time.sleep(0.3)
+    scheduler.unregister(fast)
+    scheduler.unregister(slow)
+
+    assert 10 <= fast.frames <= 35
+    assert 2 <= slow.frames <= 5
+
+
+def test_scheduler_one_write_per_tick():
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, s):
+            CountingStream.writes += 1
+            return super().write(s)
+
+    stream = CountingStream()
+    scheduler = RenderScheduler(stream, ANIMATE)
+    indicators = [Counter(0.05) for _ in range(5)]
+    for indicator in indicators:
+        scheduler.register(indicator)
+    time.sleep(0.02)
+    writes, frames = CountingStream.writes, sum(indicator.frames for indicator in indicators)
+    time.sleep(0.3)
+    writes, frames = CountingStream.writes - writes, sum(indicator.frames for indicator in indicators) - frames
+    for indicator in indicators:
+        scheduler.unregister(indicator)
+
+    # Indicators on the same schedule share a write per tick.
+    assert frames >= 20
+    assert writes <= frames / 5 + 1
+    assert "\033[4A" in stream.getvalue()  # Five lines, drawn as a block
+
+
+def test_scheduler_thread_only_while_active():
+    scheduler = RenderScheduler(io.StringIO(), ANIMATE)
+    indicator = Counter(0.01)
+    scheduler.register(indicator)
+    assert scheduler.active == [indicator]
+    assert scheduler._thread is not None
+    scheduler.unregister(indicator)
+    scheduler.unregister(indicator)  # No-op
+    _wait_for_render_thread_to_stop()
+    assert scheduler._thread is None
+    assert scheduler.active == []
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+@pytest.mark.parametrize("stream_type, status", [(_Terminal, False), (io.StringIO, True)])
+def test_scheduler_detects_terminal(stream_type, status):
+    scheduler = RenderScheduler(stream_type())
+    indicator = Counter(0.01)
+    scheduler.register(indicator)
+    assert scheduler._status is status
+    scheduler.unregister(indicator)
+
+
+def test_scheduler_status_mode(monkeypatch, capsys):
+    stream = io.StringIO()
+    monkeypatch.setattr(render_scheduler, 'stream', stream)
+    monkeypatch.setattr(render_scheduler, 'mode', None)
+    monkeypatch.setattr(render_scheduler, 'status_interval', 0.1)
+    with SpinnerProgressBar("Spinning", exit_msg="spun", speed='fast'):
+        with Progress(total=10, msg="Counting", leave=True) as progress:
+            progress.update(5)
+            time.sleep(0.25)
+
+    lines = stream.getvalue().splitlines()
+    assert "\033" not in stream.getvalue() and "\r" not in stream.getvalue()
+    assert lines[0] == "Spinning [00:00]"
+    assert lines[1].startswith("Counting  50% |")
+    assert 3 <= lines.count("Spinning [00:00]") <= 4  # On entering, then every 0.1 seconds
+    assert lines[-1].startswith("Counting  50% |")  # Left on exit
+    assert capsys.readouterr().out == "spun\n"
+
+
+def test_scheduler_off_mode(monkeypatch, capsys):
+    stream = io.StringIO()
+    monkeypatch.setattr(render_scheduler, 'stream', stream)
+    monkeypatch.setattr(render_scheduler, 'mode', OFF)
+    handler = signal.getsignal(signal.SIGINT)
+    with RippleProgressBar("Rippling", exit_msg="rippled"):
+        for _ in Progress(range(10), exit_msg="counted"):
+            assert signal.getsignal(signal.SIGINT) is handler
+            assert render_scheduler.active == [] and _render_threads() == []
+
+    async def main():
+        async with EllipsisProgressBar():
+            return await Progress().gather(asyncio.sleep(0))
+
+    asyncio.run(main())
+    assert stream.getvalue() == ""
+    assert capsys.readouterr().out == ""
+
+
+def test_scheduler_mode_validated():
+    with pytest.raises(ValueError):
+        RenderScheduler(mode='blink')
+    with pytest.raises(ValueError):
+        render_scheduler.mode = 'quiet'
+
+
+@pytest.mark.parametrize("value, mode", [("auto", None), (" Status ", STATUS), ("off", OFF)])
+def test_mode_from_environment(monkeypatch, value, mode):
+    monkeypatch.setenv('KOOLKIT_PROGRESS', value)
+    assert scheduler_module._mode_from_environment() == mode
+
+
+def test_invalid_environment_ignored(monkeypatch):
+    monkeypatch.setenv('KOOLKIT_PROGRESS', 'quiet')
+    monkeypatch.setenv('KOOLKIT_PROGRESS_INTERVAL', '30s')
+    with pytest.warns(RuntimeWarning, match='KOOLKIT_PROGRESS'):
+        assert scheduler_module._mode_from_environment() is None
+    with pytest.warns(RuntimeWarning, match='KOOLKIT_PROGRESS_INTERVAL'):
+        assert scheduler_module._status_interval_from_environment() == 30
+
+    monkeypatch.setenv('KOOLKIT_PROGRESS_INTERVAL', '2.5')
+    assert scheduler_module._status_interval_from_environment() == 2.5
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST PROGRESS BARS
+# ------------------------------------------------------------------------------------------------
+
+PROGRESS_BARS = [
+    lambda: RippleProgressBar("Rippling", exit_msg="ripple done", speed='fast', use_rich=False),
+    lambda: RippleProgressBar("Rippling", exit_msg="ripple done", speed='fast', rainbow=True, inverse=True, use_rich=False),
+    lambda: SpinnerProgressBar("Spinning", exit_msg="spinner done", speed='fast'),
+    lambda: EllipsisProgressBar("Waiting", exit_msg="ellipsis done", speed='fast'),
+]
+
+
+@pytest.mark.parametrize("bar", PROGRESS_BARS)
+def test_progress_bar(bar, stream, capsys):
+    bar = bar()
+    with bar:
+        time.sleep(0.25)
+
+    output = stream.getvalue()
+    assert output.startswith("\033[?25l") and output.endswith("\033[?25h")
+    assert bar.msg in _strip_ansi(output)
+    assert capsys.readouterr().out == bar.exit_msg + "\n"
+
+
+@pytest.mark.parametrize("use_rich", [False, True])
+@pytest.mark.parametrize("msg", ["", "a", "ab", "Working...", "x" * 57])
+@pytest.mark.parametrize("kwargs", [{}, {'rainbow': True}, {'inverse': True},
+                                    {'rainbow': True, 'inverse': True, 'colors': ['cyan', 'blue']}])
+def test_ripple_frame_cache(use_rich, msg, kwargs):
+    if use_rich:
+        pytest.importorskip("rich")
+    bar = RippleProgressBar(msg, use_rich=use_rich, **kwargs)
+    bar._reset_frames()
+    reference = RippleProgressBar(msg, use_rich=use_rich, **kwargs)
+    for _ in range(3 * len(msg) + 10):
+        reference._step()
+        expected = reference._rendered_rich_frame() if use_rich else reference._ansi_frame()
+        assert bar._next_frame() == expected
+
+
+def test_ripple_progress_bar_does_not_modify_colors():
+    colors = ['cyan', 'blue']
+    RippleProgressBar(colors=colors)
+    assert colors == ['cyan', 'blue']
+
+
+def test_ripple_progress_bar_rich(stream):
+    pytest.importorskip("rich")
+    with RippleProgressBar("Rippling", speed='fast', use_rich=True):
+        time.sleep(0.15)
+    assert "Rippling" in _strip_ansi(stream.getvalue())
+
+
+def test_nested_progress_bars_share_one_thread(stream, capsys):
+    with RippleProgressBar("Outer", exit_msg="outer done", use_rich=False):
+        with SpinnerProgressBar("Middle", exit_msg="middle done"):
+            with EllipsisProgressBar("Inner", exit_msg="inner done"):
+                time.sleep(0.2)
+                assert len(_render_threads()) == 1
+                assert len(render_scheduler.active) == 3
+
+    assert capsys.readouterr().out == "inner done\nmiddle done\nouter done\n"
+    _wait_for_render_thread_to_stop()
+    assert not _render_threads()
+
+
+def test_exit_msg_none(capsys):
+    with SpinnerProgressBar(exit_msg=None):
+        pass
+    assert capsys.readouterr().out == ""
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST PROGRESS
+# ------------------------------------------------------------------------------------------------
+
+def test_progress_iterable(stream):
+    items = list(range(1000))
+    progress = Progress(items, msg="Counting", fps=100)
+    assert len(progress) == 1000
+    assert [x for x in progress] == items
+    assert progress.n == 1000
+
+    final_line = _strip_ansi(stream.getvalue()).splitlines()[-1]
+    assert final_line.startswith("Counting 100% |" + "█" * 30 + "| 1000/1000 [00:00<00:00,")
+    assert final_line.endswith(" it/s]")
+
+
+def test_progress_generator_without_total(stream):
+    progress = Progress((x for x in range(10)), unit="rows", leave=True)
+    assert progress.total is None
+    assert sum(progress) == 45
+    assert _strip_ansi(stream.getvalue()).splitlines()[-1].startswith("10 rows [00:00, ")
+
+
+def test_progress_update(stream):
+    with Progress(total=200, msg="Bytes", unit="B", fps=100) as progress:
+        for _ in range(4):
+            progress.update(25)
+            time.sleep(0.03)
+        frame = progress._render()
+
+    assert progress.n == 100
+    assert frame.startswith("Bytes  50% |" + "█" * 15 + " " * 15 + "| 100/200 [00:00<00:00, ")
+    assert progress.rate > 0
+
+
+def test_progress_break_exits(stream):
+    for i in Progress(range(100)):
+        if i == 10:
+            break
+    time.sleep(0)  # The generator is closed as soon as the loop drops it
+    assert render_scheduler.active == []
+    assert "10/100" in _strip_ansi(stream.getvalue()).splitlines()[-1]
+
+
+def test_progress_leave_false(stream, capsys):
+    for _ in Progress(range(10), leave=False, exit_msg="finished"):
+        pass
+    assert "10/10" not in stream.getvalue().split("\033[J")[-1]
+    assert capsys.readouterr().out == "finished\n"
+
+
+def test_progress_without_iterable():
+    with pytest.raises(TypeError):
+        iter(Progress(total=10)).__next__()
+    with pytest.raises(TypeError):
+        len(Progress())
+
+
+@pytest.mark.parametrize("fraction, bar", [(0, " " * 10), (0.5, "█████     "), (0.55, "█████▌    "), (1, "█" * 10)])
+def test_progress_bar_characters(fraction, bar):
+    assert Progress(width=10)._bar(fraction) == bar
+
+
+@pytest.mark.parametrize("seconds, text", [(0, "00:00"), (75.9, "01:15"), (3600 * 2 + 61, "2:01:01")])
+def test_format_duration(seconds, text):
+    assert _format_duration(seconds) == text
+
+
+@pytest.mark.parametrize("rate, text", [(0.5, "0.5"), (999, "999.0"), (1500, "1.5k"), (2_500_000, "2.5M")])
+def test_format_rate(rate, text):
+    assert _format_rate(rate) == text
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST ASYNC
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("bar", PROGRESS_BARS)
+def test_async_progress_bar(bar, stream, capsys):
+    bar = bar()
+
+    async def main():
+        handler = signal.getsignal(signal.SIGINT)  # asyncio's own
+        async with bar:
+            assert signal.getsignal(signal.SIGINT) is handler
+            await asyncio.sleep(0.25)
+
+    asyncio.run(main())
+    assert _render_threads() == []
+    assert render_scheduler._loop is None and render_scheduler._timer is None
+    output = stream.getvalue()
+    assert output.startswith("\033[?25l") and output.endswith("\033[?25h")
+    assert _strip_ansi(output).count(bar.msg) > 1
+    assert capsys.readouterr().out == bar.exit_msg + "\n"
+
+
+def test_async_many_indicators_one_loop(stream):
+    # Thousands of indicators, animated by the event loop, with no threads
+    async def track(i):
+        async with Progress(total=2, msg=f"task {i}", leave=False) as progress:
+            for _ in range(2):
+                await asyncio.sleep(0.01)
+                progress.update()
+        return progress.n
+
+    async def main():
+        return await asyncio.gather(*(track(i) for i in range(2000)))
+
+    threads = threading.active_count()
+    assert asyncio.run(main()) == [2] * 2000
+    assert threading.active_count() == threads
+    assert render_scheduler.active == []
+
+
+def test_progress_gather(stream):
+    async def double(x):
+        await asyncio.sleep(0.001 * x)
+        return 2 * x
+
+    progress = Progress(msg="Doubling")
+    assert asyncio.run(progress.gather(*(double(x) for x in range(20)))) == [2 * x for x in range(20)]
+    assert progress.n == progress.total == 20
+    assert _strip_ansi(stream.getvalue()).splitlines()[-1].startswith("Doubling 100% |")
+
+
+def test_progress_gather_return_exceptions(stream):
+    async def fail():
+        raise KeyError
+
+    async def main():
+        return await Progress().gather(asyncio.sleep(0), fail(), return_exceptions=True)
+
+    result = asyncio.run(main())
+    assert result[0] is None and isinstance(result[1], KeyError)
+    assert render_scheduler.active == []
+
+
+def test_progress_as_completed(stream):
+    async def main():
+        progress = Progress(msg="Sleeping")
+        done = []
+        for next_done in progress.as_completed([asyncio.sleep(0.01 * i, result=i) for i in range(10)]):
+            done.append(await next_done)
+            assert progress.n == len(done)
+            assert render_scheduler.active == [progress]
+        return progress, done
+
+    progress, done = asyncio.run(main())
+    assert sorted(done) == list(range(10))
+    assert progress.n == 10 and render_scheduler.active == []
+
+
+def test_async_and_threaded_indicators_together(stream, capsys):
+    async def main():
+        async with SpinnerProgressBar("async", exit_msg=None, speed='fast'):
+            with EllipsisProgressBar("threaded", exit_msg=None, speed='fast'):
+                assert len(_render_threads()) == 1
+                await asyncio.sleep(0.15)
+            await asyncio.sleep(0.15)
+
+    asyncio.run(main())
+    output = _strip_ansi(stream.getvalue())
+    assert "async" in output and "threaded" in output
+    _wait_for_render_thread_to_stop()
+    assert render_scheduler.active == []
+
+
+def test_sigint_handler_restored_and_chained(stream):
+    handler = signal.getsignal(signal.SIGINT)
+    with SpinnerProgressBar(exit_msg=None) as bar:
+        assert signal.getsignal(signal.SIGINT) is not handler
+        with pytest.raises(KeyboardInterrupt):
+            signal.raise_signal(signal.SIGINT)
+        assert render_scheduler.active == []
+    assert signal.getsignal(signal.SIGINT) is handler
+
+
+def test_bars_in_worker_thread(stream):
+    handler = signal.getsignal(signal.SIGINT)
+    errors = []
+
+    def work():
+        try:
+            assert sum(Progress(range(100), exit_msg=None)) == 4950
+            with SpinnerProgressBar(exit_msg=None):
+                pass
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    assert errors == []
+    assert signal.getsignal(signal.SIGINT) is handler
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST SHARED PROGRESS
+# ------------------------------------------------------------------------------------------------
+
+def _count_in_worker(n, counter):
+    for _ in range(n):
+        counter.update()
+    return os.getpid()
+
+
+def _start_methods():
+    return [method for method in ('fork', 'spawn') if method in multiprocessing.get_all_start_methods()]
+
+
+@pytest.mark.parametrize("start_method", _start_methods())
+def test_shared_progress_process_pool(stream, start_method):
+    context = multiprocessing.get_context(start_method)
+    with SharedProgress(total=2000, msg="Workers", fps=100) as progress:
+        with ProcessPoolExecutor(max_workers=3, mp_context=context) as pool:
+            pids = set(pool.map(_count_in_worker, [100] * 20, repeat(progress.counter)))
+        progress.update(0)
+        assert progress.counter.value == 2000
+        assert len(progress.counter._segments) == len(pids) + 1
+
+    assert progress.n == 2000
+    assert _strip_ansi(stream.getvalue()).splitlines()[-1].startswith("Workers 100% |")
+
+
+def test_shared_progress_frees_shared_memory(stream):
+    with SharedProgress(total=10) as progress:
+        progress.update(10)
+        name = f"{progress.counter.name}_0"
+        shared_memory.SharedMemory(name).close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="Needs fork")
+def test_progress_counter_inherited_by_fork():
+    counter = ProgressCounter()
+    counter.update(5)  # This process's slot, which the child must not write to
+    try:
+        child = multiprocessing.get_context('fork').Process(target=_count_in_worker, args=(7, counter))
+        child.start()
+        child.join()
+        assert counter.value == 12
+        assert [view[0] for view in counter._views] == [5, 7]
+    finally:
+        counter.close()
+
+
+def test_progress_counter_pickles_by_name():
+    counter = ProgressCounter("kk_test_counter")
+    counter.update()
+    try:
+        copy = pickle.loads(pickle.dumps(counter))
+        assert copy.name == counter.name and copy._segments == []
+        copy.update(2)  # Same process, so same slot
+        assert counter.value == 3
+    finally:
+        counter.close()
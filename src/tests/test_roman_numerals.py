@@ -1,4 +1,12 @@
-from koolkit.roman_numerals import RomanNumeral, convert_arabic_to_roman, convert_roman_to_arabic
+import io
+import pickle
+import random
+
+import pytest
+from koolkit.numbers import (RomanNumeral, convert_arabic_to_roman, convert_roman_to_arabic, MAX_NUMBER, EXTENDED_NOTATIONS,
+                            convert_many_arabic_to_roman, convert_many_roman_to_arabic,
+                            find_roman_numerals, replace_roman_numerals)
+from koolkit.numbers.roman_numerals import _convert_arabic_to_roman_iterative
 
 PAIRS = [(13, 'XIII'),
          (1, 'I'),
@@ -86,13 +94,277 @@ def test_roman_numeral_object_nulla():
     assert str(roman_numeral_object) == "0"
 
 
+def test_roman_numeral_objects_are_interned():
+    assert RomanNumeral(42) is RomanNumeral(42)
+    assert RomanNumeral('XLII') is RomanNumeral(42)
+    assert RomanNumeral(RomanNumeral(42)) is RomanNumeral(42)
+    assert RomanNumeral(42, lowercase=True) is not RomanNumeral(42)
+    assert str(RomanNumeral(42, lowercase=True)) == 'xlii'
+    assert pickle.loads(pickle.dumps(RomanNumeral(42))) is RomanNumeral(42)
+
+
+def test_roman_numeral_object_is_immutable():
+    roman_numeral_object = RomanNumeral(42)
+    with pytest.raises(AttributeError):
+        roman_numeral_object.int_val = 43
+    with pytest.raises(AttributeError):
+        roman_numeral_object.extra = 'not allowed'
+    assert not hasattr(roman_numeral_object, '__dict__')
+
+
+def test_roman_numeral_object_ordering_and_hashing():
+    assert RomanNumeral(4) < RomanNumeral(5) <= 5 < RomanNumeral(6)
+    assert RomanNumeral(6) > 5 and RomanNumeral(6) >= RomanNumeral(6)
+    assert RomanNumeral(13) == RomanNumeral(13, lowercase=True) == 13
+    assert sorted([RomanNumeral(10), RomanNumeral(1), RomanNumeral(5)]) == [1, 5, 10]
+    assert len({RomanNumeral(13), RomanNumeral(13, lowercase=True), 13}) == 1
+
+
+def test_roman_numeral_object_arithmetic():
+    assert RomanNumeral(10) + RomanNumeral(3) is RomanNumeral(13)
+    assert 3 + RomanNumeral(10) is RomanNumeral(13)
+    assert RomanNumeral(10) - 3 is RomanNumeral(7)
+    assert 10 - RomanNumeral(3) is RomanNumeral(7)
+    assert RomanNumeral(7) * 2 is RomanNumeral(14)
+    assert RomanNumeral(14) // 4 is RomanNumeral(3)
+    assert RomanNumeral(14) % 4 is RomanNumeral(2)
+    assert str(RomanNumeral(10, lowercase=True) + 3) == 'xiii'
+    with pytest.raises(ValueError):
+        RomanNumeral(MAX_NUMBER) + 1
+    with pytest.raises(ValueError):
+        RomanNumeral(1) - 2
+
+
 def test_convert_roman_to_arabic():
     roman_str = 'XIII'
     arabic_int = 13
     assert convert_roman_to_arabic(roman_str) == arabic_int
 
-def test_convert_roman_to_arabic():
+def test_convert_arabic_to_roman():
     roman_str = 'XIII'
     arabic_int = 13
     assert convert_arabic_to_roman(arabic_int) == roman_str
 
+
+@pytest.mark.parametrize("lowercase", [False, True])
+def test_convert_arabic_to_roman_matches_iterative_for_full_range(lowercase):
+    for arabic_int in range(MAX_NUMBER + 1):
+        expected = _convert_arabic_to_roman_iterative(arabic_int, lowercase=lowercase)
+        assert convert_arabic_to_roman(arabic_int, lowercase=lowercase) == expected
+
+
+@pytest.mark.parametrize("arabic_int", [-1, MAX_NUMBER + 1])
+def test_convert_arabic_to_roman_out_of_range(arabic_int):
+    with pytest.raises(ValueError):
+        convert_arabic_to_roman(arabic_int)
+
+
+
+@pytest.mark.parametrize("lowercase", [False, True])
+def test_convert_roman_to_arabic_round_trips_full_range(lowercase):
+    for arabic_int in range(MAX_NUMBER + 1):
+        roman_str = convert_arabic_to_roman(arabic_int, lowercase=lowercase)
+        assert convert_roman_to_arabic(roman_str) == arabic_int
+        assert convert_roman_to_arabic(roman_str, strict=False) == arabic_int
+
+
+@pytest.mark.parametrize("roman_str", ['', 'IIV', 'VX', 'IIII', 'VV', 'IC', 'XM', 'MMMM', 'IXI', 'CMC', 'DD', 'XIIX', 'ABC', 'X I'])
+def test_convert_roman_to_arabic_strict_rejects_non_canonical(roman_str):
+    with pytest.raises(ValueError):
+        convert_roman_to_arabic(roman_str)
+
+
+@pytest.mark.parametrize("roman_str, arabic_int", [('IIII', 4), ('IC', 99), ('MMMM', 4000), ('VX', 5), ('', 0)])
+def test_convert_roman_to_arabic_lenient(roman_str, arabic_int):
+    assert convert_roman_to_arabic(roman_str, strict=False) == arabic_int
+
+
+def test_convert_roman_to_arabic_strict_matches_canonical_set_on_fuzz_corpus():
+    canonical = {convert_arabic_to_roman(arabic_int): arabic_int for arabic_int in range(1, MAX_NUMBER + 1)}
+    rng = random.Random(3999)
+    for _ in range(20_000):
+        roman_str = ''.join(rng.choices('IVXLCDM', k=rng.randint(1, 12)))
+        if roman_str in canonical:
+            assert convert_roman_to_arabic(roman_str) == canonical[roman_str]
+        else:
+            with pytest.raises(ValueError):
+                convert_roman_to_arabic(roman_str)
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST EXTENDED NOTATIONS
+# ------------------------------------------------------------------------------------------------
+
+EXTENDED_PAIRS = [
+    (4000, 'vinculum', 'I\u0305V\u0305'),
+    (4900, 'vinculum', 'I\u0305V\u0305CM'),
+    (1_000_000, 'vinculum', 'M\u0305'),
+    (5_000_000, 'vinculum', 'V\u0305\u0305'),
+    (1000, 'apostrophus', 'CI\u2183'),
+    (1900, 'apostrophus', 'CI\u2183CCI\u2183'),
+    (4000, 'apostrophus', 'CI\u2183I\u2183\u2183'),
+    (10_000, 'apostrophus', 'CCI\u2183\u2183'),
+    (50_001, 'apostrophus', 'I\u2183\u2183\u2183I'),
+]
+
+
+@pytest.mark.parametrize("arabic_int, extended, roman_str", EXTENDED_PAIRS)
+def test_extended_notations(arabic_int, extended, roman_str):
+    assert convert_arabic_to_roman(arabic_int, extended=extended) == roman_str
+    assert convert_roman_to_arabic(roman_str, extended=extended) == arabic_int
+    assert convert_roman_to_arabic(roman_str.lower(), extended=extended) == arabic_int
+    assert str(RomanNumeral(arabic_int, extended=extended)) == roman_str
+    assert int(RomanNumeral(roman_str, extended=extended)) == arabic_int
+
+
+@pytest.mark.parametrize("extended", EXTENDED_NOTATIONS)
+def test_extended_notations_round_trip(extended):
+    rng = random.Random(3999)
+    for _ in range(2000):
+        arabic_int = rng.randint(0, 10 ** rng.randint(1, 30))
+        roman_str = convert_arabic_to_roman(arabic_int, extended=extended)
+        assert convert_roman_to_arabic(roman_str, extended=extended) == arabic_int
+
+
+def test_vinculum_matches_traditional_up_to_max_number():
+    for arabic_int in range(MAX_NUMBER + 1):
+        assert convert_arabic_to_roman(arabic_int, extended='vinculum') == convert_arabic_to_roman(arabic_int)
+
+
+def test_vinculum_accepts_double_overline():
+    assert convert_roman_to_arabic('V\u033f', extended='vinculum') == 5_000_000
+
+
+@pytest.mark.parametrize("roman_str, extended", [
+    ('I\u0305M', 'vinculum'),             # 2000 is MM
+    ('I\u0305\u0305', 'vinculum'),       # 1,000,000 is M with one overline
+    ('IIII\u0305', 'vinculum'),
+    ('IM', 'vinculum'),
+    ('I\u2183', 'apostrophus'),           # 500 is D
+    ('MCM', 'apostrophus'),               # 1000 is CIↃ
+    ('\u2183', 'apostrophus'),
+])
+def test_extended_notations_strict_rejects_non_canonical(roman_str, extended):
+    with pytest.raises(ValueError):
+        convert_roman_to_arabic(roman_str, extended=extended)
+
+
+def test_extended_notations_invalid():
+    with pytest.raises(ValueError):
+        convert_arabic_to_roman(5000, extended='overline')
+    with pytest.raises(ValueError):
+        convert_arabic_to_roman(-1, extended='vinculum')
+    with pytest.raises(ValueError):
+        RomanNumeral(5000, extended='overline')
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST BULK CONVERSION
+# ------------------------------------------------------------------------------------------------
+
+def test_convert_many_arabic_to_roman():
+    arabic_ints = [arabic_int for arabic_int, _ in PAIRS]
+    expected = [roman_str for _, roman_str in PAIRS]
+    assert convert_many_arabic_to_roman(arabic_ints) == expected
+    assert convert_many_arabic_to_roman(iter(arabic_ints), lowercase=True) == [s.lower() for s in expected]
+    assert convert_many_arabic_to_roman([0, 1], nulla=False) == ['0', 'I']
+    assert convert_many_arabic_to_roman([]) == []
+
+
+@pytest.mark.parametrize("arabic_ints", [[1, 2, -1], [1, MAX_NUMBER + 1]])
+def test_convert_many_arabic_to_roman_out_of_range(arabic_ints):
+    with pytest.raises(ValueError):
+        convert_many_arabic_to_roman(arabic_ints)
+
+
+def test_convert_many_roman_to_arabic():
+    roman_strs = [roman_str for _, roman_str in PAIRS]
+    expected = [arabic_int for arabic_int, _ in PAIRS]
+    assert convert_many_roman_to_arabic(roman_strs) == expected
+    assert convert_many_roman_to_arabic([s.lower() for s in roman_strs]) == expected
+    assert convert_many_roman_to_arabic([' xiii ', 'N']) == [13, 0]
+    with pytest.raises(ValueError):
+        convert_many_roman_to_arabic(['XIII', 'ABC'])
+    with pytest.raises(ValueError):
+        convert_many_roman_to_arabic(['XIII', 'IIII'])
+    assert convert_many_roman_to_arabic(['XIII', 'IIII'], strict=False) == [13, 4]
+
+
+def test_convert_many_numpy_round_trip():
+    np = pytest.importorskip("numpy")
+    arabic_ints = np.arange(MAX_NUMBER + 1).reshape(4, -1)
+    roman_strs = convert_many_arabic_to_roman(arabic_ints)
+    assert roman_strs.shape == arabic_ints.shape
+    assert roman_strs[0, 13] == 'XIII'
+    assert np.array_equal(convert_many_roman_to_arabic(roman_strs), arabic_ints)
+
+    with pytest.raises(ValueError):
+        convert_many_arabic_to_roman(np.array([1, MAX_NUMBER + 1]))
+    with pytest.raises(TypeError):
+        convert_many_arabic_to_roman(np.array([1.0, 2.0]))
+
+
+def test_convert_many_numpy_bool():
+    np = pytest.importorskip("numpy")
+    roman_strs = convert_many_arabic_to_roman(np.array([[True, False], [False, True]]))
+    assert roman_strs.shape == (2, 2)
+    assert roman_strs.tolist() == [['I', 'N'], ['N', 'I']]
+    assert roman_strs.tolist() == [convert_many_arabic_to_roman(row) for row in [[True, False], [False, True]]]
+
+
+def test_convert_many_numpy_object():
+    np = pytest.importorskip("numpy")
+    arabic_ints = np.array([[4, 9], [np.int64(14), 3999]], dtype=object)
+    assert convert_many_arabic_to_roman(arabic_ints).tolist() == [['IV', 'IX'], ['XIV', 'MMMCMXCIX']]
+    assert convert_many_arabic_to_roman(np.array([], dtype=object)).tolist() == []
+
+    with pytest.raises(TypeError):
+        convert_many_arabic_to_roman(np.array([1, 2.0], dtype=object))
+    with pytest.raises(TypeError):
+        convert_many_arabic_to_roman(np.array([1, 'X'], dtype=object))
+    with pytest.raises(ValueError):
+        convert_many_arabic_to_roman(np.array([1, 2 ** 70], dtype=object))
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST STREAMING SCANNER
+# ------------------------------------------------------------------------------------------------
+
+SCANNER_TEXT = "Chapter XIV: Louis XVI met Henry viii. MIXED, IIII and XIVth are not numerals; MMMDCCCLXXXVIII is.\nI".encode()
+SCANNER_EXPECTED = [(8, 'XIV'), (19, 'XVI'), (79, 'MMMDCCCLXXXVIII'), (99, 'I')]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 16, 17, 1 << 20])
+def test_find_roman_numerals_across_chunk_boundaries(chunk_size):
+    found = [(offset, str(numeral)) for offset, numeral in find_roman_numerals(io.BytesIO(SCANNER_TEXT), chunk_size=chunk_size)]
+    assert found == SCANNER_EXPECTED
+
+
+def test_find_roman_numerals_options(tmp_path):
+    path = tmp_path / 'corpus.txt'
+    path.write_bytes(SCANNER_TEXT)
+
+    found = [(offset, numeral) for offset, numeral in find_roman_numerals(path, lowercase=True, min_length=2)]
+    assert [(offset, str(numeral)) for offset, numeral in found] == [(8, 'XIV'), (19, 'XVI'), (33, 'viii'), (79, 'MMMDCCCLXXXVIII')]
+    assert found[2][1] is RomanNumeral(8, lowercase=True)
+
+    mapped = [(offset, str(numeral)) for offset, numeral in find_roman_numerals(path, use_mmap=True)]
+    assert mapped == SCANNER_EXPECTED
+
+    (tmp_path / 'empty.txt').write_bytes(b'')
+    assert list(find_roman_numerals(tmp_path / 'empty.txt', use_mmap=True)) == []
+
+    with pytest.raises(TypeError):
+        list(find_roman_numerals(io.StringIO('XIV')))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+def test_replace_roman_numerals(chunk_size):
+    output = io.BytesIO()
+    count = replace_roman_numerals(io.BytesIO(b"Louis XVI, chapter xiv, LouisXIV"), output, lowercase=True, chunk_size=chunk_size)
+    assert output.getvalue() == b"Louis 16, chapter 14, LouisXIV"
+    assert count == 2
+
+    output = io.BytesIO()
+    replace_roman_numerals(io.BytesIO(b"Louis XVI"), output, replacement=lambda numeral: f"{numeral} ({int(numeral)})")
+    assert output.getvalue() == b"Louis XVI (16)"
@@ -1,5 +1,13 @@
+import io
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+
 import pytest
-from koolkit.strings import convert_case, convert_to_single_line
+from koolkit.strings import (CaseConverter, camel2under, camel2under_many, convert_case, convert_keys, convert_to_single_line,
+                             evaluate_as_f_string, make_case_converter, render_template, stream_single_line, under2camel,
+                             under2camel_many, write_single_line, Template, compile_template, render_many, write_rendered)
+from koolkit.strings.templates import _compile_template
 
 # ------------------------------------------------------------------------------------------------
 # TEST CONVERT_TO_SINGLE_LINE()
@@ -19,6 +27,24 @@ def test_convert_to_single_line(input, expected):
     assert output == expected
 
 
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 1 << 16])
+def test_stream_single_line(chunk_size):
+    text = "  Leading and   trailing \n whitespace\t\n across\u3000chunks\n\n"
+    expected = convert_to_single_line(text)
+    assert "".join(stream_single_line(io.StringIO(text), chunk_size=chunk_size)) == expected
+
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+    assert "".join(stream_single_line(chunks)) == expected
+    assert "".join(stream_single_line(iter(["", "\n\n", ""]))) == ""
+
+
+def test_write_single_line():
+    destination = io.StringIO()
+    written = write_single_line(["Line1\n", "Line", "2\n\nLine3 "], destination)
+    assert destination.getvalue() == "Line1 Line2 Line3"
+    assert written == len("Line1 Line2 Line3")
+
+
 # ------------------------------------------------------------------------------------------------
 # TEST CONVERT_CASE()
 # ------------------------------------------------------------------------------------------------
@@ -43,6 +69,7 @@ def test_convert_to_single_line(input, expected):
     # snake_case
     ("hello world example", "snake", "hello_world_example"),
     ("HELLO-WORLD_example", "snake_case", "hello_world_example"),
+    ("helloWorldExample", "snake", "helloworldexample"),
 
     # UPPER_SNAKE_CASE
     ("hello world example", "UPPER_SNAKE_CASE", "HELLO_WORLD_EXAMPLE"),
@@ -54,6 +81,8 @@ def test_convert_to_single_line(input, expected):
     # PascalCase
     ("hello world example", "pascal", "HelloWorldExample"),
     ("HELLO_WORLD-example", "PascalCase", "HelloWorldExample"),
+    ("hello_world_example", "PascalCase", "HelloWorldExample"),
+    ("old McDonald", "title", "Old Mcdonald"),
 
     # kebab-case
     ("hello world example", "kebab", "hello-world-example"),
@@ -64,6 +93,30 @@ def test_convert_case_variants(input, to_case, expected):
     assert  output == expected
 
 
+@pytest.mark.parametrize("input, to_case, expected", [
+    ("helloWorldExample", "snake", "hello_world_example"),
+    ("parseHTTPResponse", "snake", "parse_http_response"),
+    ("getHTTP2Response", "snake", "get_http2_response"),
+    ("ABC123def", "snake", "abc123def"),
+    ("API_V2_KEY", "snake", "api_v2_key"),
+    ("base64Encoder", "snake", "base64_encoder"),
+    ("1AA", "snake", "1_aa"),
+    ("AAbb", "snake", "a_abb"),
+    ("old McDonald", "title", "Old Mc Donald"),
+    ("userId", "kebab", "user-id"),
+])
+def test_convert_case_split_camel(input, to_case, expected):
+    assert convert_case(input, to_case, split_camel=True) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "helloWorld", "parseHTTPResponse", "getHTTP2Response", "HTTPServerError", "ABC123def", "base64Encoder",
+    "AAbb", "1AA", "a1B", "XMLHttpRequest", "userId2FA",
+])
+def test_convert_case_split_camel_like_camel2under(text):
+    assert convert_case(text, "snake", split_camel=True) == camel2under(text)
+
+
 def test_convert_case_empty_string():
     input = ''
     expected = ''
@@ -85,3 +138,240 @@ def test_convert_case_non_string_input():
     with pytest.raises(TypeError):
         not_a_str = 123
         output = convert_case(text=not_a_str, to_case="title")  # type: ignore
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST CASECONVERTER
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("to_case", ["title", "sentence", "upper", "lower", "snake", "UPPER_SNAKE_CASE", "camel", "pascal", "kebab"])
+@pytest.mark.parametrize("split_camel", [False, True])
+def test_case_converter_matches_convert_case(to_case, split_camel):
+    converter = CaseConverter(to_case, split_camel=split_camel)
+    for text in ["hello world example", "HELLO-WORLD_example", "userId", "", "  spaced  out  "]:
+        assert converter(text) == convert_case(text, to_case, split_camel)
+        assert converter(text) == convert_case(text, to_case, split_camel)  # cached
+
+
+def test_case_converter_cache():
+    converter = CaseConverter("snake", cache_size=2)
+    for text in ["a b", "c d", "e f", "e f"]:
+        converter(text)
+    info = converter.cache_info()
+    assert (info.hits, info.misses, info.currsize) == (1, 3, 2)
+
+    uncached = CaseConverter("snake", cache_size=0)
+    assert uncached("Hello World") == "hello_world"
+    assert uncached.cache_info().currsize == 0
+
+
+def test_make_case_converter_shares_converters():
+    assert make_case_converter("camel") is make_case_converter("camel")
+    assert make_case_converter("camel") is not make_case_converter("snake")
+    assert make_case_converter("camel") is not make_case_converter("camel", split_camel=True)
+
+
+def test_case_converter_errors():
+    with pytest.raises(ValueError):
+        CaseConverter("not-a-real-style")
+    with pytest.raises(TypeError):
+        CaseConverter("title")(123)  # type: ignore
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST CONVERT_KEYS()
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_convert_keys(in_place):
+    leaf = {"not": "a dict key"}.values()  # Any non-dict, non-list value is left alone (and not copied).
+    document = {"userId": 1, "addressLines": [{"streetName": "Main", "houseNumber": 42}, "text", [{"zipCode": None}]],
+                "metaData": {"createdAt": leaf, 7: "int key"}}
+    expected = {"user_id": 1, "address_lines": [{"street_name": "Main", "house_number": 42}, "text", [{"zip_code": None}]],
+                "meta_data": {"created_at": leaf, 7: "int key"}}
+
+    converted = convert_keys(document, "snake", in_place=in_place)
+    assert converted == expected
+    assert converted["meta_data"]["created_at"] is leaf
+    if in_place:
+        assert converted is document
+    else:
+        assert "userId" in document
+
+
+def test_convert_keys_non_containers_and_errors():
+    assert convert_keys("userId", "snake") == "userId"
+    assert convert_keys(5, "snake", in_place=True) == 5
+    with pytest.raises(ValueError):
+        convert_keys({}, "not-a-real-style")
+
+
+@pytest.mark.parametrize("in_place", [False, True])
+def test_convert_keys_deeply_nested(in_place):
+    depth = 10 * sys.getrecursionlimit()
+    document = {}
+    node = document
+    for _ in range(depth):
+        node["childNode"] = [{}]
+        node = node["childNode"][0]
+
+    node = convert_keys(document, "snake", in_place=in_place)
+    for _ in range(depth):
+        node = node["child_node"][0]
+    assert node == {}
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST CAMEL2UNDER() / UNDER2CAMEL()
+# ------------------------------------------------------------------------------------------------
+
+@pytest.mark.parametrize("camel_string, under_string", [
+    ("BasicParseTest", "basic_parse_test"),
+    ("basicParseTest", "basic_parse_test"),
+    ("HTTPServerError", "http_server_error"),
+    ("parseHTTPResponse", "parse_http_response"),
+    ("userID", "user_id"),
+    ("Base64Encoder", "base64_encoder"),
+    ("Utf8", "utf8"),
+    ("already_under", "already_under"),
+    ("", ""),
+])
+def test_camel2under(camel_string, under_string):
+    assert camel2under(camel_string) == under_string
+
+
+@pytest.mark.parametrize("under_string, camel_string", [
+    ("complex_tokenizer", "ComplexTokenizer"),
+    ("basic_parse_test", "BasicParseTest"),
+    ("_private", "_Private"),
+    ("", "_"),
+])
+def test_under2camel(under_string, camel_string):
+    assert under2camel(under_string) == camel_string
+
+
+def test_batch_camel2under_and_under2camel():
+    camel_strings = ["BasicParseTest", "HTTPServerError", "BasicParseTest"]
+    assert camel2under_many(camel_strings) == [camel2under(s) for s in camel_strings]
+    assert camel2under_many(iter(camel_strings)) == [camel2under(s) for s in camel_strings]
+    under_strings = ["complex_tokenizer", "basic_parse_test", "complex_tokenizer"]
+    assert under2camel_many(under_strings) == [under2camel(s) for s in under_strings]
+    assert camel2under_many([]) == under2camel_many([]) == []
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST EVALUATE_AS_F_STRING() / TEMPLATE
+# ------------------------------------------------------------------------------------------------
+
+def test_evaluate_as_f_string_uses_caller_variables():
+    name = 'Bob'
+    time = datetime(2025, 6, 30, 9, 15)
+    assert evaluate_as_f_string("Hello, {name}. It is {time:%H:%M}.") == "Hello, Bob. It is 09:15."
+    assert evaluate_as_f_string("{len(name) * 2}\n{name!r}") == "6\n'Bob'"
+
+
+@pytest.mark.parametrize("safe", [False, True])
+def test_template_render(safe):
+    template = Template("Hello, {user.name}. You have {counts[new]} new messages ({ratio:.0%}).", safe=safe)
+    user = type("User", (), {"name": "Bob"})()
+    expected = "Hello, Bob. You have 3 new messages (50%)."
+    counts = {"new": 3} if safe else None
+    if not safe:
+        template = Template("Hello, {user.name}. You have {counts['new']} new messages ({ratio:.0%}).")
+        counts = {"new": 3}
+    ratio = 0.5
+    assert template.render({"user": user, "counts": counts, "ratio": ratio}) == expected
+    assert template.render(user=user, counts=counts, ratio=ratio) == expected
+    assert template.render({"user": user, "counts": counts}, ratio=ratio) == expected
+    assert template.render() == expected  # Caller's variables
+
+
+def test_template_unsafe_expressions():
+    assert Template("{price * 1.2:.2f} {items[-1]!r}").render(price=10, items=["a", "b"]) == "12.00 'b'"
+    with pytest.raises(NameError):
+        Template("{missing}").render({})
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('Say "hi", {name}', 'Say "hi", Bob'),
+    ("It's {name}'s", "It's Bob's"),
+    ('''Triple """ and \'\'\' quotes: {name}''', '''Triple """ and \'\'\' quotes: Bob'''),
+    (r"C:\new\{name}", r"C:\new\Bob"),
+    (r"Not a newline: \n {name!r}", r"Not a newline: \n 'Bob'"),
+    ("Multiline\n{{literal}} {name}", "Multiline\n{literal} Bob"),
+    ('{names["first"]:>5} {name != "Al"} {len(name)} {name:{width}}|', '  Bob True 3 Bob  |'),
+])
+def test_template_literal_text(text, expected):
+    variables = {"name": "Bob", "names": {"first": "Bob"}, "width": 5}
+    assert Template(text).render(variables) == expected
+
+
+@pytest.mark.parametrize("text", ["{name", "name}", "{}"])
+def test_template_invalid(text):
+    with pytest.raises(SyntaxError):
+        Template(text)
+
+
+@pytest.mark.parametrize("text", ["{price * 1.2}", "{x.__class__}", "{x.y._private}", "{0}", "{}", "{x:{y.__dict__}}"])
+def test_template_safe_mode_rejects_expressions(text):
+    with pytest.raises(ValueError):
+        Template(text, safe=True)
+
+
+def test_template_safe_mode():
+    assert Template("{x:>{width}}|", safe=True).render(x="ab", width=4) == "  ab|"
+    with pytest.raises(KeyError):
+        Template("{missing}", safe=True).render({})
+
+
+def test_render_template_caches_compiled_templates():
+    name = "Bob"
+    assert render_template("Hi {name}") == "Hi Bob"
+    assert render_template("Hi {name}", name="Alice") == "Hi Alice"
+    assert render_template("Hi {name}", {"name": "Eve"}, safe=True) == "Hi Eve"
+    info = _compile_template.cache_info()
+    render_template("Hi {name}")
+    assert _compile_template.cache_info().hits == info.hits + 1
+
+
+def test_template_cached_once():
+    text = "Cached once: {name}"
+    assert compile_template(text) is compile_template(text, False) is compile_template(text, safe=False)
+    name = "Bob"
+    assert evaluate_as_f_string(text) == render_template(text) == "Cached once: Bob"
+    assert compile_template(text, safe=True) is compile_template(text, True)
+    assert compile_template(text) is not compile_template(text, True)
+
+
+# ------------------------------------------------------------------------------------------------
+# TEST RENDER_MANY() / WRITE_RENDERED()
+# ------------------------------------------------------------------------------------------------
+
+RECORDS = [{"name": f"user{i}", "amount": i * 1000.5} for i in range(2500)]
+RENDERED = [f"user{i} owes {i * 1000.5:,.2f}" for i in range(2500)]
+
+
+@pytest.mark.parametrize("safe", [False, True])
+def test_render_many(safe):
+    rendered = render_many("{name} owes {amount:,.2f}", iter(RECORDS), safe=safe)
+    assert next(rendered) == RENDERED[0]  # Lazy
+    assert list(rendered) == RENDERED[1:]
+    assert list(render_many(Template("{name}"), RECORDS[:2])) == ["user0", "user1"]
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_render_many_with_executor(executor_class):
+    with executor_class(max_workers=2) as executor:
+        rendered = render_many("{name} owes {amount:,.2f}", iter(RECORDS), executor=executor, chunksize=100, max_pending=3)
+        assert list(rendered) == RENDERED
+
+
+def test_write_rendered():
+    file = io.StringIO()
+    count = write_rendered("{name} owes {amount:,.2f}", RECORDS, file, buffer_size=100)
+    assert count == len(RECORDS)
+    assert file.getvalue() == "\n".join(RENDERED) + "\n"
+
+    file = io.StringIO()
+    assert write_rendered("{name}", [], file) == 0
+    assert file.getvalue() == ""